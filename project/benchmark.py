@@ -0,0 +1,257 @@
+"""
+NAME:       Aakash Sudhakar
+PROJECT:    Call Routing Project
+COURSE:     CS3 at Make School (Alan Davis)
+"""
+
+# =============================== INITIALIZERS AND IMPORT STATEMENTS =================================
+
+
+import argparse
+import json
+import os
+import platform
+import random
+import time
+from itertools import islice
+
+from main import (BATCH_SIZE, WRITE_BUFFER_SIZE, Call_Router_Compiled_Index, Call_Router_Multiple_Numbers,
+                  Call_Router_Single_Number, _format_cost_line, compile_routes)
+from routetable import CompactRouteTable
+from sharding import Call_Router_Sharded
+from vectorized import Call_Router_Vectorized, np
+
+# Leading digits of real country codes, weighted roughly by route-list share
+COUNTRY_CODES = [("1", 30), ("44", 8), ("49", 6), ("33", 5), ("86", 6), ("91", 6), ("81", 4),
+                 ("61", 3), ("55", 4), ("52", 4), ("7", 4), ("34", 3), ("39", 3), ("62", 3),
+                 ("234", 2), ("254", 1), ("880", 2), ("966", 1), ("971", 1), ("353", 1)]
+# Digits after country code, weighted like carrier lists (mostly area plus exchange codes)
+PREFIX_EXTRA_DIGITS = [(0, 1), (1, 3), (2, 8), (3, 18), (4, 24), (5, 20), (6, 14), (7, 8), (8, 4)]
+NUMBER_DIGITS = 11                                      # Digits after "+" in generated phone numbers
+MIN_COMPARED_SECONDS = 0.01                             # Shorter stages are too noisy to flag
+
+
+# ======================================= SYNTHETIC DATA =============================================
+
+
+def _weighted(rng, choices):
+    """ Returns one value from (value, weight) pairs using given random generator. """
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+def _random_prefix(rng):
+    """ Returns one realistic route prefix: "+", country code, then area/exchange digits. """
+    country = _weighted(rng, COUNTRY_CODES)
+    extra = _weighted(rng, PREFIX_EXTRA_DIGITS)
+    return "+" + country + "".join(rng.choice("0123456789") for _ in range(extra))
+
+def generate_routes(path, count, seed=0, shared_prefixes=None, shared_fraction=0.5):
+    """ Writes route file with count unique (prefix, cost) lines and returns its prefixes.
+    When shared_prefixes is given, about shared_fraction of lines reuse those prefixes
+    (with own prices), like overlapping carrier lists. Same seed gives same file.\n
+    BEST/WORST CASE = O(count) --> Generates each route once. """
+    rng, prefixes = random.Random(seed), set()
+    shared = list(shared_prefixes or ())
+    while len(prefixes) < count:
+        if shared and rng.random() < shared_fraction:
+            prefixes.add(rng.choice(shared))
+        else:
+            prefixes.add(_random_prefix(rng))
+    prefixes = sorted(prefixes)
+    rng.shuffle(prefixes)
+    with open(path, "w") as fw:
+        for prefix in prefixes:
+            fw.write("{},{}\n".format(prefix, rng.randint(1, 9999) / 10000))
+    return prefixes
+
+def generate_carriers(directory, carriers, routes_per_carrier, seed=0):
+    """ Writes one route file per carrier into directory, with overlapping prefixes so
+    least-cost merging matters, and returns list of file paths. """
+    os.makedirs(directory, exist_ok=True)
+    paths, shared = list(), None
+    for carrier in range(carriers):
+        path = os.path.join(directory, "route-costs-{}-{}.txt".format(routes_per_carrier, carrier))
+        prefixes = generate_routes(path, routes_per_carrier, seed + carrier, shared)
+        shared = shared or prefixes
+        paths.append(path)
+    return paths
+
+def generate_numbers(path, count, prefixes, seed=0, routable_fraction=0.8):
+    """ Writes phone number file with count numbers. About routable_fraction extend a known
+    route prefix; rest are random numbers that mostly have no route.\n
+    BEST/WORST CASE = O(count) --> Generates each number once. """
+    rng = random.Random(seed)
+    with open(path, "w") as fw:
+        for _ in range(count):
+            if rng.random() < routable_fraction:
+                start = rng.choice(prefixes)
+            else:
+                start = "+" + rng.choice("0123456789")
+            padding = max(0, NUMBER_DIGITS + 1 - len(start))
+            fw.write(start + "".join(rng.choice("0123456789") for _ in range(padding)) + "\n")
+
+def route_prefixes(path):
+    """ Returns list of route prefixes in given route file, in file order. """
+    with open(path) as fr:
+        return [line.split(",", 1)[0] for line in fr]
+
+def generate_dataset(directory, carriers, routes_per_carrier, numbers, seed=0):
+    """ Writes carrier route files plus number file of given count drawing on first
+    carrier's prefixes into directory, and returns (route_list, number_file). """
+    route_list = generate_carriers(directory, carriers, routes_per_carrier, seed)
+    number_file = os.path.join(directory, "phone-numbers-{}.txt".format(numbers))
+    generate_numbers(number_file, numbers, route_prefixes(route_list[0]), seed)
+    return route_list, number_file
+
+
+# ========================================== BENCHMARKS ==============================================
+
+
+def _timed(function, *args, **kwargs):
+    """ Returns (result, seconds) of calling function with given arguments. """
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def _router_factories(route_list, index_path):
+    """ Returns (name, factory) pairs building each router implementation for given routes. """
+    factories = [
+        ("trie", lambda numbers: Call_Router_Multiple_Numbers(numbers, route_list)),
+        ("compact", lambda numbers: Call_Router_Multiple_Numbers(numbers, route_list, table=CompactRouteTable)),
+        ("index", lambda numbers: Call_Router_Compiled_Index(numbers, index_path)),
+        ("sharded", lambda numbers: Call_Router_Sharded(numbers, route_list)),
+    ]
+    if np is not None:
+        factories.append(("vectorized", lambda numbers: Call_Router_Vectorized(numbers, route_list)))
+    return factories
+
+def run_case(scenario, implementation, factory, number_file, output_path, batch_size=BATCH_SIZE):
+    """ Times loading of one router, then prices number file in one streaming pass and
+    returns result record. Each batch is timed in three stages: parsing its numbers from
+    file, looking up their costs (router's price_batch) and writing their output lines, so
+    every stage times its own work only and file is read once. """
+    router, load_seconds = _timed(factory, number_file)
+    clock, numbers_read, routed = time.perf_counter, 0, 0
+    parse_seconds = lookup_seconds = output_seconds = 0.0
+    try:
+        numbers = router.numbers
+        with open(output_path, "w", buffering=WRITE_BUFFER_SIZE) as fw:
+            while True:
+                start = clock()
+                batch = list(islice(numbers, batch_size))
+                parsed = clock()
+                parse_seconds += parsed - start
+                if not batch:
+                    break
+                costs = router.price_batch(batch)
+                priced = clock()
+                fw.write("".join(_format_cost_line(number, cost) for number, cost in zip(batch, costs)))
+                output_seconds += clock() - priced
+                lookup_seconds += priced - parsed
+                numbers_read += len(batch)
+                routed += sum(cost is not None for cost in costs)
+            start = clock()
+            fw.flush()
+            output_seconds += clock() - start
+    finally:
+        if hasattr(router, "close"):
+            router.close()
+    return {
+        "scenario": scenario,
+        "implementation": implementation,
+        "numbers": numbers_read,
+        "routed": routed,
+        "load_seconds": load_seconds,
+        "parse_seconds": parse_seconds,
+        "lookup_seconds": lookup_seconds,
+        "output_seconds": output_seconds,
+        "lookups_per_sec": numbers_read / lookup_seconds if lookup_seconds else None,
+    }
+
+def run_suite(directory, routes, numbers, carriers, seed=0, implementations=None):
+    """ Generates deterministic data for given sizes and returns list of result records
+    for Scenarios 1-3 across router implementations. """
+    route_list, number_file = generate_dataset(directory, carriers, routes, numbers, seed)
+    single_file = os.path.join(directory, "phone-numbers-1.txt")
+    generate_numbers(single_file, 1, route_prefixes(route_list[0]), seed)
+    output_path = os.path.join(directory, "call-costs-bench.txt")
+    results = list()
+
+    # Scenario 1: one number against one carrier; Scenario 2: many numbers, one carrier
+    for scenario, number_path in (("scenario-1", single_file), ("scenario-2", number_file)):
+        factory = lambda numbers: Call_Router_Single_Number(numbers, route_list[0])
+        results.append(run_case(scenario, "trie", factory, number_path, output_path))
+
+    # Scenario 3: many numbers against every carrier, for each implementation
+    index_path = os.path.join(directory, "routes-{}x{}.idx".format(carriers, routes))
+    _, compile_seconds = _timed(compile_routes, route_list, index_path)
+    for implementation, factory in _router_factories(route_list, index_path):
+        if implementations and implementation not in implementations:
+            continue
+        record = run_case("scenario-3", implementation, factory, number_file, output_path)
+        if implementation == "index":
+            record["compile_seconds"] = compile_seconds
+        results.append(record)
+    for record in results:
+        record.update(routes=routes, carriers=carriers, seed=seed)
+    return results
+
+def compare(results, baseline, tolerance=0.2):
+    """ Returns list of messages for stages that got slower than baseline by more than
+    tolerance (fraction), matching records on scenario, implementation and sizes. Stages
+    faster than MIN_COMPARED_SECONDS are skipped, as timer noise dominates them. """
+    def key(record):
+        return (record["scenario"], record["implementation"], record["routes"],
+                record["carriers"], record["numbers"])
+    previous, regressions = {key(record): record for record in baseline}, list()
+    for record in results:
+        old = previous.get(key(record))
+        if old is None:
+            continue
+        for stage in ("load_seconds", "parse_seconds", "lookup_seconds", "output_seconds"):
+            if old.get(stage) is None:                  # Stage not recorded by older baselines
+                continue
+            if old[stage] >= MIN_COMPARED_SECONDS and record[stage] > old[stage] * (1 + tolerance):
+                regressions.append("{} {} {}: {:.4f}s -> {:.4f}s".format(
+                    record["scenario"], record["implementation"], stage, old[stage], record[stage]))
+    return regressions
+
+
+# =========================================== MAIN SCRIPT ============================================
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Call routing scenario benchmarks.")
+    parser.add_argument("--routes", type=int, nargs="+", default=[10000],
+                        help="routes per carrier file (e.g. 10000 100000 1000000 10000000)")
+    parser.add_argument("--numbers", type=int, default=100000)
+    parser.add_argument("--carriers", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="*", help="implementations to run (default all)")
+    parser.add_argument("--data-dir", default="./data/bench")
+    parser.add_argument("--output", default="./data/bench/results.json")
+    parser.add_argument("--baseline", help="earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = list()
+    for routes in args.routes:
+        results.extend(run_suite(args.data_dir, routes, args.numbers, args.carriers, args.seed, args.only))
+    for record in results:
+        print("{scenario:<11} {implementation:<11} routes={routes:<9} load={load_seconds:8.3f}s "
+              "parse={parse_seconds:8.3f}s lookup={lookup_seconds:8.3f}s "
+              "output={output_seconds:8.3f}s".format(**record))
+    with open(args.output, "w") as fw:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                   "cpus": os.cpu_count(), "results": results}, fw, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fr:
+            regressions = compare(results, json.load(fr)["results"], args.tolerance)
+        for message in regressions:
+            print("REGRESSION: " + message)
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!python
+
+from benchmark import compare, run_case
+from main import Call_Router_Multiple_Numbers
+from testdata import SyntheticDataTestCase
+from vectorized import Call_Router_Vectorized, np
+import os
+import unittest
+
+
+class RunCaseTest(SyntheticDataTestCase):
+
+    carriers, routes, numbers, seed = 2, 300, 2500, 3
+
+    @classmethod
+    def setUpClass(cls):
+        super(RunCaseTest, cls).setUpClass()
+        cls.expected_path = os.path.join(cls.directory, 'expected.txt')
+        Call_Router_Multiple_Numbers(cls.number_file, cls.route_list).write_costs(cls.expected_path)
+
+    def _check(self, factory):
+        output_path = os.path.join(self.directory, 'output.txt')
+        record = run_case('scenario-3', 'test', factory, self.number_file, output_path, batch_size=1000)
+        with open(output_path) as fr, open(self.expected_path) as expected:
+            assert fr.read() == expected.read()
+        assert record['numbers'] == 2500 and 0 < record['routed'] < 2500
+        for stage in ('load_seconds', 'parse_seconds', 'lookup_seconds', 'output_seconds'):
+            assert record[stage] > 0
+
+    def test_stages_write_same_output(self):
+        self._check(lambda numbers: Call_Router_Multiple_Numbers(numbers, self.route_list))
+
+    def test_compare_skips_stages_missing_from_baseline(self):
+        record = {'scenario': 'scenario-3', 'implementation': 'trie', 'routes': 1, 'carriers': 1, 'numbers': 1,
+                  'load_seconds': 1.0, 'parse_seconds': 5.0, 'lookup_seconds': 2.0, 'output_seconds': 1.0}
+        older = dict(record, lookup_seconds=1.0)
+        del older['parse_seconds']                      # Baselines from before parse stage
+        assert compare([record], [older]) == ['scenario-3 trie lookup_seconds: 1.0000s -> 2.0000s']
+
+    @unittest.skipIf(np is None, 'NumPy not installed')
+    def test_vectorized_price_batch(self):
+        self._check(lambda numbers: Call_Router_Vectorized(numbers, self.route_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+NAME:       Aakash Sudhakar
+PROJECT:    Call Routing Project
+COURSE:     CS3 at Make School (Alan Davis)
+"""
+
+# =============================== INITIALIZERS AND IMPORT STATEMENTS =================================
+
+
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK_BYTES = 32 << 20                                  # Target size of each parsed byte range
+
+
+# ======================================== CARRIER ROUTE LIST ========================================
+
+
+class CarrierRoutes(dict):
+    """ One carrier's own route list: dictionary of route prefix -> cheapest cost listed,
+    plus contains and updated methods of route tables, so routers can replace it copy-on-
+    write inside published route snapshot instead of changing it under readers. """
+
+    def contains(self, prefix):
+        """ Returns True if route list has given prefix, or False. """
+        return prefix in self
+
+    def updated(self, assignments=(), removals=()):
+        """ Returns copy of route list with given (prefix, cost) assignments and prefix
+        removals applied, leaving this list untouched.\n
+        BEST/WORST CASE = O(r + c) --> Copies r routes, then applies c changes. """
+        routes = CarrierRoutes(self)
+        routes.update(assignments)
+        for prefix in removals:
+            del routes[prefix]
+        return routes
+
+
+# ======================================== ROUTE FILE PARSING ========================================
+
+
+def parse_route_lines(lines, routes=None):
+    """ Returns route list (CarrierRoutes) of prefix to cheapest cost in given "prefix,cost"
+    route lines, skipping blank ones, added to given route list (if any) so file can be
+    parsed block by block. Serial and chunked loaders both parse through here, so they
+    build same tables from same file.\n
+    BEST/WORST CASE = O(r) --> Parses every line once (r routes). """
+    routes = CarrierRoutes() if routes is None else routes
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        line = line.split(",")
+        prefix, cost = line[0], float(line[1])
+        if prefix not in routes or cost < routes[prefix]:
+            routes[prefix] = cost
+    return routes
+
+
+# ======================================== CHUNKED PARSING ===========================================
+
+
+def chunk_ranges(path, chunk_bytes=CHUNK_BYTES):
+    """ Returns list of (start, end) byte ranges covering file, each about chunk_bytes long
+    and ending just after newline (or at end of file), so no line is split.\n
+    BEST/WORST CASE = O(f / chunk_bytes) --> One newline search per range boundary. """
+    size = os.path.getsize(path)
+    if size == 0:
+        return list()
+    ranges, start = list(), 0
+    with open(path, "rb") as fr, mmap.mmap(fr.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        while start < size:
+            end = mapped.find(b"\n", min(start + chunk_bytes, size) - 1)
+            end = size if end < 0 else end + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def parse_range(path, start, end):
+    """ Parses route lines in byte range of file (see parse_route_lines) into compact
+    partial table: newline-joined prefixes and array of their cheapest costs, which
+    pickle as one string and flat bytes, so results return from pool cheaply.\n
+    BEST/WORST CASE = O(r) --> Parses every line in range once (r routes). """
+    with open(path, "rb") as fr, mmap.mmap(fr.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        routes = parse_route_lines(mapped[start:end].decode().split("\n"))
+    return "\n".join(routes.keys()), array("d", routes.values())
+
+def _parse_range_task(task):
+    """ Unpacks (path, start, end) task for pool map. """
+    return parse_range(*task)
+
+def load_routes_chunked(route_list, workers=None, chunk_bytes=CHUNK_BYTES):
+    """ Returns list of per-file route lists (CarrierRoutes) of prefix to cheapest cost, in
+    file order. Every file is memory-mapped and split into newline-aligned ranges, all ranges
+    of all files are parsed side by side in process pool, and each file's partial tables
+    are merged back together, so parse throughput grows with core count.\n
+    BEST/WORST CASE = O(r / workers) parse time + O(r) merge --> r routes overall. """
+    tasks = [(path, start, end) for path in route_list for start, end in chunk_ranges(path, chunk_bytes)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partial_tables = pool.map(_parse_range_task, tasks)
+        merged = {path: CarrierRoutes() for path in route_list}
+        for (path, _, _), (prefixes, costs) in zip(tasks, partial_tables):
+            best = merged[path]
+            for prefix, cost in zip(prefixes.split("\n"), costs):
+                if prefix not in best or cost < best[prefix]:
+                    best[prefix] = cost
+    return [merged[path] for path in route_list]
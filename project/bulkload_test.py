@@ -0,0 +1,59 @@
+#!python
+
+from benchmark import generate_carriers
+from bulkload import CarrierRoutes, chunk_ranges, load_routes_chunked, parse_route_lines
+from main import _load_carrier_routes
+import os
+import shutil
+import tempfile
+import unittest
+
+ODD_LINES = ['+1415,0.5', '', '+1415,0.25', '44,0.75', '+1-800,0.5\r', '  +33 ,0.125 ', '+1415,0.3', '+7,1e-3']
+
+
+class BulkLoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_parse_route_lines(self):
+        routes = parse_route_lines(ODD_LINES)
+        assert isinstance(routes, CarrierRoutes)
+        assert routes == {'+1415': 0.25, '44': 0.75, '+1-800': 0.5, '+33 ': 0.125, '+7': 0.001}
+
+    def test_carrier_routes_updated(self):
+        routes = CarrierRoutes({'+1': 0.5, '+44': 0.25})
+        updated = routes.updated([('+1', 0.4), ('+33', 0.1)], ['+44'])
+        assert updated == {'+1': 0.4, '+33': 0.1}
+        assert routes == {'+1': 0.5, '+44': 0.25}       # Original is untouched
+        assert updated.contains('+33') and not updated.contains('+44')
+
+    def test_chunk_ranges(self):
+        path = os.path.join(self.directory, 'routes.txt')
+        with open(path, 'w') as fw:
+            fw.write(''.join('+{},0.5\n'.format(prefix) for prefix in range(1000, 2000)))
+        ranges = chunk_ranges(path, 100)
+        assert ranges[0][0] == 0 and ranges[-1][1] == os.path.getsize(path)
+        with open(path, 'rb') as fr:
+            data = fr.read()
+        for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+            assert end == next_start and data[end - 1:end] == b'\n'
+
+    def test_chunked_load_matches_serial_load(self):
+        route_list = generate_carriers(self.directory, 2, 3000)
+        odd_path = os.path.join(self.directory, 'odd-routes.txt')
+        with open(odd_path, 'w', newline='') as fw:
+            fw.write('\n'.join(ODD_LINES * 50) + '\n')
+        route_list.append(odd_path)
+        chunked = load_routes_chunked(route_list, workers=2, chunk_bytes=4096)
+        serial = [_load_carrier_routes(path) for path in route_list]
+        assert [len(routes) for routes in chunked] == [len(routes) for routes in serial]
+        assert chunked == serial
+        assert all(isinstance(routes, CarrierRoutes) for routes in chunked)
+
+
+if __name__ == '__main__':
+    unittest.main()
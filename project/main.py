@@ -7,73 +7,575 @@ COURSE:     CS3 at Make School (Alan Davis)
 # =============================== INITIALIZERS AND IMPORT STATEMENTS =================================
 
 
+import multiprocessing
+import os
+import signal
 import sys
+import threading
+import time
+from array import array
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
 sys.path.append("../source")
-from hashtable import HashTable
+from bloomfilter import BloomFilter
+from bulkload import CarrierRoutes, chunk_ranges, load_routes_chunked, parse_route_lines
+from lrucache import LRUCache
+from prefixtree import PrefixTree
+from profiling import ProbeCounter
+from routeindex import RouteIndex, SharedRouteIndex, compile_index
+
+BATCH_SIZE = 10000                                      # Numbers priced per streaming batch
+WRITE_BUFFER_SIZE = 1 << 20                             # Bytes buffered before each file write
+READ_BLOCK_SIZE = 1 << 20                               # Characters of route file per profiled read
+PARALLEL_LOAD_BYTES = 8 << 20                           # Route bytes below which parsing stays serial
+BLOOM_ERROR_RATE = 0.01                                 # Default Bloom filter false positive rate
+BLOOM_GATE_LENGTH = 5                                   # Route characters Bloom filter keys on ("+1415")
+CACHE_SIZE = 100000                                     # Default numbers held in result cache
+PRICE_CHUNK_BYTES = 1 << 20                             # Number-file bytes priced per pool task
 
 
 # =========================================== MAIN SCRIPT ============================================
 
 
 
-class Call_Router_Single_Number(object):
-    """ Inputs single number and outputs cost. """
-    def __init__(self, number, path):
-        FILENAME_ROUTE, ht_cost = path, HashTable()
-        with open(FILENAME_ROUTE) as fr:
-            for line in fr:
-                line = line.strip().split(",")
-                ht_cost.set(line[0], float(line[1]))
-        self.route_costs = ht_cost                      # Sets numbers with costs to table
-
-        FILENAME_NUMBER, number_list = number, list()
-        with open(FILENAME_NUMBER) as fr:
-            for line in fr:
-                line = line.strip()
-                number_list.append(line)
-        self.numbers = number_list
-
-    def cost_calculator(self):
-        number_list = list()
-        for number in self.numbers:
-            if self.route_costs.get(number) == None:
-                number_list.append(None)
+class RouteSnapshot(object):
+    """ Immutable published version of route costs, carrier route lists and version number. """
+
+    __slots__ = ("costs", "carrier_routes", "version")
+
+    def __init__(self, costs, carrier_routes=None, version=0):
+        self.costs = costs                              # Route table of prefix -> cost
+        self.carrier_routes = carrier_routes            # Carrier -> its own route list, in carrier order
+        self.version = version                          # Bumped on every published update
+
+    def carrier(self, prefix):
+        """ Returns carrier offering stored cost of given prefix (earliest on ties), or None.\n
+        BEST/WORST CASE = O(C + k) --> One table lookup, then one per carrier (C carriers). """
+        cost = self.costs.get(prefix)
+        if cost is not None and self.carrier_routes is not None:
+            for carrier, routes in self.carrier_routes.items():
+                if routes.get(prefix) == cost:
+                    return carrier
+        return None
+
+
+class Call_Router(object):
+    """ Shared pricing logic for routers holding route costs in route table. """
+
+    cache = None                                        # Optional LRU cache of number -> cost
+    bloom = None                                        # Optional Bloom filter of route prefixes
+    profiler = None                                     # Optional profiling.StageProfiler
+
+    @property
+    def route_costs(self):
+        """ Returns route table of current route snapshot. """
+        return self.snapshot.costs
+
+    @property
+    def route_version(self):
+        """ Returns version number of current route snapshot. """
+        return self.snapshot.version
+
+    @property
+    def numbers(self):
+        """ Returns fresh generator over numbers in number file (read lazily).\n
+        BEST/WORST CASE = O(1) space --> Holds one line of file at a time. """
+        return _read_numbers(self.number_file)
+
+    def enable_cache(self, capacity=CACHE_SIZE):
+        """ Puts LRU cache of number -> (route version, cost) in front of lookups and returns it. """
+        self.cache = LRUCache(capacity)
+        return self.cache
+
+    def invalidate_cache(self):
+        """ Drops every cached cost, freeing entries replaced routes made useless. """
+        if self.cache is not None:
+            self.cache.clear()
+
+    def enable_bloom_filter(self, error_rate=BLOOM_ERROR_RATE, gate_length=BLOOM_GATE_LENGTH):
+        """ Puts Bloom filter of route gate prefixes in front of lookups and returns it.\n
+        BEST/WORST CASE = O(r) --> Adds every route's gate prefix once. """
+        gate_keys = {prefix[:gate_length] for prefix, _ in self.route_costs.items()}
+        self.bloom = BloomFilter(max(1, len(gate_keys)), error_rate, gate_keys)
+        self.bloom_gate = gate_length
+        self.bloom_short_lengths = sorted({len(key) for key in gate_keys if len(key) < gate_length})
+        self.bloom_rejected, self.bloom_unroutable_passes = 0, 0
+        return self.bloom
+
+    def bloom_stats(self):
+        """ Returns Bloom filter stats plus measured share of unroutable numbers it let through. """
+        unroutable = self.bloom_rejected + self.bloom_unroutable_passes
+        stats = self.bloom.stats()
+        stats.update(rejected=self.bloom_rejected, unroutable_passes=self.bloom_unroutable_passes,
+                     measured_false_positive_rate=self.bloom_unroutable_passes / unroutable if unroutable else 0.0)
+        return stats
+
+    def _gated_lookup(self, route_costs, number):
+        """ Returns cost of number from given route table, or None once Bloom filter rules it out.\n
+        BEST CASE = O(h) --> Filter rejects number after h hash checks.\n
+        WORST CASE = O(L * h + k) --> Checks every gate length (L), then looks number up. """
+        bloom, gate = self.bloom, self.bloom_gate
+        if len(number) < gate or not bloom.contains(number[:gate]):
+            for length in self.bloom_short_lengths:    # Routes shorter than gate are keyed whole
+                if length <= len(number) and bloom.contains(number[:length]):
+                    break
             else:
-                number_list.append(self.route_costs.get(number))
-        return number_list
-
-class Call_Router_Multiple_Numbers(object):
-    """ Inputs list of numbers and outputs costs in array. """
-    def __init__(self, number, route_list):
-        ht_costs = HashTable()
-        for file in route_list:
-            with open(file) as fr:
-                for line in fr:
-                    line = line.strip()
-                    line = line.split(",")
-                    ht_costs.set(line[0], float(line[1]))
-        self.route_costs = ht_costs
-
-        FILENAME_NUMBER, number_list = number, list()
-        with open(FILENAME_NUMBER) as fr:
-            for line in fr:
-                line = line.strip()
-                number_list.append(line)
-        self.numbers = number_list
+                self.bloom_rejected += 1
+                return None
+        cost = route_costs.lookup(number)
+        if cost is None:
+            self.bloom_unroutable_passes += 1
+        return cost
+
+    def price(self, number):
+        """ Returns cost of longest route prefix matching given number, or None.\n
+        BEST CASE = O(1) --> Number is cached (or rejected by Bloom filter).\n
+        WORST CASE = O(k) --> Walks one trie node per digit of number (length k). """
+        cache, snapshot = self.cache, self.snapshot
+        if cache is not None:
+            entry = cache.get(number)
+            if entry is not None and entry[0] == snapshot.version:
+                return entry[1]
+        if self.bloom is None:
+            cost = snapshot.costs.lookup(number)
+        else:
+            cost = self._gated_lookup(snapshot.costs, number)
+        if cache is not None:
+            cache.set(number, (snapshot.version, cost))     # Tagged with version it was priced against
+        return cost
+
+    def _pricer(self, counter=None):
+        """ Returns function pricing numbers against current snapshot, through cache and Bloom
+        filter if enabled, counting lookups with given profiling.ProbeCounter. """
+        snapshot, cache = self.snapshot, self.cache
+        version = snapshot.version
+        table = snapshot.costs if counter is None else counter.attach(snapshot.costs)
+        if self.bloom is None:
+            lookup = table.lookup
+        else:
+            lookup = partial(self._gated_lookup, table)
+        if cache is None:
+            return lookup
+
+        def cached_lookup(number):
+            entry = cache.get(number)
+            if entry is not None and entry[0] == version:   # Other versions' costs are misses
+                return entry[1]
+            cost = lookup(number)
+            cache.set(number, (version, cost))
+            return cost
+        return cached_lookup
+
+    def price_batch(self, numbers):
+        """ Returns costs (or None) for given list of numbers against one route snapshot.\n
+        BEST/WORST CASE = O(b * k) --> One lookup per number (b numbers). """
+        price = self._pricer()
+        return [price(number) for number in numbers]
+
+    def _stage(self, name, items=0):
+        """ Returns profiler context timing given stage, or no-op context if profiling is off. """
+        if self.profiler is None:
+            return nullcontext(dict())
+        return self.profiler.stage(name, items)
+
+    def _profiled_pricer(self):
+        """ Returns function pricing list of numbers as profiled "lookup" stage. """
+        profiler = self.profiler
+        counter = ProbeCounter() if profiler.count_probes else None
+        price = self._pricer(counter)
+
+        def price_all(numbers):
+            if counter is None:
+                with profiler.stage("lookup", len(numbers)):
+                    return [price(number) for number in numbers]
+            lookups, probes = counter.lookups, counter.probes
+            with profiler.stage("lookup", len(numbers)) as record:
+                costs = [price(number) for number in numbers]
+                record["table_lookups"] = record.get("table_lookups", 0) + counter.lookups - lookups
+                record["probes"] = record.get("probes", 0) + counter.probes - probes
+            return costs
+        return price_all
 
     def cost_calculator(self):
-        number_list = list()
-        for number in self.numbers:
-            if self.route_costs.get(number) is None:
-                number_list.append(None)
-            else:
-                number_list.append(self.route_costs.get(number))
-        return number_list
+        """ Returns list of costs (or None if unroutable) for every loaded number.\n
+        BEST/WORST CASE = O(m * k) --> One lookup per number (m numbers). """
+        if self.profiler is None:
+            price = self._pricer()
+            return [price(number) for number in self.numbers]
+        # Streams numbers batch by batch, so profiled memory stays that of unprofiled run
+        return [cost for batch in self._profiled_batches(BATCH_SIZE) for _, cost in batch]
+
+    def cost_batches(self, batch_size=BATCH_SIZE):
+        """ Yields lists of (number, cost) pairs, batch_size numbers at a time.\n
+        BEST/WORST CASE = O(m * k) time, O(batch_size) space --> One batch alive at once. """
+        if self.profiler is not None:
+            yield from self._profiled_batches(batch_size)
+            return
+        price, numbers = self._pricer(), self.numbers
+        batch = list(islice(numbers, batch_size))
+        while batch:
+            yield [(number, price(number)) for number in batch]
+            batch = list(islice(numbers, batch_size))
+
+    def _profiled_batches(self, batch_size):
+        """ Same as cost_batches, timing reading and pricing of each batch as own stages. """
+        price_all, numbers = self._profiled_pricer(), self.numbers
+        while True:
+            with self._stage("read_numbers") as record:
+                batch = list(islice(numbers, batch_size))
+                record["items"] += len(batch)
+            if not batch:
+                return
+            yield list(zip(batch, price_all(batch)))
+
+    def _priced_ranges(self, formatted, workers=None, chunk_bytes=PRICE_CHUNK_BYTES):
+        """ Yields priced byte ranges of number file in file order, priced by process pool. """
+        if "fork" in multiprocessing.get_all_start_methods():
+            context, price = multiprocessing.get_context("fork"), self._pricer()    # Inherited, not copied
+        else:
+            context, price = multiprocessing.get_context("spawn"), self.route_costs.lookup   # Pickled
+        tasks = [(self.number_file, start, end, formatted)
+                 for start, end in chunk_ranges(self.number_file, chunk_bytes)]
+        with context.Pool(workers, _init_price_worker, (price,)) as pool:
+            yield from pool.imap(_price_range, tasks)   # Results come back in task order
+
+    def cost_calculator_parallel(self, workers=None, chunk_bytes=PRICE_CHUNK_BYTES):
+        """ Returns same list as cost_calculator, priced in chunks by pool of worker processes.\n
+        BEST/WORST CASE = O(m * k / workers) --> Each worker prices its share of m numbers. """
+        costs = list()
+        for chunk_costs in self._priced_ranges(False, workers, chunk_bytes):
+            costs.extend(cost if cost == cost else None for cost in chunk_costs)    # NaN is unroutable
+        return costs
+
+    def write_costs_parallel(self, output_path, workers=None, chunk_bytes=PRICE_CHUNK_BYTES,
+                             buffer_size=WRITE_BUFFER_SIZE):
+        """ Writes same file as write_costs, priced in chunks by worker pool, and returns line count.\n
+        BEST/WORST CASE = O(m * k / workers) time, O(workers * chunk_bytes) space. """
+        line_count = 0
+        with open(output_path, "w", buffering=buffer_size) as fw:
+            for text in self._priced_ranges(True, workers, chunk_bytes):
+                fw.write(text)
+                line_count += text.count("\n")
+        return line_count
+
+    def export_routes(self, output_path):
+        """ Writes current route table to file in route-costs format and returns route count. """
+        routes = sorted(self.route_costs.items())
+        with open(output_path, "w", buffering=WRITE_BUFFER_SIZE) as fw:
+            fw.write("".join("{},{}\n".format(prefix, cost) for prefix, cost in routes))
+        return len(routes)
+
+    def write_costs(self, output_path, batch_size=BATCH_SIZE, buffer_size=WRITE_BUFFER_SIZE):
+        """ Streams priced numbers to file in call-costs format and returns line count.\n
+        BEST/WORST CASE = O(m * k) time, O(batch_size + buffer_size) space. """
+        line_count = 0
+        with open(output_path, "w", buffering=buffer_size) as fw:
+            for batch in self.cost_batches(batch_size):
+                with self._stage("write_output", len(batch)):
+                    fw.write("".join(_format_cost_line(number, cost) for number, cost in batch))
+                line_count += len(batch)
+        return line_count
+
+
+class Call_Router_Single_Number(Call_Router):
+    """ Inputs single number and outputs cost. """
+    def __init__(self, number, path, workers=None, table=PrefixTree, profiler=None):
+        self.profiler = profiler
+        FILENAME_ROUTE, tree_cost = path, table()
+        routes = _load_partial_tables([FILENAME_ROUTE], workers, profiler)[0]
+        with self._stage("build_table", len(routes)):
+            for prefix, cost in routes.items():
+                tree_cost.set(prefix, cost)
+        self.snapshot = RouteSnapshot(tree_cost)        # Sets route prefixes with costs to trie
+
+        self.number_file = number
+
+    def compact_routes(self):
+        """ Removes routes costing same as their covering prefix and returns compaction report.\n
+        BEST/WORST CASE = O(n * k) --> Checks every route against its covering prefix. """
+        current = self.snapshot
+        removed = current.costs.redundant()
+        compacted = current.costs.updated(removals=removed)
+        self.snapshot = RouteSnapshot(compacted, version=current.version + 1)
+        return _compaction_report(current.costs, compacted, removed)
+
+class Call_Router_Multiple_Numbers(Call_Router):
+    """ Inputs list of numbers and outputs costs in array. Routes can change live (Scenario 5). """
+    def __init__(self, number, route_list, workers=None, table=PrefixTree, profiler=None):
+        self.profiler = profiler
+        partial_tables = _load_partial_tables(route_list, workers, profiler)
+        with self._stage("merge_routes", sum(len(routes) for routes in partial_tables)):
+            best_costs = _merge_least_cost(partial_tables)
+
+        tree_costs = table()
+        with self._stage("build_table", len(best_costs)):
+            for prefix, cost in best_costs.items():
+                tree_costs.set(prefix, cost)
+        # Flat tables (such as CompactRouteTable) hold carriers' own lists too, so parsed
+        # dictionaries are dropped instead of outliving load; tries would cost more than them
+        self.carrier_table = CarrierRoutes if table is PrefixTree else table
+        partial_tables = [self._carrier_list(routes) for routes in partial_tables]
+        # Cheapest cost per route prefix, plus each carrier's own list, as first version
+        self.snapshot = self._snapshot(tree_costs, dict(zip(route_list, partial_tables)), 0)
+        self.compacted_routes = PrefixTree()            # Prefixes dropped by compact_routes
+        self._update_lock = threading.Lock()            # Serializes writers, never taken by readers
+
+        self.number_file = number
+
+    def _carrier_list(self, routes=None):
+        """ Returns given parsed route list (CarrierRoutes), or empty one, as carrier_table. """
+        if self.carrier_table is CarrierRoutes:
+            return routes if routes is not None else CarrierRoutes()
+        return self.carrier_table(routes.items() if routes is not None else None)
+
+    @property
+    def carrier_routes(self):
+        """ Returns dictionary of carrier -> its own route list in current route snapshot. """
+        return self.snapshot.carrier_routes
+
+    def carrier(self, number):
+        """ Returns carrier offering cheapest route for given number, or None.\n
+        BEST/WORST CASE = O(k + C) --> One trie walk plus one lookup per carrier (C). """
+        snapshot = self.snapshot
+        prefix = snapshot.costs.longest_prefix(number)
+        return snapshot.carrier(prefix) if prefix is not None else None
+
+    def update_routes(self, carrier, changes):
+        """ Applies (prefix, cost) changes to carrier's routes (None removes) and returns new version.\n
+        BEST/WORST CASE = O(r + c * (C + k)) --> Copies carrier's routes (r), re-prices c changes. """
+        with self._update_lock:
+            final = dict(changes)                       # Last change of each prefix wins
+            routes = self.carrier_routes.get(carrier)
+            routes = routes if routes is not None else self._carrier_list()
+            assignments = [(prefix, cost) for prefix, cost in final.items() if cost is not None]
+            removals = [prefix for prefix, cost in final.items() if cost is None and routes.contains(prefix)]
+            carrier_routes = dict(self.carrier_routes)
+            carrier_routes[carrier] = routes.updated(assignments, removals)
+            return self._publish(set(final), carrier_routes)
+
+    def replace_carrier(self, carrier, route_file):
+        """ Replaces carrier's routes with those in given file and returns new route version.\n
+        BEST/WORST CASE = O(r + c * (C + k)) --> Parses file (r routes), then re-prices changes. """
+        new_routes = self._carrier_list(_load_carrier_routes(route_file))
+        with self._update_lock:
+            old_routes = self.carrier_routes.get(carrier)
+            old_routes = old_routes if old_routes is not None else self._carrier_list()
+            touched = {prefix for prefix, cost in new_routes.items() if old_routes.get(prefix) != cost}
+            touched.update(prefix for prefix, _ in old_routes.items() if not new_routes.contains(prefix))
+            carrier_routes = dict(self.carrier_routes)
+            carrier_routes[carrier] = new_routes
+            return self._publish(touched, carrier_routes)
+
+    def remove_carrier(self, carrier):
+        """ Removes carrier and its routes and returns new route version, or raises KeyError.\n
+        BEST/WORST CASE = O(c * (C + k)) --> Re-prices every prefix carrier offered. """
+        with self._update_lock:
+            if carrier not in self.carrier_routes:
+                raise KeyError("\n\nCARRIER NOT FOUND: {}\n".format(carrier))
+            carrier_routes = dict(self.carrier_routes)
+            touched = {prefix for prefix, _ in carrier_routes.pop(carrier).items()}
+            return self._publish(touched, carrier_routes)
+
+    def compact_routes(self):
+        """ Removes routes matching cost and carrier of their covering prefix and returns report.\n
+        BEST/WORST CASE = O(n * k) --> Checks every route against its covering prefix. """
+        with self._update_lock:
+            current = self.snapshot
+            costs, carrier = current.costs, current.carrier
+            removed = [prefix for prefix in costs.redundant()           # Cost matches covering prefix
+                       if carrier(prefix) == carrier(costs.longest_prefix(prefix[:-1]))]
+            for prefix in removed:
+                self.compacted_routes.set(prefix, None)
+            compacted = costs.updated(removals=removed)
+            self.snapshot = self._snapshot(compacted, current.carrier_routes, current.version + 1)
+            return _compaction_report(costs, compacted, removed)
+
+    def _snapshot(self, costs, carrier_routes, version):
+        """ Returns RouteSnapshot to publish for given routes (subclasses add derived tables). """
+        return RouteSnapshot(costs, carrier_routes, version)
+
+    def _publish(self, touched, carrier_routes):
+        """ Re-prices touched prefixes, publishes new snapshot and returns its version number. """
+        current, assignments, removals = self.route_costs, list(), list()
+        if self.compacted_routes.length():      # Covering price may change, so restores them
+            for prefix in list(touched):
+                for restored, _ in self.compacted_routes.items(prefix):
+                    self.compacted_routes.delete(restored)
+                    touched.add(restored)
+        for prefix in touched:
+            best_cost = None
+            for routes in carrier_routes.values():
+                cost = routes.get(prefix)
+                if cost is not None and (best_cost is None or cost < best_cost):
+                    best_cost = cost
+            if best_cost is None:
+                if current.contains(prefix):
+                    removals.append(prefix)
+            elif current.get(prefix) != best_cost:
+                assignments.append((prefix, best_cost))
+        if self.bloom is not None:              # Before swap, so new routes are never rejected
+            for prefix, _ in assignments:
+                self.bloom.add(prefix[:self.bloom_gate])
+                if len(prefix) < self.bloom_gate and len(prefix) not in self.bloom_short_lengths:
+                    self.bloom_short_lengths = sorted(self.bloom_short_lengths + [len(prefix)])
+        new_costs = current.updated(assignments, removals)
+        self.snapshot = self._snapshot(new_costs, carrier_routes, self.route_version + 1)   # Atomic swap
+        self.invalidate_cache()                 # After swap, so no stale cost can be re-cached
+        return self.route_version
+
+
+class Call_Router_Compiled_Index(Call_Router):
+    """ Inputs number file and compiled route index (see compile_routes). """
+    def __init__(self, number, index_path):
+        self.snapshot = RouteSnapshot(RouteIndex(index_path))   # Maps index; cold start does no parsing
+        self.number_file = number
+
+
+class Call_Router_Shared_Index(Call_Router):
+    """ Inputs number file and name of shared-memory route index (see share_routes). """
+    def __init__(self, number, index_name):
+        self.snapshot = RouteSnapshot(SharedRouteIndex(index_name))    # Attaches read-only; copies nothing
+        self.number_file = number
+
+
+def share_routes(route_list, name=None, workers=None):
+    """ Returns owning shared-memory route index of cheapest cost per prefix across carriers.\n
+    BEST/WORST CASE = O(r log r) --> Parses and merges r routes, then sorts them once. """
+    best_costs = _merge_least_cost(_load_partial_tables(route_list, workers))
+    return SharedRouteIndex.create(best_costs.items(), name)
+
+
+def compile_routes(route_list, index_path, workers=None, compact=False):
+    """ Compiles cheapest cost per prefix across carriers into route index and returns count.\n
+    BEST/WORST CASE = O(r log r) --> Parses and merges r routes, then sorts them once. """
+    best_costs = _merge_least_cost(_load_partial_tables(route_list, workers))
+    routes = best_costs.items()
+    if compact:
+        tree = PrefixTree(routes)
+        routes = tree.updated(removals=tree.redundant()).items()
+    return compile_index(routes, index_path)
+
+
+def _compaction_report(before, after, removed):
+    """ Returns dictionary of route counts (and table memory) before and after compaction. """
+    report = {
+        "routes_before": before.length(),
+        "routes_after": after.length(),
+        "removed": len(removed),
+        "removed_fraction": len(removed) / before.length() if before.length() else 0.0,
+    }
+    if hasattr(after, "memory_bytes"):
+        report.update(memory_bytes_before=before.memory_bytes(), memory_bytes_after=after.memory_bytes())
+    return report
+
+_chunk_price = None                                     # Pricing function of pool worker process
+
+def _init_price_worker(price):
+    """ Stores pricing function for _price_range calls in this pool worker process. """
+    global _chunk_price
+    _chunk_price = price
+
+def _price_range(task):
+    """ Returns call-costs text (if formatted) or cost array for (path, start, end, formatted) range. """
+    path, start, end, formatted = task
+    with open(path, "rb") as fr:
+        fr.seek(start)
+        lines = fr.read(end - start).decode().split("\n")
+    numbers, price = [line.strip() for line in lines], _chunk_price
+    numbers = [number for number in numbers if number]
+    if formatted:
+        return "".join(_format_cost_line(number, price(number)) for number in numbers)
+    return array("d", (cost if cost is not None else float("nan") for cost in map(price, numbers)))
+
+def _read_numbers(path):
+    """ Yields stripped phone numbers from number file one line at a time, skipping blanks.\n
+    BEST/WORST CASE = O(m) time, O(1) space --> Never holds more than one line. """
+    with open(path) as fr:
+        for line in fr:
+            line = line.strip()
+            if line:
+                yield line
+
+def _format_cost_line(number, cost):
+    """ Returns one call-costs output line for given number and cost (0 if unroutable). """
+    return "{},{}\n".format(number, cost if cost is not None else 0)
+
+def _load_carrier_routes(path):
+    """ Returns route list (CarrierRoutes) of prefix to cheapest cost in one carrier file.\n
+    BEST/WORST CASE = O(r) --> Parses every line of file once (r routes). """
+    with open(path) as fr:
+        return parse_route_lines(fr)
+
+def _load_partial_tables(route_list, workers=None, profiler=None):
+    """ Returns list of per-carrier route lists in file order, parsed by process pool if large.\n
+    BEST/WORST CASE = O(r) --> Parses every route once. """
+    total_bytes = sum(os.path.getsize(file) for file in route_list)
+    serial = workers == 1 or total_bytes < PARALLEL_LOAD_BYTES
+    if profiler is None and serial:
+        return [_load_carrier_routes(file) for file in route_list]
+    if profiler is None:
+        return load_routes_chunked(route_list, workers)
+    if not serial:
+        with profiler.stage("parse_routes") as record:
+            partial_tables = load_routes_chunked(route_list, workers)
+            record["items"] += sum(len(routes) for routes in partial_tables)
+        return partial_tables
+    partial_tables = list()
+    for file in route_list:
+        routes = CarrierRoutes()
+        with open(file) as fr:
+            while True:
+                with profiler.stage("read_routes") as record:
+                    lines = fr.readlines(READ_BLOCK_SIZE)
+                    record["items"] += sum(len(line) for line in lines)     # Characters read
+                if not lines:
+                    break
+                with profiler.stage("parse_routes", len(lines)):
+                    parse_route_lines(lines, routes)
+        partial_tables.append(routes)
+    return partial_tables
+
+def _merge_least_cost(partial_tables):
+    """ Returns dictionary holding minimum cost per prefix across partial tables.\n
+    BEST/WORST CASE = O(r) --> Visits every route of every partial table once. """
+    best_costs = dict()
+    for routes in partial_tables:
+        for prefix, cost in routes.items():
+            best = best_costs.get(prefix)
+            if best is None or cost < best:
+                best_costs[prefix] = cost
+    return best_costs
 
 if __name__ == "__main__":
-    number, path = "./data/phone-numbers-3.txt", "./data/route-costs-4.txt"
-    call_item = Call_Router_Single_Number(number, path)
-    print(call_item.cost_calculator())
+    if len(sys.argv) > 3 and sys.argv[1] == "compile":
+        # Usage: python main.py compile <index path> <route file> [<route file> ...]
+        route_count = compile_routes(sys.argv[3:], sys.argv[2])
+        print("Compiled {} routes into {}".format(route_count, sys.argv[2]))
+    elif len(sys.argv) > 3 and sys.argv[1] == "compact":
+        # Usage: python main.py compact <output route file> <route file> [<route file> ...]
+        router = Call_Router_Multiple_Numbers(None, sys.argv[3:])
+        report = router.compact_routes()
+        router.export_routes(sys.argv[2])
+        print("Kept {routes_after} of {routes_before} routes ({removed} redundant) in {path}".format(
+            path=sys.argv[2], **report))
+    elif len(sys.argv) > 3 and sys.argv[1] == "share":
+        # Usage: python main.py share <block name> <route file> [<route file> ...]
+        # Holds shared route index until interrupted, then removes it
+        shared_index = share_routes(sys.argv[3:], sys.argv[2])
+        signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+        print("Sharing {} routes as {}".format(shared_index.length(), shared_index.name))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            shared_index.close()
+    else:
+        number, path = "./data/phone-numbers-3.txt", "./data/route-costs-4.txt"
+        call_item = Call_Router_Single_Number(number, path)
+        print(call_item.cost_calculator())
 
 
 
@@ -0,0 +1,151 @@
+#!python
+
+from main import (Call_Router_Compiled_Index, Call_Router_Multiple_Numbers, Call_Router_Single_Number,
+                  PrefixTree, compile_routes)
+from routetable import CompactRouteTable
+import os
+import shutil
+import tempfile
+import unittest
+
+CARRIER_A = ['+1,0.5', '+123,0.2', '+1234,0.2', '+44,0.9']
+CARRIER_B = ['+12,0.5', '+1234,0.3', '+4420,0.9', '+4421,0.7']
+NUMBERS = ['+15550100', '+12550100', '+12350100', '+12340100', '+44200100', '+44210100', '+4430100', '+8610100']
+
+
+def _write_lines(path, lines):
+    with open(path, 'w') as fw:
+        fw.write(''.join(line + '\n' for line in lines))
+    return path
+
+
+class CallRouterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.carrier_a = _write_lines(os.path.join(self.directory, 'carrier-a.txt'), CARRIER_A)
+        self.carrier_b = _write_lines(os.path.join(self.directory, 'carrier-b.txt'), CARRIER_B)
+        self.number_file = _write_lines(os.path.join(self.directory, 'numbers.txt'), NUMBERS)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _router(self, table=PrefixTree):
+        return Call_Router_Multiple_Numbers(self.number_file, [self.carrier_a, self.carrier_b], table=table)
+
+    def test_compact_routes_keeps_prices(self):
+        router = Call_Router_Single_Number(self.number_file, self.carrier_a)
+        expected = router.cost_calculator()
+        report = router.compact_routes()
+        assert report['removed'] == 1                   # +1234 repeats +123
+        assert not router.route_costs.contains('+1234')
+        assert router.cost_calculator() == expected
+
+    def test_compact_routes_keeps_carriers(self):
+        router = self._router()
+        costs, carriers = router.cost_calculator(), [router.carrier(number) for number in NUMBERS]
+        report = router.compact_routes()
+        # +1234 (carrier A, same as +123) goes; +12 and +4420 match covering cost only
+        assert report['removed'] == 1
+        assert router.route_costs.contains('+12') and router.route_costs.contains('+4420')
+        assert router.cost_calculator() == costs
+        assert [router.carrier(number) for number in NUMBERS] == carriers
+
+    def test_carrier(self):
+        router = self._router()
+        assert [router.carrier(number) for number in NUMBERS] == [
+            self.carrier_a, self.carrier_b, self.carrier_a, self.carrier_a,
+            self.carrier_b, self.carrier_b, self.carrier_a, None]
+
+    def test_update_routes_publishes_snapshot(self):
+        router = self._router()
+        before = router.snapshot
+        assert router.update_routes(self.carrier_b, [('+1', 0.4), ('+44', 0.1), ('+4421', None)]) == 1
+        after = router.snapshot
+        assert after is not before and after.version == 1
+        # Held snapshot keeps costs and carriers of its own version
+        assert before.costs.lookup('+15550100') == 0.5
+        assert before.carrier(before.costs.longest_prefix('+15550100')) == self.carrier_a
+        assert before.carrier_routes[self.carrier_b].get('+4421') == 0.7
+        assert router.price('+15550100') == 0.4
+        assert router.carrier('+15550100') == self.carrier_b
+        assert router.price('+44210100') == 0.1 and router.carrier('+44210100') == self.carrier_b
+        assert router.update_routes('carrier-c', [('+86', 0.05), ('+86', None), ('+8610', 0.02)]) == 2
+        assert router.price('+8610100') == 0.02 and router.carrier('+8610100') == 'carrier-c'
+        assert not router.carrier_routes['carrier-c'].contains('+86')
+
+    def test_replace_and_remove_carrier(self):
+        router = self._router()
+        replacement = _write_lines(os.path.join(self.directory, 'carrier-b-new.txt'), ['+1,0.1', '+4421,0.8'])
+        router.replace_carrier(self.carrier_b, replacement)
+        assert router.price('+12550100') == 0.1 and router.carrier('+12550100') == self.carrier_b
+        assert router.price('+44210100') == 0.8 and router.carrier('+44210100') == self.carrier_b
+        assert router.price('+44200100') == 0.9 and router.carrier('+44200100') == self.carrier_a
+        router.remove_carrier(self.carrier_b)
+        assert router.route_version == 2
+        assert router.price('+12550100') == 0.5 and router.carrier('+12550100') == self.carrier_a
+        assert router.price('+44210100') == 0.9 and router.carrier('+44210100') == self.carrier_a
+        with self.assertRaises(KeyError):
+            router.remove_carrier(self.carrier_b)
+
+    def test_compact_table_keeps_carrier_lists_compact(self):
+        router, expected = self._router(CompactRouteTable), self._router()
+        assert all(isinstance(routes, CompactRouteTable) for routes in router.carrier_routes.values())
+        assert [router.carrier(number) for number in NUMBERS] == [expected.carrier(number) for number in NUMBERS]
+        router.update_routes('carrier-c', [('+8610', 0.0123456789)])      # Rounds same as cost table
+        assert router.price('+8610100') == 0.012346 and router.carrier('+8610100') == 'carrier-c'
+        replacement = _write_lines(os.path.join(self.directory, 'carrier-b-new.txt'), ['+1,0.1'])
+        router.replace_carrier(self.carrier_b, replacement)
+        assert isinstance(router.carrier_routes[self.carrier_b], CompactRouteTable)
+        assert router.price('+44210100') == 0.9 and router.carrier('+44210100') == self.carrier_a
+        assert router.price('+12550100') == 0.1 and router.carrier('+12550100') == self.carrier_b
+
+    def test_constructors_share_argument_order(self):
+        single = Call_Router_Single_Number(self.number_file, self.carrier_a, None, CompactRouteTable)
+        multiple = Call_Router_Multiple_Numbers(self.number_file, [self.carrier_a], None, CompactRouteTable)
+        assert isinstance(single.route_costs, CompactRouteTable)
+        assert isinstance(multiple.route_costs, CompactRouteTable)
+        assert single.cost_calculator() == multiple.cost_calculator()
+
+    def test_updates_after_compaction(self):
+        router = self._router()
+        router.compact_routes()
+        router.update_routes(self.carrier_a, [('+123', 0.6)])   # +1234 comes back at own price
+        assert router.price('+12340100') == 0.2 and router.carrier('+12340100') == self.carrier_a
+        assert router.price('+12350100') == 0.6 and router.carrier('+12350100') == self.carrier_a
+
+    def test_cache_never_serves_replaced_routes(self):
+        router = self._router()
+        router.enable_cache(10)
+        price = router._pricer()                        # Pinned to version 0, like slow reader
+        assert router.price('+15550100') == 0.5
+        router.update_routes(self.carrier_b, [('+1', 0.4)])
+        assert router.cache.length() == 0
+        assert price('+15550100') == 0.5                # Stored after clear, tagged version 0
+        assert router.price('+15550100') == 0.4
+        assert router.cache.get('+15550100') == (1, 0.4)
+        assert price('+15550100') == 0.5                # Pinned reader keeps its own version
+        assert router.price('+15550100') == 0.4
+
+    def test_bloom_filter_on_compiled_index(self):
+        index_path = os.path.join(self.directory, 'routes.idx')
+        compile_routes([self.carrier_a, self.carrier_b], index_path)
+        router = Call_Router_Compiled_Index(self.number_file, index_path)
+        expected = router.cost_calculator()
+        router.enable_bloom_filter(gate_length=3)
+        assert router.bloom_short_lengths == [2]        # "+1" is shorter than gate
+        assert router.cost_calculator() == expected
+        assert [router._gated_lookup(router.route_costs, number) for number in NUMBERS] == expected
+        assert router.price('+8610100') is None
+        stats = router.bloom_stats()                    # "+86..." priced three times
+        assert stats['rejected'] + stats['unroutable_passes'] == 3
+
+    def test_compact_routes_needs_route_tree(self):
+        index_path = os.path.join(self.directory, 'routes.idx')
+        compile_routes([self.carrier_a], index_path)
+        router = Call_Router_Compiled_Index(self.number_file, index_path)
+        assert not hasattr(router, 'compact_routes')
+
+
+if __name__ == '__main__':
+    unittest.main()
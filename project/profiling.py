@@ -0,0 +1,260 @@
+"""
+NAME:       Aakash Sudhakar
+PROJECT:    Call Routing Project
+COURSE:     CS3 at Make School (Alan Davis)
+"""
+
+# =============================== INITIALIZERS AND IMPORT STATEMENTS =================================
+
+
+import gc
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource                                     # Unix only; peak RSS is skipped without it
+except ImportError:
+    resource = None
+
+SUB_BUCKET_BITS = 8                                     # Histogram values keep 8 significant bits (<0.8% error)
+
+
+# ========================================= STAGE PROFILER ===========================================
+
+
+def peak_rss_bytes():
+    """ Returns peak resident memory of this process so far in bytes, or None if unknown. """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Linux reports kilobytes
+
+
+class StageProfiler(object):
+    """ Opt-in instrumentation for router stages (reading files, parsing, building tables,
+    lookups, writing output). Each stage records wall and CPU seconds, items handled and
+    their rate, plus peak memory; stages entered repeatedly (such as once per batch) add up
+    into one record. Pass as profiler to router, then read report(), or give callback to
+    receive (stage name, record) as each stage finishes. Routers without profiler skip all
+    of this, so instrumentation costs nothing unless asked for. """
+
+    def __init__(self, callback=None, trace_memory=False, count_probes=False):
+        """ Initializes profiler with no stages. trace_memory also tracks peak Python heap
+        per stage through tracemalloc, which is precise but slows allocation-heavy stages.
+        count_probes sends lookups through ProbeCounter to record table lookups and probes,
+        which about doubles lookup stage time, so leave it off when timing lookups. """
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.count_probes = count_probes
+        self.stages = dict()                            # Stage name -> record, in first-run order
+        self._started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def __repr__(self):
+        """ Returns string representation of profiler. """
+        return "StageProfiler({} STAGES)".format(len(self.stages))
+
+    @contextmanager
+    def stage(self, name, items=0):
+        """ Times block as given stage and yields its record, whose "items" count (and any
+        extra counters) block may increase before it ends. """
+        record = self.stages.get(name)
+        if record is None:
+            record = self.stages[name] = {"stage": name, "calls": 0, "wall_seconds": 0.0,
+                                          "cpu_seconds": 0.0, "items": 0}
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] += time.perf_counter() - wall
+            record["cpu_seconds"] += time.process_time() - cpu
+            record["calls"] += 1
+            record["items"] += items
+            wall_seconds = record["wall_seconds"]
+            record["items_per_sec"] = record["items"] / wall_seconds if wall_seconds else None
+            record["peak_rss_bytes"] = peak_rss_bytes()
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                record["peak_traced_bytes"] = max(record.get("peak_traced_bytes", 0), peak)
+            if self.callback is not None:
+                self.callback(name, dict(record))
+
+    def report(self):
+        """ Returns dictionary of stage records (in first-run order) with totals. """
+        stages = [dict(record) for record in self.stages.values()]
+        return {
+            "stages": stages,
+            "total_wall_seconds": sum(record["wall_seconds"] for record in stages),
+            "total_cpu_seconds": sum(record["cpu_seconds"] for record in stages),
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+    def format_report(self):
+        """ Returns report as aligned text table, one line per stage. """
+        lines = ["{:<14} {:>10} {:>10} {:>12} {:>14}".format("STAGE", "WALL (S)", "CPU (S)", "ITEMS", "ITEMS/SEC")]
+        for record in self.stages.values():
+            rate = record["items_per_sec"]
+            lines.append("{:<14} {:>10.4f} {:>10.4f} {:>12} {:>14}".format(
+                record["stage"], record["wall_seconds"], record["cpu_seconds"], record["items"],
+                "{:.0f}".format(rate) if rate and record["items"] else "-"))
+        return "\n".join(lines)
+
+    def close(self):
+        """ Stops memory tracing if this profiler started it. """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+class ProbeCounter(object):
+    """ Counts lookups made through route table it is attached to and table probes they took:
+    trie nodes visited or hash slots read, via table's lookup_probes if it has one, else one
+    probe per lookup. Only built for profiled runs, so plain lookups stay unwrapped. """
+
+    def __init__(self, table=None):
+        self.lookups, self.probes = 0, 0
+        if table is not None:
+            self.attach(table)
+
+    def attach(self, table):
+        """ Sends later lookups to given table (such as current route snapshot) and returns
+        counter itself, so it can stand in for table. """
+        self.table = table
+        self._lookup_probes = getattr(table, "lookup_probes", None)
+        return self
+
+    def lookup(self, key):
+        """ Returns table's lookup answer for given key, counting its probes. """
+        self.lookups += 1
+        if self._lookup_probes is None:
+            self.probes += 1
+            return self.table.lookup(key)
+        value, probes = self._lookup_probes(key)
+        self.probes += probes
+        return value
+
+
+# ======================================= LATENCY HISTOGRAM ==========================================
+
+
+class LatencyHistogram(object):
+    """ HDR-style histogram of integer values (such as nanoseconds) with log-linear buckets:
+    values below 2^SUB_BUCKET_BITS get own bucket, larger ones share buckets whose width
+    doubles with each power of two, so every value is kept within 1 / 2^(SUB_BUCKET_BITS - 1)
+    (under 0.8%) using a few thousand counters at most, however many values are recorded. """
+
+    def __init__(self):
+        self.counts = list()
+        self.total_count, self.total, self.min, self.max = 0, 0, None, 0
+
+    def __repr__(self):
+        """ Returns string representation of histogram. """
+        return "LatencyHistogram({} VALUES)".format(self.total_count)
+
+    @staticmethod
+    def _index(value):
+        """ Returns bucket index of given non-negative integer value. """
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        if shift <= 0:
+            return value
+        return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+    @staticmethod
+    def _highest_value(index):
+        """ Returns largest value falling into given bucket index. """
+        half = 1 << (SUB_BUCKET_BITS - 1)
+        if index < 2 * half:
+            return index
+        shift = (index >> (SUB_BUCKET_BITS - 1)) - 1
+        return ((index - (shift << (SUB_BUCKET_BITS - 1)) + 1) << shift) - 1
+
+    def record(self, value, count=1):
+        """ Adds given value (clamped to 0) count times.\n
+        BEST/WORST CASE = O(1) amortized --> Increments one bucket counter. """
+        value = max(0, int(value))
+        index = self._index(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += count
+        self.total_count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        """ Adds every value recorded in other histogram to this one. """
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total_count += other.total_count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, fraction):
+        """ Returns value at given fraction (0 to 1) of recorded values, or 0 if empty; as in
+        HDR histograms, this is highest value equivalent to it within bucket precision.\n
+        BEST/WORST CASE = O(b) --> Walks bucket counters (b buckets). """
+        if not self.total_count:
+            return 0
+        rank, seen = max(1, int(round(fraction * self.total_count))), 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._highest_value(index), self.max)
+        return self.max
+
+    def summary(self, scale=1e6):
+        """ Returns dictionary of count, mean, max and p50/p90/p99/p999, with values divided
+        by scale (default turns nanoseconds into milliseconds). """
+        return {
+            "count": self.total_count,
+            "mean": self.total / self.total_count / scale if self.total_count else 0.0,
+            "p50": self.percentile(0.50) / scale,
+            "p90": self.percentile(0.90) / scale,
+            "p99": self.percentile(0.99) / scale,
+            "p999": self.percentile(0.999) / scale,
+            "max": self.max / scale,
+        }
+
+
+class GcMonitor(object):
+    """ Times every garbage collection pause through gc.callbacks while started, keeping
+    pause histogram (nanoseconds) and collection count per generation. """
+
+    def __init__(self):
+        self.pauses = LatencyHistogram()
+        self.collections = [0, 0, 0]                    # Collections per generation
+        self._started_at = None
+
+    def _callback(self, phase, info):
+        """ Records pause between collector's "start" and "stop" callbacks. """
+        if phase == "start":
+            self._started_at = time.perf_counter_ns()
+        elif self._started_at is not None:
+            self.pauses.record(time.perf_counter_ns() - self._started_at)
+            self.collections[info["generation"]] += 1
+            self._started_at = None
+
+    def start(self):
+        """ Starts timing collections and returns monitor. """
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+        return self
+
+    def stop(self):
+        """ Stops timing collections. """
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def stats(self):
+        """ Returns dictionary of collection counts and pause times in milliseconds. """
+        stats = self.pauses.summary()
+        stats.update(collections=sum(self.collections), by_generation=list(self.collections),
+                     total_ms=self.pauses.total / 1e6)
+        return stats
@@ -0,0 +1,94 @@
+#!python
+
+from main import Call_Router_Multiple_Numbers, Call_Router_Single_Number
+from profiling import SUB_BUCKET_BITS, LatencyHistogram, ProbeCounter, StageProfiler
+from testdata import SyntheticDataTestCase
+import os
+import random
+import unittest
+
+
+class StageProfilerTest(SyntheticDataTestCase):
+
+    carriers, routes, numbers = 2, 3000, 25000
+
+    def test_stage_records_add_up(self):
+        profiler = StageProfiler()
+        for _ in range(3):
+            with profiler.stage('parse_routes', 10) as record:
+                record['probes'] = record.get('probes', 0) + 2
+        record = profiler.report()['stages'][0]
+        assert record['calls'] == 3 and record['items'] == 30 and record['probes'] == 6
+        assert record['wall_seconds'] >= 0 and 'parse_routes' in profiler.format_report()
+
+    def test_profiled_router_matches_unprofiled(self):
+        expected = Call_Router_Multiple_Numbers(self.number_file, self.route_list).cost_calculator()
+        profiler = StageProfiler(count_probes=True)
+        router = Call_Router_Multiple_Numbers(self.number_file, self.route_list, profiler=profiler)
+        assert router.cost_calculator() == expected
+        stages = {record['stage']: record for record in profiler.report()['stages']}
+        assert list(stages) == ['read_routes', 'parse_routes', 'merge_routes', 'build_table',
+                                'read_numbers', 'lookup']
+        route_chars = sum(os.path.getsize(path) for path in self.route_list)
+        assert stages['read_routes']['items'] == route_chars
+        assert stages['parse_routes']['items'] == 6000
+        # Numbers and routes are streamed in blocks, as without profiler
+        assert stages['read_numbers']['calls'] == 4     # Three batches of 10000, then end of file
+        assert stages['read_numbers']['items'] == stages['lookup']['items'] == 25000
+        assert stages['lookup']['table_lookups'] == 25000 and stages['lookup']['probes'] > 25000
+
+    def test_probe_counter(self):
+        router = Call_Router_Single_Number(self.number_file, self.route_list[0])
+        counter = ProbeCounter(router.route_costs)
+        numbers = list(router.numbers)[:100]
+        assert [counter.lookup(number) for number in numbers] == [router.price(number) for number in numbers]
+        assert counter.lookups == 100 and counter.probes >= 100
+
+
+class LatencyHistogramTest(unittest.TestCase):
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(0.99) == 0
+        assert histogram.summary()['count'] == 0 and histogram.summary()['mean'] == 0.0
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record(value)
+        assert histogram.percentile(0.5) == 50
+        assert histogram.percentile(0.9) == 90
+        assert histogram.percentile(0.99) == 99
+        assert histogram.percentile(1.0) == 100
+        assert histogram.min == 1 and histogram.max == 100
+        histogram.record(-5)                            # Clamped to 0
+        assert histogram.min == 0 and histogram.percentile(0) == 0
+
+    def test_percentiles_within_precision(self):
+        rng, histogram = random.Random(0), LatencyHistogram()
+        values = sorted(int(rng.lognormvariate(13, 1.5)) for _ in range(20000))
+        for value in values:
+            histogram.record(value)
+        bound = 1 / 2 ** (SUB_BUCKET_BITS - 1)
+        assert bound < 0.01                             # Docstring promises under 1%
+        for fraction in (0.5, 0.9, 0.99, 0.999):
+            exact = values[int(round(fraction * len(values))) - 1]
+            estimate = histogram.percentile(fraction)
+            assert exact <= estimate <= exact * (1 + bound), (fraction, exact, estimate)
+        assert histogram.percentile(1.0) == values[-1]
+        assert len(histogram.counts) < 4000
+
+    def test_merge_and_summary(self):
+        first, second, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in range(0, 5000000, 977):
+            (first if value % 2 else second).record(value)
+            both.record(value)
+        first.merge(second)
+        assert first.counts == both.counts
+        assert first.summary() == both.summary()
+        assert both.summary(scale=1)['max'] == both.max
+        assert both.summary()['p50'] == both.percentile(0.5) / 1e6
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,246 @@
+"""
+NAME:       Aakash Sudhakar
+PROJECT:    Call Routing Project
+COURSE:     CS3 at Make School (Alan Davis)
+"""
+
+# =============================== INITIALIZERS AND IMPORT STATEMENTS =================================
+
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+
+from benchmark import COUNTRY_CODES, generate_numbers, route_prefixes
+from main import Call_Router_Compiled_Index, Call_Router_Multiple_Numbers, Call_Router_Shared_Index, _read_numbers
+from profiling import GcMonitor, LatencyHistogram
+from server import DRAIN_THRESHOLD, open_connection
+
+SPIN_NANOSECONDS = 200000                               # Waits shorter than this spin (sleep overshoots)
+MIN_COMPARED_MS = 0.05                                  # Smaller latencies are too noisy to flag
+
+
+# ========================================= REPLAY SCHEDULE ==========================================
+#
+# Replays are open-loop: every request has intended send time fixed up front by target rate
+# (or by recorded arrival times), and its latency is measured from that intended time, not
+# from when it was actually sent. When router stalls, requests queued behind stall are
+# charged for waiting, so stalls show up in tail percentiles instead of being hidden by
+# sender slowing down with it (coordinated omission).
+
+
+def load_log(path):
+    """ Returns (offsets, numbers) from number log: one number per line (offsets is None),
+    or recorded "seconds,number" lines giving each number's arrival time. """
+    offsets, numbers = list(), list()
+    for line in _read_numbers(path):
+        seconds, _, number = line.rpartition(",")
+        numbers.append(number)
+        if seconds:
+            offsets.append(float(seconds))
+    return (offsets if len(offsets) == len(numbers) else None), numbers
+
+def synthetic_prefixes(route_list=(), router=None):
+    """ Returns route prefixes synthetic numbers should extend: those of in-process router's
+    route table, else of first route file, else bare country codes, so server replays need
+    no route files here. """
+    if router is not None:
+        return [prefix for prefix, _ in router.route_costs.items()]
+    if route_list:
+        return route_prefixes(route_list[0])
+    return ["+" + code for code, _ in COUNTRY_CODES]
+
+def schedule(count, rate=None, arrivals="uniform", offsets=None, speed=1.0, seed=0):
+    """ Returns list of count intended send times in seconds from start: recorded offsets
+    (sped up by speed) if given, else requests at given rate per second, evenly spaced
+    ("uniform") or with exponential gaps ("poisson", same mean rate, seeded). """
+    if offsets is not None:
+        return [(offset - offsets[0]) / speed for offset in offsets[:count]]
+    if arrivals == "poisson":
+        rng, elapsed, send_times = random.Random(seed), 0.0, list()
+        for _ in range(count):
+            send_times.append(elapsed)
+            elapsed += rng.expovariate(rate)
+        return send_times
+    return [index / rate for index in range(count)]
+
+def _requests(numbers, count, batch_size):
+    """ Returns list of count requests, each list of batch_size numbers cycling through log. """
+    return [[numbers[(index * batch_size + offset) % len(numbers)] for offset in range(batch_size)]
+            for index in range(count)]
+
+def _wait_until(deadline):
+    """ Waits until perf_counter_ns reaches deadline, sleeping most of way and spinning rest. """
+    remaining = deadline - time.perf_counter_ns()
+    if remaining > SPIN_NANOSECONDS:
+        time.sleep((remaining - SPIN_NANOSECONDS) / 1e9)
+    while time.perf_counter_ns() < deadline:
+        pass
+
+def _report(target, requests, batch_size, seconds, send_times, latency, service, gc_monitor):
+    """ Returns result dictionary of one replay. """
+    planned = send_times[-1] if send_times else 0.0
+    return {
+        "target": target,
+        "requests": len(requests),
+        "numbers": len(requests) * batch_size,
+        "seconds": seconds,
+        "target_rate": len(send_times) / planned if planned else None,
+        "achieved_rate": len(requests) / seconds if seconds else None,
+        "latency_ms": latency.summary(),
+        "service_ms": service.summary() if service is not None else None,
+        "gc": gc_monitor.stats(),
+    }
+
+
+# ============================================ TARGETS ===============================================
+
+
+def replay_in_process(router, numbers, send_times, batch_size=1):
+    """ Replays requests against router in this process on given schedule, through same
+    snapshot pricer cost_calculator uses (cache and Bloom filter included), and returns
+    report with latency (from intended send time), service time and GC pauses. """
+    requests = _requests(numbers, len(send_times), batch_size)
+    latency, service = LatencyHistogram(), LatencyHistogram()
+    price, clock = router._pricer(), time.perf_counter_ns
+    gc_monitor = GcMonitor().start()
+    start = clock()
+    try:
+        for offset, request in zip(send_times, requests):
+            intended = start + int(offset * 1e9)
+            if clock() < intended:
+                _wait_until(intended)
+            began = clock()
+            for number in request:
+                price(number)
+            done = clock()
+            latency.record(done - intended)
+            service.record(done - began)
+    finally:
+        gc_monitor.stop()
+    seconds = (clock() - start) / 1e9
+    return _report("in-process", requests, batch_size, seconds, send_times, latency, service, gc_monitor)
+
+async def replay_server(numbers, send_times, batch_size=1, connections=4, **address):
+    """ Replays requests against running pricing server on given schedule, spread round robin
+    over several connections, and returns report with latency (from intended send time),
+    this process's GC pauses and server's own stats (including its GC pauses). Requests
+    are sent on time whether or not earlier answers have arrived. """
+    requests = _requests(numbers, len(send_times), batch_size)
+    latency, clock = LatencyHistogram(), time.perf_counter_ns
+    streams = [await open_connection(**address) for _ in range(connections)]
+    pending = [deque() for _ in streams]                # Intended send times awaiting answers
+
+    async def receive(reader, intended_times, count):
+        for _ in range(count):
+            if not await reader.readline():
+                raise ConnectionError("\n\nSERVER CLOSED CONNECTION EARLY.\n")
+            latency.record(clock() - intended_times.popleft())     # Answers arrive in request order
+
+    receivers = [asyncio.ensure_future(receive(reader, pending[index], len(requests[index::connections])))
+                 for index, (reader, _) in enumerate(streams)]
+    gc_monitor = GcMonitor().start()
+    start = clock()
+    try:
+        for index, (offset, request) in enumerate(zip(send_times, requests)):
+            intended = start + int(offset * 1e9)
+            delay = intended - clock()
+            if delay > 0:
+                await asyncio.sleep(delay / 1e9)
+            connection = index % connections
+            writer = streams[connection][1]
+            pending[connection].append(intended)
+            writer.write(" ".join(request).encode() + b"\n")
+            if writer.transport.get_write_buffer_size() > DRAIN_THRESHOLD:
+                await writer.drain()
+        await asyncio.gather(*receivers)
+    finally:
+        gc_monitor.stop()
+    seconds = (clock() - start) / 1e9
+
+    reader, writer = streams[0]
+    writer.write(b"STATS\n")
+    server_stats = json.loads(await reader.readline())
+    for _, writer in streams:
+        writer.close()
+    report = _report("server", requests, batch_size, seconds, send_times, latency, None, gc_monitor)
+    report["server"] = server_stats
+    return report
+
+def compare(result, baseline, tolerance=0.2):
+    """ Returns list of messages for latency percentiles that got slower than baseline by
+    more than tolerance (fraction). Percentiles under MIN_COMPARED_MS are skipped. """
+    regressions = list()
+    for key in ("p50", "p99", "p999"):
+        old, new = baseline["latency_ms"][key], result["latency_ms"][key]
+        if old >= MIN_COMPARED_MS and new > old * (1 + tolerance):
+            regressions.append("{} {}: {:.3f}ms -> {:.3f}ms".format(result["target"], key, old, new))
+    return regressions
+
+
+# =========================================== MAIN SCRIPT ============================================
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop latency replay for call routing pricing path.")
+    parser.add_argument("log", help="number log: numbers, or 'seconds,number' lines with arrival times")
+    parser.add_argument("--synthetic", type=int,
+                        help="first write this many synthetic numbers to log (routes optional)")
+    parser.add_argument("--routes", nargs="*", default=[], help="carrier route files (in-process target)")
+    parser.add_argument("--index", help="compiled route index (in-process target)")
+    parser.add_argument("--shared", help="shared-memory route index name (in-process target)")
+    parser.add_argument("--cache", type=int, help="numbers kept in LRU result cache (in-process target)")
+    parser.add_argument("--server", action="store_true", help="replay against running pricing server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8642)
+    parser.add_argument("--unix", help="Unix socket path (instead of TCP)")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=10000.0, help="requests per second")
+    parser.add_argument("--requests", type=int, help="requests to send (default whole log)")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--arrivals", choices=("uniform", "poisson"), default="uniform")
+    parser.add_argument("--speed", type=float, default=1.0, help="speed-up of recorded arrival times")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file to write JSON result to")
+    parser.add_argument("--baseline", help="earlier result file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    router = None
+    if not args.server:
+        if args.shared:
+            router = Call_Router_Shared_Index(None, args.shared)
+        elif args.index:
+            router = Call_Router_Compiled_Index(None, args.index)
+        else:
+            router = Call_Router_Multiple_Numbers(None, args.routes)
+        if args.cache:
+            router.enable_cache(args.cache)
+    if args.synthetic:
+        generate_numbers(args.log, args.synthetic, synthetic_prefixes(args.routes, router), args.seed)
+    offsets, numbers = load_log(args.log)
+    send_times = schedule(args.requests or len(numbers), args.rate, args.arrivals, offsets, args.speed, args.seed)
+
+    if args.server:
+        address = {"host": args.host, "port": args.port, "unix_path": args.unix}
+        result = asyncio.run(replay_server(numbers, send_times, args.batch_size, args.connections, **address))
+    else:
+        result = replay_in_process(router, numbers, send_times, args.batch_size)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as fw:
+            json.dump(result, fw, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fr:
+            regressions = compare(result, json.load(fr), args.tolerance)
+        for message in regressions:
+            print("REGRESSION: " + message)
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
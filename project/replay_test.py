@@ -0,0 +1,44 @@
+#!python
+
+from benchmark import COUNTRY_CODES
+from main import Call_Router_Multiple_Numbers
+from replay import load_log, replay_in_process, schedule, synthetic_prefixes
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class ReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.routes = os.path.join(self.directory, "routes.txt")
+        with open(self.routes, "w") as fw:
+            fw.write("+1415,0.02\n+44,0.05\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_synthetic_prefixes_need_no_routes(self):
+        assert synthetic_prefixes() == ["+" + code for code, _ in COUNTRY_CODES]
+        assert synthetic_prefixes([self.routes]) == ["+1415", "+44"]
+        router = Call_Router_Multiple_Numbers(None, [self.routes])
+        assert sorted(synthetic_prefixes((), router)) == ["+1415", "+44"]
+
+    def test_schedule_and_in_process_replay(self):
+        log = os.path.join(self.directory, "log.txt")
+        with open(log, "w") as fw:
+            fw.write("0.0,+14155550000\n0.5,+447700900000\n1.0,+99\n")
+        offsets, numbers = load_log(log)
+        assert offsets == [0.0, 0.5, 1.0]
+        assert schedule(3, offsets=offsets, speed=100.0) == [0.0, 0.005, 0.01]
+        assert schedule(4, rate=2.0) == [0.0, 0.5, 1.0, 1.5]
+        router = Call_Router_Multiple_Numbers(None, [self.routes])
+        report = replay_in_process(router, numbers, schedule(6, rate=10000.0), batch_size=2)
+        assert report["requests"] == 6 and report["numbers"] == 12
+        assert report["latency_ms"]["count"] == 6
+
+
+if __name__ == '__main__':
+    unittest.main()
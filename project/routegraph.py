@@ -0,0 +1,190 @@
+"""
+NAME:       Aakash Sudhakar
+PROJECT:    Call Routing Project
+COURSE:     CS3 at Make School (Alan Davis)
+"""
+
+# =============================== INITIALIZERS AND IMPORT STATEMENTS =================================
+
+
+import heapq
+from itertools import count
+
+from main import CACHE_SIZE, PrefixTree
+from lrucache import LRUCache
+
+_MISSING = object()                                     # Cache sentinel (None is a valid answer)
+
+
+# ========================================= ROUTING GRAPH ============================================
+
+
+class RoutingGraph(object):
+    """ Directed graph of switching points (origins, carriers, regions) joined by weighted
+    edges (carrier legs and interconnects, each with per-minute cost). Nodes may also
+    terminate calls: given route table prices numbers leaving network there. Cheapest
+    routes come from Dijkstra's algorithm over binary heap. Shortest-path tree of every
+    source queried is kept (or built ahead by precompute), and answers are cached (paths
+    and number prices apart, as node and number may be same string), so repeated queries
+    cost one tree walk or one cache hit; any edge change drops both. """
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.edges = dict()                             # Node -> {neighbor: (cost, carrier)}
+        self.terminations = dict()                      # Node -> route table of numbers it terminates
+        self.trees = dict()                             # Source -> (costs, previous) shortest-path tree
+        self.path_cache = LRUCache(cache_size)          # (source, target) -> (path, cost)
+        self.price_cache = LRUCache(cache_size)         # (source, number) -> (path, cost)
+
+    def __repr__(self):
+        """ Returns string representation of routing graph. """
+        edge_count = sum(len(neighbors) for neighbors in self.edges.values())
+        return "RoutingGraph({} NODES, {} EDGES)".format(len(self.nodes()), edge_count)
+
+    def nodes(self):
+        """ Returns set of every node with edges or terminations. """
+        nodes = set(self.edges) | set(self.terminations)
+        for neighbors in self.edges.values():
+            nodes.update(neighbors)
+        return nodes
+
+    def _changed(self):
+        """ Drops cached answers and shortest-path trees, which edge changes make stale. """
+        self.trees.clear()
+        self.path_cache.clear()
+        self.price_cache.clear()
+
+    def add_edge(self, source, target, cost, carrier=None):
+        """ Adds directed edge (or replaces existing one) from source to target with given
+        cost, carried by given carrier. Raises ValueError for negative cost, which
+        Dijkstra's algorithm cannot handle. """
+        if cost < 0:
+            raise ValueError("\n\nNEGATIVE EDGE COST: {} -> {} ({})\n".format(source, target, cost))
+        self.edges.setdefault(source, dict())[target] = (cost, carrier)
+        self._changed()
+
+    def remove_edge(self, source, target):
+        """ Removes directed edge from source to target, or raises KeyError if missing. """
+        neighbors = self.edges.get(source)
+        if neighbors is None or target not in neighbors:
+            raise KeyError("\n\nEDGE NOT FOUND: {} -> {}\n".format(source, target))
+        del neighbors[target]
+        self._changed()
+
+    def add_termination(self, node, route_costs):
+        """ Lets node terminate numbers priced by given route table (anything with lookup,
+        such as PrefixTree of route prefix -> cost). """
+        self.terminations[node] = route_costs
+        self._changed()
+
+    def _search(self, source, target=None):
+        """ Returns (costs, previous) dictionaries of Dijkstra's algorithm from source: cheapest
+        known cost to each reached node and node before it on that path. Stops early once
+        target (if given) is settled.\n
+        BEST CASE = O(1) --> Target is source itself.\n
+        WORST CASE = O(E log V) --> Pushes every edge (E) onto heap of at most E entries. """
+        costs, previous, settled = {source: 0}, {source: None}, set()
+        tie_breaker = count()                           # Keeps heap from comparing nodes
+        heap = [(0, next(tie_breaker), source)]
+        while heap:
+            cost, _, node = heapq.heappop(heap)
+            if node in settled:
+                continue                                # Stale entry for already settled node
+            settled.add(node)
+            if node == target:
+                break
+            for neighbor, (edge_cost, _) in self.edges.get(node, dict()).items():
+                new_cost = cost + edge_cost
+                if neighbor not in costs or new_cost < costs[neighbor]:
+                    costs[neighbor], previous[neighbor] = new_cost, node
+                    heapq.heappush(heap, (new_cost, next(tie_breaker), neighbor))
+        return costs, previous
+
+    def precompute(self, sources=None):
+        """ Builds full shortest-path tree from each given source (default every node with
+        outgoing edges), such as every origin region, so later queries from them are
+        answered by walking tree instead of searching.\n
+        BEST/WORST CASE = O(S * E log V) --> One full search per source (S sources). """
+        for source in (sources if sources is not None else list(self.edges)):
+            self.trees[source] = self._search(source)
+
+    def _tree(self, source):
+        """ Returns shortest-path tree from source, building and keeping it if missing. """
+        tree = self.trees.get(source)
+        if tree is None:
+            tree = self.trees[source] = self._search(source)
+        return tree
+
+    def cheapest_path(self, source, target):
+        """ Returns (path, cost) of cheapest route from source to target, with path as list of
+        nodes from source to target, or None if target is unreachable.\n
+        BEST CASE = O(1) --> Answer is cached.\n
+        WORST CASE = O(E log V) --> Searches graph from source. """
+        key = (source, target)
+        answer = self.path_cache.get(key, _MISSING)
+        if answer is not _MISSING:
+            return answer
+        tree = self.trees.get(source)
+        costs, previous = tree if tree is not None else self._search(source, target)
+        answer = (_walk_back(previous, target), costs[target]) if target in costs else None
+        self.path_cache.set(key, answer)
+        return answer
+
+    def price(self, source, number):
+        """ Returns (path, cost) of cheapest way to complete call to number from source: path
+        to some terminating node plus that node's price for number, with number appended as
+        last path entry. Returns None if no reachable node terminates number.\n
+        BEST CASE = O(1) --> Answer is cached.\n
+        WORST CASE = O(T * k) --> One route lookup per reachable terminating node (T),
+        once source's shortest-path tree exists. """
+        key = (source, number)
+        answer = self.price_cache.get(key, _MISSING)
+        if answer is not _MISSING:
+            return answer
+        costs, previous = self._tree(source)
+        best_node, best_cost = None, None
+        for node, route_costs in self.terminations.items():
+            if node not in costs:
+                continue
+            termination_cost = route_costs.lookup(number)
+            if termination_cost is not None:
+                total = costs[node] + termination_cost
+                if best_cost is None or total < best_cost:
+                    best_node, best_cost = node, total
+        answer = None
+        if best_node is not None:
+            answer = (_walk_back(previous, best_node) + [number], best_cost)
+        self.price_cache.set(key, answer)
+        return answer
+
+    def hops(self, path):
+        """ Returns list of (source, target, carrier, cost) for each edge along given path
+        of nodes (as returned by cheapest_path, or by price with number dropped). """
+        hops = list()
+        for source, target in zip(path, path[1:]):
+            cost, carrier = self.edges[source][target]
+            hops.append((source, target, carrier, cost))
+        return hops
+
+
+def _walk_back(previous, target):
+    """ Returns path from search source to target by following previous links back. """
+    path = list()
+    while target is not None:
+        path.append(target)
+        target = previous[target]
+    return path[::-1]
+
+def carrier_graph(origin, carrier_routes, interconnects=(), access_costs=None, cache_size=CACHE_SIZE):
+    """ Returns routing graph for least-cost routing through multiple carriers: origin links
+    to every carrier (at its access cost, default 0), interconnects add (carrier, carrier,
+    cost) hand-off edges, and each carrier terminates numbers at its own route-list prices
+    (carrier_routes maps carrier to {prefix: cost}, as in Call_Router_Multiple_Numbers).
+    graph.price(origin, number) then returns cheapest carrier chain and its total cost. """
+    graph, access_costs = RoutingGraph(cache_size), access_costs or dict()
+    for carrier, routes in carrier_routes.items():
+        graph.add_edge(origin, carrier, access_costs.get(carrier, 0), carrier)
+        graph.add_termination(carrier, PrefixTree(routes.items()))
+    for source, target, cost in interconnects:
+        graph.add_edge(source, target, cost, target)
+    graph.precompute([origin])
+    return graph
@@ -0,0 +1,71 @@
+#!python
+
+from main import PrefixTree
+from routegraph import RoutingGraph, carrier_graph
+import unittest
+
+
+class RoutingGraphTest(unittest.TestCase):
+
+    def _graph(self):
+        graph = RoutingGraph()
+        graph.add_edge('A', 'B', 1, 'x')
+        graph.add_edge('B', 'C', 2, 'y')
+        graph.add_edge('A', 'C', 5, 'z')
+        graph.add_edge('C', 'D', 1, 'x')
+        return graph
+
+    def test_cheapest_path(self):
+        graph = self._graph()
+        assert graph.cheapest_path('A', 'D') == (['A', 'B', 'C', 'D'], 4)
+        assert graph.cheapest_path('A', 'A') == (['A'], 0)
+        assert graph.cheapest_path('D', 'A') is None
+        assert graph.hops(['A', 'B', 'C']) == [('A', 'B', 'x', 1), ('B', 'C', 'y', 2)]
+        assert graph.nodes() == {'A', 'B', 'C', 'D'}
+
+    def test_edge_changes_drop_cached_answers(self):
+        graph = self._graph()
+        graph.precompute(['A'])
+        assert graph.cheapest_path('A', 'C') == (['A', 'B', 'C'], 3)
+        graph.remove_edge('A', 'B')
+        assert graph.trees == dict()
+        assert graph.cheapest_path('A', 'C') == (['A', 'C'], 5)
+        graph.add_edge('A', 'C', 2, 'z')
+        assert graph.cheapest_path('A', 'C') == (['A', 'C'], 2)
+        with self.assertRaises(KeyError):
+            graph.remove_edge('A', 'B')
+        with self.assertRaises(ValueError):
+            graph.add_edge('A', 'B', -1)
+
+    def test_price(self):
+        graph = self._graph()
+        graph.add_termination('C', PrefixTree([('+1', 1.5), ('+44', 0.25)]))
+        graph.add_termination('D', PrefixTree([('+1', 0.1)]))
+        assert graph.price('A', '+14155550100') == (['A', 'B', 'C', 'D', '+14155550100'], 4.1)
+        assert graph.price('A', '+442071234567') == (['A', 'B', 'C', '+442071234567'], 3.25)
+        assert graph.price('A', '+8610100') is None
+        assert graph.price('D', '+442071234567') is None
+
+    def test_path_and_price_answers_do_not_collide(self):
+        graph = self._graph()
+        graph.add_edge('A', '+1', 7)                    # Node named like number
+        graph.add_termination('D', PrefixTree([('+1', 0.1)]))
+        assert graph.cheapest_path('A', '+1') == (['A', '+1'], 7)
+        assert graph.price('A', '+1') == (['A', 'B', 'C', 'D', '+1'], 4.1)
+        assert graph.cheapest_path('A', '+1') == (['A', '+1'], 7)
+
+    def test_carrier_graph(self):
+        carrier_routes = {'carrier-a': {'+1': 0.5, '+44': 0.3}, 'carrier-b': {'+1': 0.2}}
+        graph = carrier_graph('origin', carrier_routes, interconnects=[('carrier-a', 'carrier-b', 0.1)],
+                              access_costs={'carrier-b': 0.4})
+        assert 'origin' in graph.trees
+        path, cost = graph.price('origin', '+14155550100')
+        assert path == ['origin', 'carrier-a', 'carrier-b', '+14155550100']
+        assert abs(cost - 0.3) < 1e-9                   # 0 + 0.1 + 0.2 beats 0.4 + 0.2 and 0.5
+        assert graph.price('origin', '+442071234567') == (['origin', 'carrier-a', '+442071234567'], 0.3)
+        assert graph.hops(path[:-1]) == [('origin', 'carrier-a', 'carrier-a', 0),
+                                         ('carrier-a', 'carrier-b', 'carrier-b', 0.1)]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,251 @@
+"""
+NAME:       Aakash Sudhakar
+PROJECT:    Call Routing Project
+COURSE:     CS3 at Make School (Alan Davis)
+"""
+
+# =============================== INITIALIZERS AND IMPORT STATEMENTS =================================
+
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+INDEX_MAGIC, INDEX_VERSION = b"RIDX", 1
+HEADER = struct.Struct("=4sIQQQ")                       # Magic, version, count, cost scale, length mask
+COST_SCALE = 10 ** 6                                    # Costs stored as fixed-point millionths
+MAX_PREFIX_DIGITS = 17                                  # Digits that fit beside 5-bit length in 64 bits
+MAX_FIXED_COST = (1 << 32) - 1                          # Largest millionths a uint32 cost column holds
+
+
+# ======================================== KEY/COST ENCODING =========================================
+
+
+def encode_prefix(prefix):
+    """ Returns 64-bit integer key for route prefix: digits (without leading "+")
+    shifted left 5 bits, with digit count in low bits so "+1" and "+01" stay distinct.
+    Keys of equal length sort in same order as their prefixes.\n
+    BEST/WORST CASE = O(k) --> Converts k digits to integer. """
+    digits = prefix[1:] if prefix.startswith("+") else prefix
+    if not digits.isdigit() or len(digits) > MAX_PREFIX_DIGITS:
+        raise ValueError("\n\nINVALID ROUTE PREFIX: {}\n".format(prefix))
+    return int(digits) << 5 | len(digits)
+
+def leading_digits(number):
+    """ Returns digits of given number (after optional "+") up to its first character other
+    than ASCII digit, so lookups match route prefixes of "+1-415..." or "+1415x" against
+    their leading digits instead of raising ValueError, as trie walk would.\n
+    BEST/WORST CASE = O(k) --> One C-level check, or one scan for malformed numbers. """
+    digits = number[1:] if number.startswith("+") else number
+    if digits.isdigit() and digits.isascii():
+        return digits
+    for position, char in enumerate(digits):
+        if not "0" <= char <= "9":
+            return digits[:position]
+    return digits
+
+def decode_prefix(key):
+    """ Returns route prefix string ("+" followed by digits) encoded in given key. """
+    return "+" + str(key >> 5).zfill(key & 31)
+
+def to_fixed(cost):
+    """ Returns cost as integer number of millionths, or raises ValueError for costs that
+    do not fit uint32 cost column (negative, or above 4294.967295), instead of letting
+    them wrap or fail deep inside array packing. """
+    fixed = int(round(cost * COST_SCALE))
+    if not 0 <= fixed <= MAX_FIXED_COST:
+        raise ValueError("\n\nCOST OUT OF FIXED-POINT RANGE (0 TO {}): {}\n".format(
+            from_fixed(MAX_FIXED_COST), cost))
+    return fixed
+
+def from_fixed(value):
+    """ Returns float cost for integer number of millionths. """
+    return value / COST_SCALE
+
+
+# ========================================= INDEX COMPILER ===========================================
+
+
+def pack_index(routes):
+    """ Returns (header, keys, costs) parts of compiled index layout for (prefix, cost)
+    pairs: header bytes, sorted uint64 prefix keys, then uint32 fixed-point costs in
+    matching order (native byte order). Later pairs override earlier ones. Raises
+    ValueError for invalid prefixes and for costs outside fixed-point range (see to_fixed).\n
+    BEST/WORST CASE = O(r log r) --> Sorts r encoded keys once. """
+    costs_by_key = dict()
+    for prefix, cost in routes:
+        costs_by_key[encode_prefix(prefix)] = to_fixed(cost)
+    keys = array("Q", sorted(costs_by_key))
+    costs = array("I", (costs_by_key[key] for key in keys))
+    length_mask = 0
+    for key in keys:
+        length_mask |= 1 << (key & 31)                  # Records which prefix lengths exist
+    return HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(keys), COST_SCALE, length_mask), keys, costs
+
+def compile_index(routes, index_path):
+    """ Writes (prefix, cost) pairs to compact binary index file (see pack_index) and
+    returns route count.\n
+    BEST/WORST CASE = O(r log r) --> Sorts r encoded keys once. """
+    header, keys, costs = pack_index(routes)
+    with open(index_path, "wb") as fw:
+        fw.write(header)
+        keys.tofile(fw)
+        costs.tofile(fw)
+    return len(keys)
+
+
+# ========================================= MAPPED INDEX =============================================
+
+
+class RouteIndex(object):
+    """ Read-only route index answering lookups straight from memory-mapped file pages.
+    Processes mapping same file share one page-cache copy of it. """
+
+    def __init__(self, index_path):
+        """ Maps compiled index file and validates its header. Nothing is parsed. """
+        self.path = index_path
+        with open(index_path, "rb") as fr:
+            self._map = mmap.mmap(fr.fileno(), 0, access=mmap.ACCESS_READ)
+        self._attach(memoryview(self._map))
+
+    def __reduce__(self):
+        """ Pickles as file path, so other processes map index instead of copying it. """
+        return (RouteIndex, (self.path,))
+
+    def _attach(self, buffer):
+        """ Points key and cost columns at given buffer holding compiled index layout. """
+        magic, version, count, scale, length_mask = HEADER.unpack_from(buffer, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or scale != COST_SCALE:
+            raise ValueError("\n\nNOT A COMPATIBLE ROUTE INDEX: {!r} v{}\n".format(magic, version))
+        keys_start = HEADER.size
+        costs_start = keys_start + 8 * count
+        self._buffer = buffer
+        self.keys = buffer[keys_start:costs_start].cast("Q")
+        self.costs = buffer[costs_start:costs_start + 4 * count].cast("I")
+        self.size = count
+        # Prefix lengths present, longest first, so lookups only probe lengths that exist
+        self.lengths = [length for length in range(31, 0, -1) if length_mask >> length & 1]
+
+    def __repr__(self):
+        """ Returns string representation of route index. """
+        return "RouteIndex({} ROUTES)".format(self.size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ Releases column views and unmaps index file. """
+        self.keys.release()
+        self.costs.release()
+        self._buffer.release()
+        self._map.close()
+
+    def length(self):
+        """ Returns number of routes in index. """
+        return self.size
+
+    def _find(self, key):
+        """ Returns position of given key in sorted key column, or -1.\n
+        BEST/WORST CASE = O(log r) --> Binary search over mapped keys. """
+        keys = self.keys
+        index = bisect_left(keys, key)
+        if index < self.size and keys[index] == key:
+            return index
+        return -1
+
+    def get(self, prefix):
+        """ Returns cost stored for given prefix exactly, or None. """
+        index = self._find(encode_prefix(prefix))
+        return from_fixed(self.costs[index]) if index >= 0 else None
+
+    def lookup(self, number):
+        """ Returns cost of longest route prefix matching given number, or None.\n
+        BEST CASE = O(log r) --> Longest present prefix length matches.\n
+        WORST CASE = O(L * log r) --> One binary search per present prefix length (L). """
+        digits = leading_digits(number)                 # Non-digit numbers match no route, never raise
+        keys, costs, size = self.keys, self.costs, self.size
+        for length in self.lengths:
+            if length > len(digits):
+                continue
+            key = int(digits[:length]) << 5 | length
+            index = bisect_left(keys, key)
+            if index < size and keys[index] == key:
+                return costs[index] / COST_SCALE
+        return None
+
+    def items(self):
+        """ Returns list of all (prefix, cost) pairs in index, in key order. """
+        return [(decode_prefix(key), from_fixed(cost)) for key, cost in zip(self.keys, self.costs)]
+
+
+# ====================================== SHARED-MEMORY INDEX =========================================
+
+
+def _attach_shared_memory(name):
+    """ Returns existing shared memory block, without registering it with this process's
+    resource tracker: tracker would otherwise unlink block when attaching process exits,
+    pulling it out from under loader and every other worker. """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try:
+        return SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedRouteIndex(RouteIndex):
+    """ Route index held in multiprocessing.shared_memory block with compiled index layout.
+    Loader builds it once with create(); any number of worker processes attach to it by
+    name (or receive it pickled, which sends only name) and read its columns in place, so
+    memory stays same however many workers run, and new worker serves without parsing. """
+
+    def __init__(self, name):
+        """ Attaches read-only to existing shared route index block. Nothing is copied. """
+        self._shared = _attach_shared_memory(name)
+        self.name, self._owner_pid = self._shared.name, None
+        self._attach(self._shared.buf.toreadonly())
+
+    @classmethod
+    def create(cls, routes, name=None):
+        """ Returns new owning index holding given (prefix, cost) pairs in new shared memory
+        block (named, if name is given). Closing owner in creating process unlinks block;
+        forked workers inheriting it only detach.\n
+        BEST/WORST CASE = O(r log r) --> Packs routes, then copies columns in once. """
+        header, keys, costs = pack_index(routes)
+        keys_end = len(header) + len(keys) * keys.itemsize
+        costs_end = keys_end + len(costs) * costs.itemsize
+        shared = SharedMemory(name, create=True, size=costs_end)    # OS may round block up to page
+        shared.buf[:len(header)] = header
+        shared.buf[len(header):keys_end] = memoryview(keys).cast("B")
+        shared.buf[keys_end:costs_end] = memoryview(costs).cast("B")
+        index = cls.__new__(cls)
+        index._shared, index.name, index._owner_pid = shared, shared.name, os.getpid()
+        index._attach(shared.buf.toreadonly())
+        return index
+
+    def __repr__(self):
+        """ Returns string representation of shared route index. """
+        return "SharedRouteIndex({!r}, {} ROUTES)".format(self.name, self.size)
+
+    def __reduce__(self):
+        """ Pickles as block name, so workers re-attach instead of copying routes. """
+        return (SharedRouteIndex, (self.name,))
+
+    def close(self):
+        """ Releases column views and detaches from block, unlinking it if this is owner. """
+        self.keys.release()
+        self.costs.release()
+        self._buffer.release()
+        self._shared.close()
+        if self._owner_pid == os.getpid():
+            self._shared.unlink()
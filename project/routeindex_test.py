@@ -0,0 +1,120 @@
+#!python
+
+from main import Call_Router_Multiple_Numbers, Call_Router_Shared_Index, share_routes
+from routeindex import (MAX_FIXED_COST, RouteIndex, SharedRouteIndex, compile_index, decode_prefix,
+                        encode_prefix, leading_digits, pack_index, to_fixed)
+from testdata import SyntheticDataTestCase
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from unittest import mock
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+ROUTES = [('+1', 0.5), ('+01', 0.25), ('+123', 0.2), ('+44', 4294.967295)]
+
+
+def _lookup_all(index, numbers):
+    """ Prices numbers against index in worker process, which receives it pickled by name. """
+    try:
+        return [index.lookup(number) for number in numbers], index.name
+    finally:
+        index.close()
+
+
+class RouteIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.directory, 'routes.idx')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_encode_prefix(self):
+        assert encode_prefix('+1') != encode_prefix('+01')
+        assert decode_prefix(encode_prefix('+0012')) == '+0012'
+        assert encode_prefix('+12') < encode_prefix('+13')
+        for prefix in ('+', '+1a', '+' + '1' * 18):
+            with self.assertRaises(ValueError):
+                encode_prefix(prefix)
+
+    def test_fixed_point_range(self):
+        assert to_fixed(0) == 0
+        assert to_fixed(4294.967295) == MAX_FIXED_COST
+        for cost in (4294.967296, 5000.0, -0.000001):
+            with self.assertRaises(ValueError):
+                to_fixed(cost)
+        with self.assertRaises(ValueError):
+            pack_index([('+1', 0.5), ('+2', 4295.0)])   # Would wrap to 0.032704 as uint32
+
+    def test_compiled_index_lookup(self):
+        assert compile_index(ROUTES + [('+1', 0.4)], self.index_path) == 4
+        with RouteIndex(self.index_path) as index:
+            assert index.length() == 4
+            assert index.get('+1') == 0.4               # Later pairs override earlier ones
+            assert index.get('+12') is None
+            assert index.lookup('+12399') == 0.2
+            assert index.lookup('+0199') == 0.25
+            assert index.lookup('+44207') == 4294.967295
+            assert index.lookup('+86') is None
+            assert sorted(index.items()) == sorted(ROUTES[1:] + [('+1', 0.4)])
+
+    def test_lookup_non_digit_numbers(self):
+        compile_index(ROUTES, self.index_path)
+        with RouteIndex(self.index_path) as index:
+            assert index.lookup('+123-4567') == 0.2
+            assert index.lookup('+1 234') == 0.5
+            assert index.lookup('+x123') is None
+            assert index.lookup('') is None
+        assert leading_digits('+12a3') == '12' and leading_digits('123') == '123'
+        assert leading_digits('+1٣') == '1'        # Non-ASCII digits match no route
+
+
+class SharedRouteIndexTest(SyntheticDataTestCase):
+
+    carriers, routes, numbers, seed = 2, 300, 2000, 5
+
+    @classmethod
+    def setUpClass(cls):
+        super(SharedRouteIndexTest, cls).setUpClass()
+        cls.serial = Call_Router_Multiple_Numbers(cls.number_file, cls.route_list)
+
+    def test_router_matches_serial(self):
+        owner = share_routes(self.route_list)
+        try:
+            assert owner.length() == self.serial.route_costs.length()
+            router = Call_Router_Shared_Index(self.number_file, owner.name)
+            assert router.cost_calculator() == self.serial.cost_calculator()
+            assert router.cost_calculator_parallel(workers=2, chunk_bytes=4096) == self.serial.cost_calculator()
+            router.route_costs.close()                  # Reader only detaches
+            with SharedRouteIndex(owner.name) as reader:
+                assert reader.length() == owner.length()
+        finally:
+            owner.close()
+        with self.assertRaises(FileNotFoundError):       # Owner close unlinks block
+            SharedRouteIndex(owner.name)
+
+    def test_block_rounded_up_to_page(self):
+        def page_rounded(name=None, create=False, size=0):
+            return SharedMemory(name, create=create, size=(size // 4096 + 1) * 4096)    # As on macOS
+        with mock.patch('routeindex.SharedMemory', page_rounded):
+            owner = SharedRouteIndex.create(ROUTES)
+        with owner:
+            assert owner._shared.size % 4096 == 0 and owner.length() == 4
+            assert sorted(owner.items()) == sorted(ROUTES)
+
+    def test_workers_attach_by_name(self):
+        numbers = list(self.serial.numbers)[:200]
+        with SharedRouteIndex.create(self.serial.route_costs.items()) as owner:
+            context = multiprocessing.get_context('spawn')             # Nothing inherited by fork
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                costs, name = pool.submit(_lookup_all, owner, numbers).result()
+            assert name == owner.name
+            assert costs == [owner.lookup(number) for number in numbers]
+
+
+if __name__ == '__main__':
+    unittest.main()
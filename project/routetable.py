@@ -0,0 +1,225 @@
+"""
+NAME:       Aakash Sudhakar
+PROJECT:    Call Routing Project
+COURSE:     CS3 at Make School (Alan Davis)
+"""
+
+# =============================== INITIALIZERS AND IMPORT STATEMENTS =================================
+
+
+from array import array
+
+from routeindex import COST_SCALE, decode_prefix, encode_prefix, leading_digits, to_fixed
+
+GOLDEN_RATIO_64 = 0x9E3779B97F4A7C15                    # Multiplier spreading keys over table
+MASK_64 = (1 << 64) - 1
+MAX_LOAD_FACTOR = 0.7                                   # Table doubles once this full
+
+
+# ======================================= COMPACT ROUTE TABLE ========================================
+
+
+class CompactRouteTable(object):
+    """ Route table storing each route as one 64-bit integer key (see routeindex.encode_prefix)
+    and one 32-bit fixed-point cost in flat array columns, with linear-probing open addressing.
+    Each slot is 12 bytes and table runs 35-70% full, so route costs about 25 bytes on
+    average (17-34 bytes) instead of a Python string, float, tuple and node, and prices
+    are kept in exact millionths. Offers same set/get/contains/lookup/longest_prefix/items/
+    updated interface as PrefixTree, so routers can use either. Key 0 marks empty slot. """
+
+    def __init__(self, items=None, capacity=16):
+        """ Initializes empty table with at least given capacity and sets given pairs, if any. """
+        self.size = 0
+        self.length_counts = [0] * 32                   # Routes stored per prefix digit count
+        self.lengths = list()                           # Digit counts in use, longest first
+        self._allocate(max(16, 1 << (capacity - 1).bit_length()))
+        if items is not None:
+            for prefix, cost in items:
+                self.set(prefix, cost)
+
+    def __repr__(self):
+        """ Returns string representation of route table. """
+        return "CompactRouteTable({} ROUTES)".format(self.size)
+
+    def _allocate(self, capacity):
+        """ Replaces columns with zeroed arrays of given power-of-two capacity. """
+        self.keys = array("Q", bytes(8 * capacity))
+        self.costs = array("I", bytes(4 * capacity))
+        self._mask, self._shift = capacity - 1, 64 - (capacity.bit_length() - 1)
+
+    def length(self):
+        """ Returns number of routes stored. """
+        return self.size
+
+    def memory_bytes(self):
+        """ Returns bytes held by key and cost columns. """
+        return self.keys.itemsize * len(self.keys) + self.costs.itemsize * len(self.costs)
+
+    def _slot(self, key):
+        """ Returns slot holding given key, or empty slot where it would be inserted.\n
+        BEST CASE = O(1) --> Home slot holds key or is empty.\n
+        WORST CASE = O(n) --> Probes whole cluster (rare below load factor 0.7). """
+        keys, mask = self.keys, self._mask
+        index = ((key * GOLDEN_RATIO_64) & MASK_64) >> self._shift
+        while True:
+            found = keys[index]
+            if found == key or found == 0:
+                return index
+            index = (index + 1) & mask
+
+    def _count_length(self, length, change):
+        """ Adjusts count of routes with given digit count, refreshing lengths in use. """
+        self.length_counts[length] += change
+        if self.length_counts[length] in (0, 1):
+            self.lengths = [size for size in range(31, 0, -1) if self.length_counts[size]]
+
+    def set_fixed(self, prefix, fixed_cost):
+        """ Inserts or updates given prefix with cost in integer millionths.\n
+        BEST/WORST CASE = O(1) amortized --> One probe sequence, occasional doubling. """
+        key = encode_prefix(prefix)
+        slot = self._slot(key)
+        if self.keys[slot] == 0:
+            if (self.size + 1) > MAX_LOAD_FACTOR * len(self.keys):
+                self._resize(2 * len(self.keys))
+                slot = self._slot(key)
+            self.keys[slot] = key
+            self.size += 1
+            self._count_length(key & 31, 1)
+        self.costs[slot] = fixed_cost
+
+    def set(self, prefix, cost):
+        """ Inserts or updates given prefix with associated cost. """
+        self.set_fixed(prefix, to_fixed(cost))
+
+    def get_fixed(self, prefix):
+        """ Returns cost stored for given prefix exactly, in integer millionths, or None. """
+        key = encode_prefix(prefix)
+        slot = self._slot(key)
+        return self.costs[slot] if self.keys[slot] == key else None
+
+    def get(self, prefix):
+        """ Returns cost stored for given prefix exactly, or None. """
+        fixed_cost = self.get_fixed(prefix)
+        return fixed_cost / COST_SCALE if fixed_cost is not None else None
+
+    def contains(self, prefix):
+        """ Returns True if table stores given prefix exactly, or False. """
+        return self.get_fixed(prefix) is not None
+
+    def delete(self, prefix):
+        """ Deletes given prefix, or raises KeyError. Shifts later entries of same cluster
+        back so probe sequences stay unbroken without tombstones.\n
+        BEST CASE = O(1) --> Next slot is empty.\n
+        WORST CASE = O(c) --> Walks rest of cluster (length c). """
+        key = encode_prefix(prefix)
+        keys, costs, mask = self.keys, self.costs, self._mask
+        hole = self._slot(key)
+        if keys[hole] != key:
+            raise KeyError("\n\nPREFIX NOT FOUND: {}\n".format(prefix))
+        index = hole
+        while True:
+            index = (index + 1) & mask
+            found = keys[index]
+            if found == 0:
+                break
+            home = ((found * GOLDEN_RATIO_64) & MASK_64) >> self._shift
+            # Moves entry into hole unless its home slot lies cyclically in (hole, index]
+            if (index - home) & mask >= (index - hole) & mask:
+                keys[hole], costs[hole] = found, costs[index]
+                hole = index
+        keys[hole], costs[hole] = 0, 0
+        self.size -= 1
+        self._count_length(key & 31, -1)
+
+    def _resize(self, capacity):
+        """ Rehashes every route into columns of given capacity.\n
+        BEST/WORST CASE = O(n) --> Re-probes every stored key once. """
+        old_keys, old_costs = self.keys, self.costs
+        self._allocate(capacity)
+        keys, costs = self.keys, self.costs
+        for index, key in enumerate(old_keys):
+            if key:
+                slot = self._slot(key)
+                keys[slot], costs[slot] = key, old_costs[index]
+
+    def lookup_fixed(self, number):
+        """ Returns cost in integer millionths of longest route prefix matching given
+        number, or None.\n
+        BEST CASE = O(1) --> Longest prefix length in use matches.\n
+        WORST CASE = O(L) --> One probe per prefix length in use (L lengths). """
+        digits = leading_digits(number)
+        keys, mask, shift = self.keys, self._mask, self._shift
+        for length in self.lengths:
+            if length > len(digits):
+                continue
+            key = int(digits[:length]) << 5 | length
+            index = ((key * GOLDEN_RATIO_64) & MASK_64) >> shift
+            found = keys[index]
+            while found != key and found != 0:
+                index = (index + 1) & mask
+                found = keys[index]
+            if found == key:
+                return self.costs[index]
+        return None
+
+    def lookup(self, number):
+        """ Returns cost of longest route prefix matching given number, or None. """
+        fixed_cost = self.lookup_fixed(number)
+        return fixed_cost / COST_SCALE if fixed_cost is not None else None
+
+    def lookup_probes(self, number):
+        """ Returns (cost, probes) pair: same cost as lookup, plus number of slots read
+        while finding it across every prefix length tried, for profiling lookup work. """
+        digits = leading_digits(number)
+        keys, mask, shift, probes = self.keys, self._mask, self._shift, 0
+        for length in self.lengths:
+            if length > len(digits):
+                continue
+            key = int(digits[:length]) << 5 | length
+            index = ((key * GOLDEN_RATIO_64) & MASK_64) >> shift
+            found, probes = keys[index], probes + 1
+            while found != key and found != 0:
+                index = (index + 1) & mask
+                found, probes = keys[index], probes + 1
+            if found == key:
+                return self.costs[index] / COST_SCALE, probes
+        return None, probes
+
+    def longest_prefix(self, number):
+        """ Returns longest stored route prefix of given number, or None. """
+        digits = leading_digits(number)
+        start = 1 if number.startswith("+") else 0
+        for length in self.lengths:
+            if length <= len(digits) and self.contains(digits[:length]):
+                return number[:start + length]
+        return None
+
+    def redundant(self):
+        """ Returns list of stored prefixes whose cost equals cost of their longest shorter
+        stored prefix, so lookup answers stay same for every number without them.\n
+        BEST/WORST CASE = O(n * L) --> Finds covering prefix of each route (n routes). """
+        redundant = list()
+        for prefix, _ in self.items():
+            parent = self.longest_prefix(prefix[:-1])
+            if parent is not None and self.get_fixed(parent) == self.get_fixed(prefix):
+                redundant.append(prefix)
+        return redundant
+
+    def items(self):
+        """ Returns list of all (prefix, cost) pairs in table, in slot order. """
+        return [(decode_prefix(key), cost / COST_SCALE)
+                for key, cost in zip(self.keys, self.costs) if key]
+
+    def updated(self, assignments=(), removals=()):
+        """ Returns copy of table with given (prefix, cost) assignments and prefix removals
+        applied, leaving this table untouched for readers still using it.\n
+        BEST/WORST CASE = O(n + c) --> Copies flat columns (memcpy), then applies c changes. """
+        table = CompactRouteTable.__new__(CompactRouteTable)
+        table.size, table.length_counts, table.lengths = self.size, list(self.length_counts), self.lengths
+        table.keys, table.costs = array("Q", self.keys), array("I", self.costs)
+        table._mask, table._shift = self._mask, self._shift
+        for prefix, cost in assignments:
+            table.set(prefix, cost)
+        for prefix in removals:
+            table.delete(prefix)
+        return table
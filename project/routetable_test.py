@@ -0,0 +1,69 @@
+#!python
+
+from routetable import CompactRouteTable
+import random
+import unittest
+
+
+class CompactRouteTableTest(unittest.TestCase):
+
+    def test_delete_shifts_cluster_back(self):
+        rng, table, expected = random.Random(7), CompactRouteTable(), dict()
+        for _ in range(5000):                           # Table stays small, so clusters form and wrap
+            prefix = '+' + str(rng.randrange(200))
+            if prefix in expected and rng.random() < 0.5:
+                table.delete(prefix)
+                del expected[prefix]
+            else:
+                cost = rng.randrange(1000000) / 1e6
+                table.set(prefix, cost)
+                expected[prefix] = cost
+            assert table.length() == len(expected)
+        assert sorted(table.items()) == sorted(expected.items())
+        for prefix in range(200):
+            assert table.get('+' + str(prefix)) == expected.get('+' + str(prefix))
+        for prefix in list(expected):
+            table.delete(prefix)
+        assert table.length() == 0 and not any(table.keys) and table.lengths == []
+        with self.assertRaises(KeyError):
+            table.delete('+1')
+
+    def test_fixed_point_costs(self):
+        table = CompactRouteTable([('+1', 0.0123456789), ('+01', 1.5)])
+        assert table.get_fixed('+1') == 12346
+        assert table.get('+1') == 0.012346
+        assert table.lookup('+15550100') == 0.012346
+        assert table.lookup_fixed('+015550100') == 1500000
+        assert table.get('01') == 1.5                   # "+" is optional, leading zeros are not
+        assert table.get('+001') is None
+        table.set_fixed('+1', 7)
+        assert table.get('+1') == 0.000007
+
+    def test_lookup_non_digit_numbers(self):
+        table = CompactRouteTable([('+1', 0.5), ('+12', 0.2), ('+123', 0.1)])
+        assert table.lookup('+12-3') == 0.2            # Matches leading digits only
+        assert table.lookup('+1 23') == 0.5
+        assert table.lookup('+1_23') == 0.5
+        assert table.lookup('+x12') is None
+        assert table.lookup('') is None
+        assert table.lookup_probes('+abc') == (None, 0)
+        assert table.lookup_probes('+12x')[0] == 0.2
+        assert table.longest_prefix('+12x3') == '+12'
+        assert table.longest_prefix('12x3') == '12'
+        assert table.longest_prefix('+x') is None
+
+    def test_redundant_and_updated(self):
+        table = CompactRouteTable([('+1', 0.5), ('+12', 0.5), ('+123', 0.2), ('+1234', 0.2),
+                                   ('+12345', 0.3), ('+2', 0.5)])
+        assert sorted(table.redundant()) == ['+12', '+1234']
+        compacted = table.updated([('+3', 0.1)], table.redundant())
+        assert table.length() == 6 and table.contains('+12')           # Original untouched
+        assert compacted.length() == 5 and not compacted.contains('+12')
+        for number in ('+1999', '+1299', '+12399', '+123499', '+1234599', '+299', '+399'):
+            expected = table.lookup(number) if number != '+399' else 0.1
+            assert compacted.lookup(number) == expected
+        assert compacted.memory_bytes() == 12 * len(compacted.keys)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+"""
+NAME:       Aakash Sudhakar
+PROJECT:    Call Routing Project
+COURSE:     CS3 at Make School (Alan Davis)
+"""
+
+# =============================== INITIALIZERS AND IMPORT STATEMENTS =================================
+
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+from main import Call_Router_Compiled_Index, Call_Router_Multiple_Numbers, Call_Router_Shared_Index, _read_numbers
+from profiling import GcMonitor
+
+LATENCY_WINDOW = 100000                                 # Recent request latencies kept for percentiles
+DRAIN_THRESHOLD = 1 << 16                               # Bytes buffered before waiting on slow client
+
+
+# ========================================= PRICING SERVER ===========================================
+#
+# Protocol: newline-delimited text. Each request line holds one phone number, or several
+# separated by spaces (a batch). Each response line holds matching costs in request order,
+# separated by spaces, with 0 for unroutable numbers (same convention as call-costs files).
+# Clients may pipeline any number of request lines without waiting. A "STATS" line answers
+# with a JSON object of server counters and latency percentiles.
+
+
+def percentile(sorted_values, fraction):
+    """ Returns value at given fraction (0 to 1) of already sorted values, or 0.0 if empty.\n
+    BEST/WORST CASE = O(1) --> Indexes directly into sorted list. """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class PricingServer(object):
+    """ Asyncio pricing server answering from router's in-memory routing index. """
+
+    def __init__(self, router):
+        """ Initializes server around router (anything with price(number)) and its counters. """
+        self.router = router
+        self.request_count, self.number_count = 0, 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)   # Seconds spent answering recent requests
+        self.gc = GcMonitor()                           # Collection pauses, timed while serving
+        self.started = time.perf_counter()
+
+    def stats(self):
+        """ Returns dictionary of request/number counts, throughput and latency percentiles.\n
+        BEST/WORST CASE = O(w log w) --> Sorts latency window (w entries). """
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.request_count,
+            "numbers": self.number_count,
+            "requests_per_sec": self.request_count / elapsed,
+            "numbers_per_sec": self.number_count / elapsed,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "cache": self.router.cache.stats() if self.router.cache is not None else None,
+            "gc": self.gc.stats(),
+        }
+
+    def answer(self, line):
+        """ Returns response bytes for one request line.\n
+        BEST/WORST CASE = O(b * k) --> One route lookup per number in batch (b numbers). """
+        numbers = line.split()
+        if numbers == [b"STATS"]:
+            return json.dumps(self.stats()).encode() + b"\n"
+        price = self.router.price
+        # Undecodable bytes match no route, instead of dropping whole pipelined connection
+        costs = [price(number.decode(errors="replace")) for number in numbers]
+        self.request_count += 1
+        self.number_count += len(numbers)
+        return " ".join(str(cost) if cost is not None else "0" for cost in costs).encode() + b"\n"
+
+    async def handle_client(self, reader, writer):
+        """ Answers pipelined request lines from one connection until it closes. """
+        latencies, clock = self.latencies, time.perf_counter
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = clock()
+                writer.write(self.answer(line))
+                latencies.append(clock() - start)
+                if writer.transport.get_write_buffer_size() > DRAIN_THRESHOLD:
+                    await writer.drain()                # Applies backpressure only when needed
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def report(self, interval):
+        """ Prints stats every interval seconds while server runs. """
+        while True:
+            await asyncio.sleep(interval)
+            print(json.dumps(self.stats()), flush=True)
+
+    async def serve(self, host="127.0.0.1", port=8642, unix_path=None, report_interval=None):
+        """ Serves on local TCP port (or Unix socket path if given) until cancelled. """
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        if report_interval:
+            asyncio.ensure_future(self.report(report_interval))
+        self.gc.start()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.gc.stop()
+
+
+# ========================================= LOAD GENERATOR ===========================================
+
+
+async def open_connection(host="127.0.0.1", port=8642, unix_path=None):
+    """ Returns (reader, writer) for pricing server at TCP address or Unix socket path. """
+    if unix_path is not None:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+async def _drive_connection(numbers, request_count, batch_size, pipeline_depth, latencies, **address):
+    """ Sends request_count requests of batch_size numbers over one connection, keeping up to
+    pipeline_depth requests in flight, and records each request's round-trip latency. """
+    reader, writer = await open_connection(**address)
+    sent_times, clock, cursor = deque(), time.perf_counter, 0
+    in_flight = asyncio.Semaphore(pipeline_depth)
+
+    async def receive():
+        for _ in range(request_count):
+            if not await reader.readline():
+                raise ConnectionError("\n\nSERVER CLOSED CONNECTION EARLY.\n")
+            latencies.append(clock() - sent_times.popleft())   # Responses arrive in request order
+            in_flight.release()
+
+    receiver = asyncio.ensure_future(receive())
+    for _ in range(request_count):
+        await in_flight.acquire()
+        batch = [numbers[(cursor + offset) % len(numbers)] for offset in range(batch_size)]
+        cursor += batch_size
+        sent_times.append(clock())
+        writer.write(" ".join(batch).encode() + b"\n")
+        await writer.drain()
+    await receiver
+    writer.close()
+
+async def run_load(numbers, request_count=100000, batch_size=1, pipeline_depth=64, connections=4,
+                   **address):
+    """ Drives pricing server with pipelined requests from several connections and returns
+    dictionary of client-side throughput and latency percentiles. """
+    latencies, per_connection = list(), max(1, request_count // connections)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _drive_connection(numbers, per_connection, batch_size, pipeline_depth, latencies, **address)
+        for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "numbers": len(latencies) * batch_size,
+        "seconds": elapsed,
+        "requests_per_sec": len(latencies) / elapsed,
+        "numbers_per_sec": len(latencies) * batch_size / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+# =========================================== MAIN SCRIPT ============================================
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Call routing pricing server and load generator.")
+    commands = parser.add_subparsers(dest="command")
+    serve = commands.add_parser("serve", help="serve prices over local socket")
+    serve.add_argument("routes", nargs="*", help="carrier route files")
+    serve.add_argument("--index", help="compiled route index (instead of route files)")
+    serve.add_argument("--shared", help="shared-memory route index name (see main.py share)")
+    load = commands.add_parser("load", help="drive running server with synthetic load")
+    load.add_argument("numbers", help="phone number file to draw requests from")
+    load.add_argument("--requests", type=int, default=100000)
+    load.add_argument("--batch-size", type=int, default=1)
+    load.add_argument("--pipeline", type=int, default=64)
+    load.add_argument("--connections", type=int, default=4)
+    for command in (serve, load):
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=8642)
+        command.add_argument("--unix", help="Unix socket path (instead of TCP)")
+    serve.add_argument("--report-interval", type=float, default=5.0)
+    serve.add_argument("--cache", type=int, help="numbers kept in LRU result cache (off if unset)")
+    args = parser.parse_args()
+
+    if args.command in ("serve", "load"):
+        address = {"host": args.host, "port": args.port, "unix_path": args.unix}
+    if args.command == "serve":
+        if args.shared:
+            router = Call_Router_Shared_Index(None, args.shared)
+        elif args.index:
+            router = Call_Router_Compiled_Index(None, args.index)
+        else:
+            router = Call_Router_Multiple_Numbers(None, args.routes)
+        if args.cache:
+            router.enable_cache(args.cache)
+        asyncio.run(PricingServer(router).serve(report_interval=args.report_interval, **address))
+    elif args.command == "load":
+        numbers = list(_read_numbers(args.numbers))
+        result = asyncio.run(run_load(numbers, args.requests, args.batch_size, args.pipeline,
+                                      args.connections, **address))
+        print(json.dumps(result, indent=2))
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
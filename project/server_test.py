@@ -0,0 +1,82 @@
+#!python
+
+from main import Call_Router_Multiple_Numbers
+from replay import replay_server
+from server import PricingServer, open_connection, percentile, run_load
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+ROUTES = ['+1,0.5', '+1415,0.2', '+44,0.9']
+
+
+class PricingServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        route_file = os.path.join(self.directory, 'routes.txt')
+        with open(route_file, 'w') as fw:
+            fw.write(''.join(line + '\n' for line in ROUTES))
+        self.server = PricingServer(Call_Router_Multiple_Numbers(None, [route_file]))
+        self.unix_path = os.path.join(self.directory, 'pricing.sock')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _run(self, client):
+        """ Serves on Unix socket while given client coroutine function runs, then stops. """
+        async def session():
+            serving = asyncio.ensure_future(self.server.serve(unix_path=self.unix_path))
+            while not os.path.exists(self.unix_path):
+                await asyncio.sleep(0.01)
+            try:
+                return await client()
+            finally:
+                serving.cancel()
+        return asyncio.run(session())
+
+    def test_answer(self):
+        assert self.server.answer(b'+14155550100\n') == b'0.2\n'
+        assert self.server.answer(b'+15550100 +86 +447700\n') == b'0.5 0 0.9\n'
+        assert self.server.answer(b'\n') == b'\n'
+        assert self.server.answer(b'+1415\xff\xfe +\xc3\n') == b'0.2 0\n'      # Not UTF-8
+        assert self.server.request_count == 4 and self.server.number_count == 6
+        stats = json.loads(self.server.answer(b'STATS\n'))
+        assert stats['requests'] == 4 and stats['numbers'] == 6 and stats['cache'] is None
+
+    def test_pipelined_round_trip(self):
+        async def client():
+            reader, writer = await open_connection(unix_path=self.unix_path)
+            writer.write(b'+14155550100\n+86 +447700\n+1\xff\nSTATS\n')  # Pipelined, answered in order
+            answers = [await reader.readline() for _ in range(4)]
+            writer.close()
+            return answers
+        answers = self._run(client)
+        assert answers[:3] == [b'0.2\n', b'0 0.9\n', b'0.5\n']
+        stats = json.loads(answers[3])
+        assert stats['requests'] == 3 and stats['numbers'] == 4
+
+    def test_load_and_replay_clients(self):
+        numbers = ['+14155550100', '+15550100', '+86123']
+
+        async def client():
+            load = await run_load(numbers, request_count=40, batch_size=3, pipeline_depth=4,
+                                  connections=2, unix_path=self.unix_path)
+            replay = await replay_server(numbers, [0.0] * 10, batch_size=2, connections=2,
+                                         unix_path=self.unix_path)
+            return load, replay
+        load, replay = self._run(client)
+        assert load['requests'] == 40 and load['numbers'] == 120
+        assert replay['requests'] == 10 and replay['latency_ms']['count'] == 10
+        assert replay['server']['requests'] == 50 and replay['server']['numbers'] == 140
+
+    def test_percentile(self):
+        assert percentile([], 0.5) == 0.0
+        assert percentile([1, 2, 3, 4], 0.5) == 3 and percentile([1, 2, 3, 4], 1.0) == 4
+
+
+if __name__ == '__main__':
+    unittest.main()
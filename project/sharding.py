@@ -0,0 +1,199 @@
+"""
+NAME:       Aakash Sudhakar
+PROJECT:    Call Routing Project
+COURSE:     CS3 at Make School (Alan Davis)
+"""
+
+# =============================== INITIALIZERS AND IMPORT STATEMENTS =================================
+
+
+import os
+import zlib
+from itertools import islice
+from multiprocessing import Pipe, Process
+
+from bulkload import CarrierRoutes, parse_route_lines
+from main import BATCH_SIZE, PRICE_CHUNK_BYTES, WRITE_BUFFER_SIZE, Call_Router, PrefixTree
+
+SHARD_DIGITS = 2                                        # Leading digits (country/area code) deciding shard
+_MISSING = object()                                     # Cache default, since None means unroutable
+
+
+# ======================================== SHARD OWNERSHIP ===========================================
+
+
+def shard_of(number, shards, shard_digits=SHARD_DIGITS):
+    """ Returns shard owning given number or route prefix, by its leading shard_digits digits
+    (after "+"), or None for prefixes too short to decide, which every shard must hold.
+    Uses CRC-32 rather than hash() so every process agrees on ownership.\n
+    BEST/WORST CASE = O(1) --> Hashes at most shard_digits characters. """
+    digits = number[1:] if number.startswith("+") else number
+    if len(digits) < shard_digits:
+        return None
+    return zlib.crc32(digits[:shard_digits].encode()) % shards
+
+def _load_shard_routes(route_list, shard, shards, shard_digits, table):
+    """ Returns route table holding cheapest cost per prefix owned by given shard (plus
+    short prefixes every shard holds) across carrier files. Lines owned by other shards
+    are skipped before parse_route_lines parses rest with same rules as other loaders.\n
+    BEST/WORST CASE = O(r) time, O(r / shards) space --> Scans every route line once. """
+    best_costs = CarrierRoutes()
+    for file in route_list:
+        with open(file) as fr:
+            owned = (line for line in fr
+                     if shard_of(line.split(",", 1)[0].strip(), shards, shard_digits) in (None, shard))
+            best_costs = parse_route_lines(owned, best_costs)
+    route_costs = table()
+    for prefix, cost in best_costs.items():
+        route_costs.set(prefix, cost)
+    return route_costs
+
+def _shard_worker(connection, route_list, shard, shards, shard_digits, table):
+    """ Loads one shard's routes, then answers lists of numbers with lists of costs until
+    it receives None, or sends back error raised while loading. Runs in its own process. """
+    try:
+        route_costs = _load_shard_routes(route_list, shard, shards, shard_digits, table)
+    except Exception as error:
+        connection.send(error)
+        connection.close()
+        return
+    connection.send(route_costs.length())               # Signals shard is ready
+    lookup = route_costs.lookup
+    while True:
+        numbers = connection.recv()
+        if numbers is None:
+            break
+        connection.send([lookup(number) for number in numbers])
+    connection.close()
+
+
+# ========================================= SHARDED ROUTER ===========================================
+
+
+class Call_Router_Sharded(Call_Router):
+    """ Splits route table by leading country/area-code digits across worker processes.
+    Each worker parses carrier files itself and keeps only its own share of routes, so
+    memory and lookup work spread over cores. Numbers are sent to owning shard in batches
+    and answers are collected back in input order. Use as context manager, or call close(). """
+    def __init__(self, number, route_list, shards=None, shard_digits=SHARD_DIGITS, table=PrefixTree):
+        self.shards = shards or os.cpu_count() or 1
+        self.shard_digits = shard_digits
+        self.connections, self.workers = list(), list()
+        for shard in range(self.shards):
+            parent_end, child_end = Pipe()
+            worker = Process(target=_shard_worker, daemon=True,
+                             args=(child_end, route_list, shard, self.shards, shard_digits, table))
+            worker.start()
+            child_end.close()
+            self.connections.append(parent_end)
+            self.workers.append(worker)
+        # Shards load side by side; route counts arrive once each is ready
+        try:
+            self.shard_sizes = [connection.recv() for connection in self.connections]
+        except EOFError:                                # Worker died without answering
+            self._terminate()
+            raise
+        for size in self.shard_sizes:
+            if isinstance(size, Exception):
+                self._terminate()
+                raise size
+        self._owners = dict()                           # Leading characters -> owning shard
+        self.number_file = number
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ Stops every shard worker process. """
+        for connection in self.connections:
+            try:
+                connection.send(None)
+                connection.close()
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self.workers:
+            worker.join()
+        self.connections, self.workers = list(), list()
+
+    def _terminate(self):
+        """ Kills every shard worker process, for when loading failed. """
+        for worker in self.workers:
+            worker.terminate()
+            worker.join()
+        for connection in self.connections:
+            connection.close()
+        self.connections, self.workers = list(), list()
+
+    def enable_bloom_filter(self, *args, **kwargs):
+        """ Raises TypeError: routes live only in shard worker processes, so this process
+        has no route table to build filter from or to gate. """
+        raise TypeError("\n\nBLOOM FILTER NOT SUPPORTED BY SHARDED ROUTER\n")
+
+    def price_batch(self, numbers):
+        """ Returns costs (or None) for given list of numbers, in input order, sending only
+        numbers missing from cache (if enabled) to shards.\n
+        BEST CASE = O(b) --> Every number is cached.\n
+        WORST CASE = O(b * k / shards) per shard --> All shards price their share of batch. """
+        cache = self.cache
+        if cache is None:
+            return self._price_shards(numbers)
+        costs = [cache.get(number, _MISSING) for number in numbers]
+        missing = [index for index, cost in enumerate(costs) if cost is _MISSING]
+        if missing:
+            for index, cost in zip(missing, self._price_shards([numbers[index] for index in missing])):
+                costs[index] = cost
+                cache.set(numbers[index], cost)         # Shard routes never change, so never stale
+        return costs
+
+    def _price_shards(self, numbers):
+        """ Returns costs (or None) for given list of numbers, priced by owning shards.\n
+        BEST/WORST CASE = O(b * k / shards) per shard --> All shards price their share
+        of batch (b numbers) at once, then answers are scattered back into place. """
+        shards, shard_digits, owners = self.shards, self.shard_digits, self._owners
+        positions = [list() for _ in range(shards)]
+        for index, number in enumerate(numbers):
+            lead = number[:shard_digits + 1]            # Enough characters to decide owner
+            owner = owners.get(lead)
+            if owner is None:
+                owner = shard_of(lead, shards, shard_digits)
+                owner = owners[lead] = owner if owner is not None else 0
+            positions[owner].append(index)
+        for shard, indexes in enumerate(positions):     # Sends every share before any receive
+            if indexes:
+                self.connections[shard].send([numbers[index] for index in indexes])
+        costs = [None] * len(numbers)
+        for shard, indexes in enumerate(positions):
+            if indexes:
+                for index, cost in zip(indexes, self.connections[shard].recv()):
+                    costs[index] = cost
+        return costs
+
+    def price(self, number):
+        """ Returns cost of longest route prefix matching given number, or None. """
+        return self.price_batch([number])[0]
+
+    def cost_batches(self, batch_size=BATCH_SIZE):
+        """ Yields lists of (number, cost) pairs, batch_size numbers at a time. """
+        numbers = self.numbers
+        batch = list(islice(numbers, batch_size))
+        while batch:
+            yield list(zip(batch, self.price_batch(batch)))
+            batch = list(islice(numbers, batch_size))
+
+    def cost_calculator(self):
+        """ Returns list of costs (or None if unroutable) for every number, in file order. """
+        return [cost for batch in self.cost_batches() for _, cost in batch]
+
+    def cost_calculator_parallel(self, workers=None, chunk_bytes=PRICE_CHUNK_BYTES):
+        """ Same as cost_calculator: shard workers already price side by side, so no extra
+        pool is started (workers and chunk_bytes are ignored). """
+        return self.cost_calculator()
+
+    def write_costs_parallel(self, output_path, workers=None, chunk_bytes=PRICE_CHUNK_BYTES,
+                             buffer_size=WRITE_BUFFER_SIZE):
+        """ Same as write_costs: shard workers already price side by side, so no extra
+        pool is started (workers and chunk_bytes are ignored). """
+        return self.write_costs(output_path, buffer_size=buffer_size)
@@ -0,0 +1,85 @@
+#!python
+
+from main import Call_Router_Multiple_Numbers
+from sharding import Call_Router_Sharded, shard_of
+from testdata import SyntheticDataTestCase
+import multiprocessing
+import os
+import unittest
+
+
+class ShardedRouterTest(SyntheticDataTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(ShardedRouterTest, cls).setUpClass()
+        cls.serial = Call_Router_Multiple_Numbers(cls.number_file, cls.route_list)
+
+    def test_shard_of(self):
+        assert shard_of('+1', 4) is None                # Too short, held by every shard
+        assert shard_of('+14155550100', 4) == shard_of('+14', 4) == shard_of('14', 4)
+        assert all(0 <= shard_of('+{}'.format(lead), 4) < 4 for lead in range(10, 100))
+
+    def test_prices_match_serial_router(self):
+        expected = self.serial.cost_calculator()
+        with Call_Router_Sharded(self.number_file, self.route_list, shards=4) as router:
+            assert router.cost_calculator() == expected
+            numbers = list(router.numbers)[:50]
+            assert [router.price(number) for number in numbers] == expected[:50]
+            assert router.price_batch(['+1', '', '+999999']) == [self.serial.price(number)
+                                                                 for number in ['+1', '', '+999999']]
+
+    def test_shards_split_routes(self):
+        with Call_Router_Sharded(self.number_file, self.route_list, shards=4) as router:
+            assert len(router.shard_sizes) == 4
+            assert sum(router.shard_sizes) >= self.serial.route_costs.length()
+            assert max(router.shard_sizes) < self.serial.route_costs.length()
+
+    def test_unsupported_methods(self):
+        with Call_Router_Sharded(self.number_file, self.route_list, shards=2) as router:
+            with self.assertRaises(TypeError):
+                router.enable_bloom_filter()
+            assert router.bloom is None
+            assert router.price_batch(['+14155550100']) == [self.serial.price('+14155550100')]
+
+    def test_route_file_line_rules(self):
+        route_file = os.path.join(self.directory, 'carrier-blank-lines.txt')
+        with open(route_file, 'w') as fw:
+            fw.write('+1415,0.2\n\n  \n+44 ,0.9\n+4420,0.5\n')
+        serial = Call_Router_Multiple_Numbers(None, [route_file])
+        numbers = ['+14155550100', '+44 123', '+442012', '+86']
+        with Call_Router_Sharded(None, [route_file], shards=3) as router:
+            assert router.price_batch(numbers) == serial.price_batch(numbers)
+
+    def test_failed_load_stops_workers(self):
+        route_file = os.path.join(self.directory, 'carrier-bad-cost.txt')
+        with open(route_file, 'w') as fw:
+            fw.write('+1415,0.2\n+1416,free\n')
+        before = set(multiprocessing.active_children())
+        with self.assertRaises(ValueError):
+            Call_Router_Sharded(None, [route_file], shards=3)
+        assert set(multiprocessing.active_children()) <= before
+
+    def test_cache(self):
+        numbers = list(self.serial.numbers)[:100]
+        with Call_Router_Sharded(self.number_file, self.route_list, shards=2) as router:
+            cache = router.enable_cache(1000)
+            assert router.price_batch(numbers) == self.serial.price_batch(numbers)
+            assert router.price_batch(numbers) == self.serial.price_batch(numbers)
+            assert cache.hits == 100 and cache.misses == 100
+            assert router.price(numbers[0]) == self.serial.price(numbers[0]) and cache.hits == 101
+
+    def test_parallel_methods_match_serial_router(self):
+        expected = self.serial.cost_calculator()
+        output_path = os.path.join(self.directory, 'call-costs-sharded.txt')
+        with Call_Router_Sharded(self.number_file, self.route_list, shards=3) as router:
+            assert router.cost_calculator_parallel(workers=2) == expected
+            assert router.write_costs_parallel(output_path, workers=2) == len(expected)
+        expected_path = os.path.join(self.directory, 'call-costs-serial.txt')
+        self.serial.write_costs(expected_path)
+        with open(output_path) as fr, open(expected_path) as fe:
+            assert fr.read() == fe.read()
+
+
+if __name__ == '__main__':
+    unittest.main()
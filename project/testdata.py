@@ -0,0 +1,23 @@
+#!python
+
+from benchmark import generate_dataset
+import shutil
+import tempfile
+import unittest
+
+
+class SyntheticDataTestCase(unittest.TestCase):
+    """ Test case writing synthetic carrier route files and number file once per class
+    into temporary directory, removed after class. Subclasses set sizes below. """
+
+    carriers, routes, numbers, seed = 3, 2000, 3000, 0
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.route_list, cls.number_file = generate_dataset(cls.directory, cls.carriers, cls.routes,
+                                                           cls.numbers, cls.seed)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
@@ -0,0 +1,164 @@
+"""
+NAME:       Aakash Sudhakar
+PROJECT:    Call Routing Project
+COURSE:     CS3 at Make School (Alan Davis)
+"""
+
+# =============================== INITIALIZERS AND IMPORT STATEMENTS =================================
+
+
+from itertools import islice
+
+from main import BATCH_SIZE, WRITE_BUFFER_SIZE, Call_Router_Multiple_Numbers, PrefixTree, RouteSnapshot
+
+try:
+    import numpy as np
+except ImportError:                                     # NumPy is optional; only this router needs it
+    np = None
+
+VECTOR_BATCH_SIZE = 1 << 18                             # Numbers resolved per vectorized block
+DENSE_DIGITS = 6                                        # Longest prefix length given direct-address table
+
+
+# ======================================= VECTORIZED ROUTES ==========================================
+
+
+def build_prefix_tables(route_costs):
+    """ Returns list of (length, keys, costs, dense) per route prefix digit count, shortest
+    first: sorted prefix values and their costs as arrays, plus direct-address index array
+    (prefix value -> position) for lengths up to DENSE_DIGITS, or boolean gate over first
+    DENSE_DIGITS digits for longer lengths, so only numbers that could match are binary
+    searched. Raises ValueError for prefixes other than "+" and digits.\n
+    BEST/WORST CASE = O(r log r) --> Sorts prefixes of each length once. """
+    by_length = dict()
+    for prefix, cost in route_costs.items():
+        if not prefix.startswith("+") or not prefix[1:].isdigit():
+            raise ValueError("\n\nVECTORIZED ROUTING NEEDS +DIGITS PREFIXES: {}\n".format(prefix))
+        digits = prefix[1:]
+        by_length.setdefault(len(digits), list()).append((int(digits), cost))
+    tables = list()
+    for length in sorted(by_length):
+        pairs = sorted(by_length[length])
+        keys = np.fromiter((key for key, _ in pairs), dtype=np.int64, count=len(pairs))
+        costs = np.fromiter((cost for _, cost in pairs), dtype=np.float64, count=len(pairs))
+        if length <= DENSE_DIGITS:
+            dense = np.full(10 ** length, -1, dtype=np.int32)
+            dense[keys] = np.arange(len(keys), dtype=np.int32)
+        else:
+            dense = np.zeros(10 ** DENSE_DIGITS, dtype=np.bool_)
+            dense[keys // 10 ** (length - DENSE_DIGITS)] = True
+        tables.append((length, keys, costs, dense))
+    return tables
+
+
+class VectorizedSnapshot(RouteSnapshot):
+    """ Route snapshot plus per-length prefix arrays (see build_prefix_tables) built from
+    its own cost table, so vectorized prices always match scalar ones of same version. """
+
+    __slots__ = ("prefix_tables",)
+
+    def __init__(self, costs, carrier_routes=None, version=0):
+        super(VectorizedSnapshot, self).__init__(costs, carrier_routes, version)
+        self.prefix_tables = build_prefix_tables(costs)
+
+
+# ======================================= VECTORIZED ROUTER ==========================================
+
+
+class Call_Router_Vectorized(Call_Router_Multiple_Numbers):
+    """ Drop-in alternative to Call_Router_Multiple_Numbers that prices whole blocks of
+    numbers with NumPy: each block becomes fixed-width digit matrix, and longest-prefix
+    matches are resolved with one searchsorted per route prefix length over sorted
+    per-length prefix arrays, instead of one Python-level lookup per number. Arrays are
+    rebuilt whole on every live route update (O(r log r), unlike trie path copying) and
+    published in same snapshot as routes, so they never price against stale routes. """
+    def __init__(self, number, route_list, workers=None, table=PrefixTree):
+        if np is None:
+            raise ImportError("\n\nCall_Router_Vectorized REQUIRES NUMPY (pip install numpy).\n")
+        super(Call_Router_Vectorized, self).__init__(number, route_list, workers, table)
+
+    @property
+    def prefix_tables(self):
+        """ Returns per-length prefix arrays of current route snapshot. """
+        return self.snapshot.prefix_tables
+
+    def _snapshot(self, costs, carrier_routes, version):
+        """ Returns VectorizedSnapshot, so prefix arrays swap in together with routes. """
+        return VectorizedSnapshot(costs, carrier_routes, version)
+
+    def price_block(self, block, prefix_tables=None):
+        """ Returns float64 array of costs for given list of numbers, NaN where unroutable,
+        against given prefix arrays (default those of current route snapshot).\n
+        BEST/WORST CASE = O(b * (w + L)) --> Builds prefix values for b numbers of width w,
+        then one vectorized gather per route prefix length (L lengths), plus binary search
+        for numbers that pass gate of lengths longer than DENSE_DIGITS. """
+        try:
+            raw = np.array(block, dtype=np.bytes_)
+        except UnicodeEncodeError:                      # Non-ASCII characters become "?", which match nothing
+            raw = np.array([number.encode("ascii", "replace") for number in block], dtype=np.bytes_)
+        width = raw.dtype.itemsize
+        matrix = raw.view(np.uint8).reshape(len(block), width)
+        has_plus = matrix[:, 0] == 43                   # Routes are "+" prefixed, so rows without it never match
+        matrix = matrix[:, 1:].astype(np.int64) - 48
+        width -= 1
+        # Column j is True while row's first j + 1 digits (after "+") are all digits
+        digits_ok = np.logical_and.accumulate((matrix >= 0) & (matrix <= 9), axis=1)
+        digits_ok &= has_plus[:, None]
+        result = np.full(len(block), np.nan)
+        values, gate_values = np.zeros(len(block), dtype=np.int64), None
+        length_done = 0
+        if prefix_tables is None:
+            prefix_tables = self.prefix_tables
+        for length, keys, costs, dense in prefix_tables:   # Shortest first, longer matches win
+            if length > width:
+                break
+            while length_done < length:                 # Extends prefix values one digit at a time
+                values = values * 10 + matrix[:, length_done]
+                length_done += 1
+                if length_done == DENSE_DIGITS:
+                    gate_values = np.where(digits_ok[:, length_done - 1], values, 0)
+            valid = digits_ok[:, length - 1] if length else has_plus
+            if length <= DENSE_DIGITS:
+                index = dense[np.where(valid, values, 0)]
+                hits = valid & (index >= 0)
+                result[hits] = costs[index[hits]]
+            else:
+                candidates = np.flatnonzero(valid & dense[gate_values])
+                candidate_values = values[candidates]
+                index = np.minimum(np.searchsorted(keys, candidate_values), len(keys) - 1)
+                matched = keys[index] == candidate_values
+                result[candidates[matched]] = costs[index[matched]]
+        return result
+
+    def price_batch(self, numbers):
+        """ Returns costs (or None if unroutable) for given list of numbers, in input order,
+        same as Call_Router.price_batch, priced as one vectorized block. """
+        return [None if cost != cost else cost for cost in self.price_block(numbers).tolist()]
+
+    def cost_arrays(self, batch_size=VECTOR_BATCH_SIZE):
+        """ Yields (numbers, costs array) pairs, batch_size numbers at a time, straight from
+        number file. Costs are NaN where unroutable. Whole file is priced against snapshot
+        current when first block is priced, even if routes change meanwhile. """
+        numbers, prefix_tables = self.numbers, self.prefix_tables
+        block = list(islice(numbers, batch_size))
+        while block:
+            yield block, self.price_block(block, prefix_tables)
+            block = list(islice(numbers, batch_size))
+
+    def cost_calculator(self):
+        """ Returns list of costs (or None if unroutable) for every number, same as
+        Call_Router_Multiple_Numbers.cost_calculator. """
+        all_costs = list()
+        for _, costs in self.cost_arrays():
+            all_costs.extend(None if cost != cost else cost for cost in costs.tolist())
+        return all_costs
+
+    def cost_batches(self, batch_size=BATCH_SIZE):
+        """ Yields lists of (number, cost) pairs, batch_size numbers at a time. """
+        for block, costs in self.cost_arrays(batch_size):
+            yield [(number, None if cost != cost else cost) for number, cost in zip(block, costs.tolist())]
+
+    def write_costs(self, output_path, batch_size=VECTOR_BATCH_SIZE, buffer_size=WRITE_BUFFER_SIZE):
+        """ Streams vectorized prices to output file in call-costs format and returns
+        number of lines written. """
+        return super(Call_Router_Vectorized, self).write_costs(output_path, batch_size, buffer_size)
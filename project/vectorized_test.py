@@ -0,0 +1,76 @@
+#!python
+
+from benchmark import route_prefixes
+from main import Call_Router_Multiple_Numbers
+from testdata import SyntheticDataTestCase
+from vectorized import Call_Router_Vectorized, np
+import unittest
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class VectorizedRouterTest(SyntheticDataTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(VectorizedRouterTest, cls).setUpClass()
+        cls.prefixes = route_prefixes(cls.route_list[0])
+
+    def _assert_matches_scalar(self, router):
+        numbers = list(router.numbers)
+        assert router.cost_calculator() == [router.price(number) for number in numbers]
+
+    def test_prices_match_serial_router(self):
+        router = Call_Router_Vectorized(self.number_file, self.route_list)
+        serial = Call_Router_Multiple_Numbers(self.number_file, self.route_list)
+        assert router.cost_calculator() == serial.cost_calculator()
+        assert [cost for batch in router.cost_batches(500) for _, cost in batch] == serial.cost_calculator()
+
+    def test_non_ascii_numbers(self):
+        router = Call_Router_Vectorized(self.number_file, self.route_list)
+        serial = Call_Router_Multiple_Numbers(self.number_file, self.route_list)
+        numbers = list(router.numbers)[:200]
+        odd = [number + 'é' for number in numbers[:50]]
+        odd += [number[:6] + '٣' + number[6:] for number in numbers[50:100]]      # Non-ASCII digit
+        block = numbers[100:] + odd + ['+é', 'é', '']
+        assert router.price_batch(block) == serial.price_batch(block)
+        assert router.price_batch(numbers[100:]) == serial.price_batch(numbers[100:])
+
+    def test_prices_follow_route_updates(self):
+        router = Call_Router_Vectorized(self.number_file, self.route_list)
+        before = router.cost_calculator()
+        changes = [(prefix, 0.0001) for prefix in self.prefixes[:200]]
+        changes += [(prefix, None) for prefix in self.prefixes[200:400]]
+        router.update_routes(self.route_list[0], changes)
+        assert router.cost_calculator() != before
+        self._assert_matches_scalar(router)
+        router.remove_carrier(self.route_list[1])
+        self._assert_matches_scalar(router)
+        router.replace_carrier(self.route_list[2], self.route_list[1])
+        self._assert_matches_scalar(router)
+        router.compact_routes()
+        self._assert_matches_scalar(router)
+        router.update_routes('carrier-new', [('+99', 0.5)])
+        assert router.price_block(['+99123'])[0] == 0.5
+        self._assert_matches_scalar(router)
+
+    def test_held_arrays_keep_their_snapshot(self):
+        router = Call_Router_Vectorized(self.number_file, self.route_list)
+        arrays = router.cost_arrays(1000)
+        block, costs = next(arrays)
+        router.update_routes(self.route_list[0], [(prefix, 0.0001) for prefix in self.prefixes])
+        old_snapshot = Call_Router_Multiple_Numbers(self.number_file, self.route_list).route_costs
+        for block, costs in arrays:                     # Rest of file still priced against first version
+            assert [None if cost != cost else cost for cost in costs.tolist()] == \
+                [old_snapshot.lookup(number) for number in block]
+
+    def test_rejects_update_it_cannot_vectorize(self):
+        router = Call_Router_Vectorized(self.number_file, self.route_list)
+        version = router.route_version
+        with self.assertRaises(ValueError):
+            router.update_routes(self.route_list[0], [('1415', 0.1)])
+        assert router.route_version == version
+        self._assert_matches_scalar(router)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!python
+
+import math
+
+
+class BloomFilter(object):
+
+    def __init__(self, capacity, error_rate=0.01, items=None):
+        """ Initializes empty Bloom filter sized so that holding capacity items gives
+        false positive rate of about error_rate, then adds given items, if any. """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("\n\nINVALID BLOOM FILTER SIZE: {} ITEMS AT {}\n".format(capacity, error_rate))
+        self.capacity, self.error_rate = capacity, error_rate
+        # Optimal bit count m = -n ln(p) / ln(2)^2 and hash count k = (m / n) ln(2)
+        self.bit_size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.bit_size / capacity * math.log(2))))
+        self.bits = bytearray((self.bit_size + 7) // 8)
+        self.size = 0                           # Number of items added
+        if items is not None:
+            for item in items:
+                self.add(item)
+
+    def __repr__(self):
+        """ Returns string representation of Bloom filter. """
+        return "BloomFilter({} ITEMS, {} BITS, {} HASHES)".format(self.size, self.bit_size, self.hash_count)
+
+    def _positions(self, item):
+        """ Returns bit positions for given item, derived from one hash by double hashing
+        (position i = h1 + i * h2), so only one hash is computed per item.\n
+        BEST/WORST CASE = O(k) --> One position per hash function (k hashes). """
+        value = hash(item) & 0xFFFFFFFFFFFFFFFF
+        first, second = value & 0xFFFFFFFF, (value >> 32) | 1
+        size = self.bit_size
+        return [(first + index * second) % size for index in range(self.hash_count)]
+
+    def add(self, item):
+        """ Adds given item to filter.\n
+        BEST/WORST CASE = O(k) --> Sets k bits. """
+        bits = self.bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.size += 1
+
+    def contains(self, item):
+        """ Returns False if given item was certainly never added, or True if it
+        probably was (false positives possible, false negatives not).\n
+        BEST CASE = O(1) --> First bit checked is clear.\n
+        WORST CASE = O(k) --> Checks all k bits. """
+        value = hash(item) & 0xFFFFFFFFFFFFFFFF
+        position, step = value & 0xFFFFFFFF, (value >> 32) | 1
+        bits, size = self.bits, self.bit_size
+        for _ in range(self.hash_count):        # Same positions as _positions, exits on first clear bit
+            position %= size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position += step
+        return True
+
+    def fill_ratio(self):
+        """ Returns fraction of bits set.\n
+        BEST/WORST CASE = O(m) --> Counts set bits across whole bit array. """
+        return int.from_bytes(self.bits, "little").bit_count() / self.bit_size
+
+    def false_positive_rate(self):
+        """ Returns expected false positive rate for current fill: fill ratio ^ k. """
+        return self.fill_ratio() ** self.hash_count
+
+    def stats(self):
+        """ Returns dictionary of filter size, fill ratio and expected false positive rate. """
+        return {
+            "items": self.size,
+            "capacity": self.capacity,
+            "bits": self.bit_size,
+            "hashes": self.hash_count,
+            "fill_ratio": self.fill_ratio(),
+            "expected_false_positive_rate": self.false_positive_rate(),
+        }
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(100, 0.01, ['+1415', '+44'])
+    print('BloomFilter: ' + str(bloom))
+    print('contains(+1415): ' + str(bloom.contains('+1415')))
+    print('contains(+33): ' + str(bloom.contains('+33')))
+    print('stats: ' + str(bloom.stats()))
+
+
+if __name__ == '__main__':
+    test_bloom_filter()
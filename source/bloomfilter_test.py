@@ -0,0 +1,52 @@
+#!python
+
+from bloomfilter import BloomFilter
+import unittest
+
+
+class BloomFilterTest(unittest.TestCase):
+
+    def test_init(self):
+        bloom = BloomFilter(1000, 0.01)
+        assert bloom.size == 0
+        assert bloom.bit_size >= 9585  # -1000 ln(0.01) / ln(2)^2
+        assert bloom.hash_count == 7
+        assert len(bloom.bits) == (bloom.bit_size + 7) // 8
+        assert bloom.fill_ratio() == 0
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, 1.5)
+
+    def test_init_with_items(self):
+        bloom = BloomFilter(10, 0.01, ['A', 'B', 'C'])
+        assert bloom.size == 3
+        assert bloom.contains('A') is True
+        assert bloom.contains('B') is True
+        assert bloom.contains('C') is True
+
+    def test_no_false_negatives(self):
+        items = ['+{}'.format(number) for number in range(5000)]
+        bloom = BloomFilter(len(items), 0.01, items)
+        for item in items:
+            assert bloom.contains(item) is True
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(5000, 0.01, ['+{}'.format(number) for number in range(5000)])
+        false_positives = sum(bloom.contains('-{}'.format(number)) for number in range(20000))
+        assert false_positives / 20000 < 0.03  # Close to configured 1%
+        assert 0.3 < bloom.fill_ratio() < 0.7  # Optimally sized filter is about half full
+        assert bloom.false_positive_rate() < 0.03
+
+    def test_stats(self):
+        bloom = BloomFilter(100, 0.05, ['A'])
+        stats = bloom.stats()
+        assert stats['items'] == 1
+        assert stats['capacity'] == 100
+        assert stats['bits'] == bloom.bit_size
+        assert stats['hashes'] == bloom.hash_count
+        assert stats['fill_ratio'] == bloom.fill_ratio()
+
+
+if __name__ == '__main__':
+    unittest.main()
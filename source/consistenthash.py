@@ -0,0 +1,129 @@
+#!python
+
+from bisect import bisect_right
+from hashlib import blake2b
+from hashtable import HashTable
+
+
+def stable_hash(key):
+    """ Returns 64-bit hash of given key (through its string form) that is same in every
+    process and on every machine, unlike built-in hash, which is salted per process.\n
+    BEST/WORST CASE = O(k) --> Hashes k characters of key. """
+    digest = blake2b(str(key).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class ConsistentHashRing(object):
+
+    def __init__(self, nodes=None, vnodes=128, replicas=1):
+        """ Initializes ring with given nodes, each placed at vnodes points (virtual nodes)
+        per unit of weight, and keys stored on replicas distinct nodes. """
+        if vnodes < 1 or replicas < 1:
+            raise ValueError("\n\nINVALID RING: {} VNODES, {} REPLICAS\n".format(vnodes, replicas))
+        self.vnodes, self.replicas = vnodes, replicas
+        self.weights = dict()                   # Node -> weight, in join order
+        self.owners = HashTable()               # Ring point -> node placed there
+        self.points = list()                    # Sorted ring points
+        if nodes is not None:
+            for node in nodes:
+                self.weights[node] = 1
+            self._rebuild()
+
+    def __repr__(self):
+        """ Returns string representation of ring. """
+        return "ConsistentHashRing({} NODES, {} POINTS)".format(len(self.weights), len(self.points))
+
+    def nodes(self):
+        """ Returns list of nodes on ring, in join order. """
+        return list(self.weights)
+
+    def _node_points(self, node):
+        """ Returns ring points of given node, one per virtual node. """
+        return [stable_hash("{}#{}".format(node, index)) for index in range(self.vnodes * self.weights[node])]
+
+    def _rebuild(self):
+        """ Places every node's virtual nodes on new ring. Points depend only on node names,
+        so nodes keep their points (and keys) across joins and leaves.\n
+        BEST/WORST CASE = O(p log p) --> Sorts all p points. """
+        owners = HashTable(max(8, 2 * self.vnodes * sum(self.weights.values())))
+        for node in self.weights:
+            for point in self._node_points(node):
+                if not owners.contains(point):  # First node to claim point keeps it
+                    owners.set(point, node)
+        self.owners, self.points = owners, sorted(owners.keys())
+
+    def add_node(self, node, weight=1):
+        """ Adds given node with given weight (multiplies its virtual nodes), or raises
+        ValueError if it is already on ring. Only keys landing on its new points move.\n
+        BEST/WORST CASE = O(p log p) --> Rebuilds ring of p points. """
+        if node in self.weights:
+            raise ValueError("\n\nNODE ALREADY ON RING: {}\n".format(node))
+        if weight < 1:
+            raise ValueError("\n\nINVALID NODE WEIGHT: {}\n".format(weight))
+        self.weights[node] = weight
+        self._rebuild()
+
+    def remove_node(self, node):
+        """ Removes given node, or raises KeyError. Only its keys move, each to next node
+        clockwise.\n
+        BEST/WORST CASE = O(p log p) --> Rebuilds ring of p points. """
+        if node not in self.weights:
+            raise KeyError("\n\nNODE NOT FOUND: {}\n".format(node))
+        del self.weights[node]
+        self._rebuild()
+
+    def node_for(self, key):
+        """ Returns node owning given key: first node point clockwise from key's hash.
+        Raises LookupError if ring is empty.\n
+        BEST/WORST CASE = O(log p) --> Binary search over p ring points. """
+        if not self.points:
+            raise LookupError("\n\nRING HAS NO NODES.\n")
+        index = bisect_right(self.points, stable_hash(key)) % len(self.points)
+        return self.owners.get(self.points[index])
+
+    def nodes_for(self, key, count=None):
+        """ Returns list of count (default replicas) distinct nodes holding given key,
+        owner first, walking clockwise from key's hash.\n
+        BEST CASE = O(log p) --> Next points belong to distinct nodes.\n
+        WORST CASE = O(p) --> Walks whole ring to find distinct nodes. """
+        if not self.points:
+            raise LookupError("\n\nRING HAS NO NODES.\n")
+        count = min(count or self.replicas, len(self.weights))
+        points, found = self.points, list()
+        index = bisect_right(points, stable_hash(key))
+        for step in range(len(points)):
+            node = self.owners.get(points[(index + step) % len(points)])
+            if node not in found:
+                found.append(node)
+                if len(found) == count:
+                    break
+        return found
+
+    def assignments(self, keys):
+        """ Returns dictionary of node -> list of keys it holds (with replicas). """
+        placed = dict((node, list()) for node in self.weights)
+        for key in keys:
+            for node in self.nodes_for(key):
+                placed[node].append(key)
+        return placed
+
+    def load(self, keys):
+        """ Returns dictionary of node -> number of given keys it owns (primary only). """
+        counts = dict((node, 0) for node in self.weights)
+        for key in keys:
+            counts[self.node_for(key)] += 1
+        return counts
+
+
+def test_consistent_hash_ring():
+    ring = ConsistentHashRing(['node-a', 'node-b', 'node-c'], replicas=2)
+    print('ConsistentHashRing: ' + repr(ring))
+    print('node_for(+1415): ' + str(ring.node_for('+1415')))
+    print('nodes_for(+1415): ' + str(ring.nodes_for('+1415')))
+    print('load: ' + str(ring.load('+{}'.format(number) for number in range(1000))))
+    ring.add_node('node-d')
+    print('add_node(node-d) load: ' + str(ring.load('+{}'.format(number) for number in range(1000))))
+
+
+if __name__ == '__main__':
+    test_consistent_hash_ring()
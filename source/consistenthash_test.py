@@ -0,0 +1,114 @@
+#!python
+
+from consistenthash import ConsistentHashRing, stable_hash
+import multiprocessing
+import unittest
+
+KEYS = ['+{}'.format(prefix) for prefix in range(1000, 21000)]  # Route prefix shards
+
+
+def _node_process(connection, node, nodes, keys, replicas):
+    """ Stands in for one node: builds its own ring and reports keys it holds. """
+    ring = ConsistentHashRing(nodes, replicas=replicas)
+    connection.send(sorted(ring.assignments(keys)[node]))
+    connection.close()
+
+
+def _run_nodes(nodes, keys, replicas=1):
+    """ Returns dictionary of node -> keys it holds, as computed by each node's own
+    process. Spawned processes get differently salted built-in hash, so they only agree
+    with each other (and this process) because ring uses stable hash. """
+    context = multiprocessing.get_context('spawn')
+    processes, connections = list(), dict()
+    for node in nodes:
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_node_process, args=(sender, node, nodes, keys, replicas))
+        process.start()
+        sender.close()
+        processes.append(process)
+        connections[node] = receiver
+    held = dict((node, connection.recv()) for node, connection in connections.items())
+    for process in processes:
+        process.join()
+    return held
+
+
+class ConsistentHashRingTest(unittest.TestCase):
+
+    def test_init(self):
+        ring = ConsistentHashRing(['A', 'B'], vnodes=16)
+        assert ring.nodes() == ['A', 'B']
+        assert len(ring.points) == 32
+        assert ring.owners.size == 32
+        assert ring.points == sorted(ring.points)
+        with self.assertRaises(ValueError):
+            ConsistentHashRing(vnodes=0)
+        with self.assertRaises(LookupError):
+            ConsistentHashRing().node_for('+1415')
+
+    def test_stable_hash(self):
+        assert stable_hash('+1415') == stable_hash('+1415')
+        assert stable_hash('+1415') != stable_hash('+1416')
+        assert 0 <= stable_hash('+44') < 2 ** 64
+
+    def test_add_and_remove_node(self):
+        ring = ConsistentHashRing(['A', 'B'])
+        ring.add_node('C', weight=2)
+        assert ring.nodes() == ['A', 'B', 'C']
+        assert len(ring.points) == 4 * ring.vnodes
+        with self.assertRaises(ValueError):
+            ring.add_node('C')
+        ring.remove_node('A')
+        assert ring.nodes() == ['B', 'C']
+        assert len(ring.points) == 3 * ring.vnodes
+        with self.assertRaises(KeyError):
+            ring.remove_node('A')
+
+    def test_nodes_for_replicas(self):
+        ring = ConsistentHashRing(['A', 'B', 'C', 'D'], replicas=3)
+        for key in KEYS[:500]:
+            nodes = ring.nodes_for(key)
+            assert len(nodes) == 3
+            assert len(set(nodes)) == 3
+            assert nodes[0] == ring.node_for(key)
+        assert ring.nodes_for('+1415', 10) == ring.nodes_for('+1415', 4)  # Capped at node count
+
+    def test_weight_shifts_load(self):
+        ring = ConsistentHashRing(['A', 'B'])
+        ring.add_node('C', weight=2)
+        load = ring.load(KEYS)
+        assert load['C'] > load['A'] * 1.5
+        assert load['C'] > load['B'] * 1.5
+
+    def test_nodes_agree_across_processes(self):
+        nodes = ['node-0', 'node-1', 'node-2', 'node-3']
+        held = _run_nodes(nodes, KEYS, replicas=2)
+        ring = ConsistentHashRing(nodes, replicas=2)
+        assert held == dict((node, sorted(keys)) for node, keys in ring.assignments(KEYS).items())
+        assert sum(len(keys) for keys in held.values()) == 2 * len(KEYS)  # Every key on 2 nodes
+
+    def test_rebalance_cost_and_skew(self):
+        nodes = ['node-0', 'node-1', 'node-2', 'node-3']
+        before = _run_nodes(nodes, KEYS)
+        after = _run_nodes(nodes + ['node-4'], KEYS)
+        owner_before = dict((key, node) for node, keys in before.items() for key in keys)
+        owner_after = dict((key, node) for node, keys in after.items() for key in keys)
+        moved = [key for key in KEYS if owner_before[key] != owner_after[key]]
+        # Only keys taken over by new node move, about 1/5 of them (modulo placement moves ~4/5)
+        assert all(owner_after[key] == 'node-4' for key in moved)
+        assert 0.1 < len(moved) / len(KEYS) < 0.3
+        # Virtual nodes keep every node's share close to mean
+        loads = [len(keys) for keys in after.values()]
+        mean = len(KEYS) / len(loads)
+        assert max(loads) / mean < 1.35
+        assert min(loads) / mean > 0.65
+        # Removing node moves only its own keys back
+        ring = ConsistentHashRing(nodes + ['node-4'])
+        ring.remove_node('node-2')
+        for key in KEYS[::10]:
+            if owner_after[key] != 'node-2':
+                assert ring.node_for(key) == owner_after[key]
+
+
+if __name__ == '__main__':
+    unittest.main()
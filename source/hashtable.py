@@ -2,13 +2,20 @@
 
 from linkedlist import LinkedList
 
+REHASH_STEP = 4  # Old buckets moved per operation during incremental resize
+
 
 class HashTable(object):
 
-    def __init__(self, init_size=8):
-        """ Initializes hash table with given initial size. """
+    def __init__(self, init_size=8, incremental=False):
+        """ Initializes hash table with given initial size. If incremental, resizes move
+        entries a few buckets at a time during later operations instead of all at once. """
         self.buckets = [LinkedList() for iterator in range(init_size)]
-        self.size = 0  # Number of key-value entries
+        self.size = 0  # Number of (hash, key, value) entries
+        self.incremental = incremental
+        self.old_buckets = None  # Buckets still being emptied by incremental resize
+        self.rehash_index = 0  # Old buckets before this index have been moved
+        self.version = 0  # Bumped whenever entries are added, removed or moved
 
     def __str__(self):
         """ Returns formatted string representation of hash table. """
@@ -17,65 +24,99 @@ class HashTable(object):
 
     def __repr__(self):
         """ Returns string representation of hash table. """
-        return "HashTable({!r})".format(self.items())
+        return "HashTable({!r})".format(list(self.items()))
 
     def _bucket_index(self, key):
         """ Returns bucket index where given key would be stored. """
         return hash(key) % len(self.buckets)
 
+    def _bucket(self, hash_value):
+        """ Returns bucket where key with given hash is (or would be) stored. During
+        incremental resize, first moves next REHASH_STEP old buckets, then looks in old
+        bucket if key's old bucket has not been moved yet.\n
+        BEST/WORST CASE = O(1) --> Moves bounded number of buckets. (Short chains.) """
+        buckets, index = self.buckets, None
+        if self.old_buckets is not None:
+            self._rehash_step(REHASH_STEP)
+            if self.old_buckets is not None:
+                old_index = hash_value % len(self.old_buckets)
+                if old_index >= self.rehash_index:
+                    buckets, index = self.old_buckets, old_index
+        if index is None:
+            index = hash_value % len(buckets)
+        bucket = buckets[index]
+        if bucket is None:  # Resized tables allocate buckets on first use
+            bucket = buckets[index] = LinkedList()
+        return bucket
+
+    def _all_buckets(self):
+        """ Returns list of every bucket holding entries, including old buckets not yet
+        moved by incremental resize. """
+        buckets = self.buckets
+        if self.old_buckets is not None:
+            buckets = buckets + self.old_buckets[self.rehash_index:]
+        return [bucket for bucket in buckets if bucket is not None]
+
+    def _rehash_step(self, count):
+        """ Moves entries of next count old buckets into new buckets, ending incremental
+        resize once every old bucket is moved. New buckets are allocated on first use, and
+        entries keep their cached hashes, so moving them hashes or copies nothing.\n
+        BEST/WORST CASE = O(count) --> Moves count buckets. (Short chains.) """
+        old_buckets, buckets = self.old_buckets, self.buckets
+        stop = min(self.rehash_index + count, len(old_buckets))
+        for index in range(self.rehash_index, stop):
+            if old_buckets[index] is None:
+                continue
+            for entry in old_buckets[index].items():
+                new_index = entry[0] % len(buckets)
+                if buckets[new_index] is None:
+                    buckets[new_index] = LinkedList()
+                buckets[new_index].append(entry)
+            old_buckets[index] = None  # Releases moved bucket
+        self.rehash_index = stop
+        self.version += 1
+        if stop == len(old_buckets):
+            self.old_buckets, self.rehash_index = None, 0
+
+    def _finish_rehash(self):
+        """ Moves every old bucket left by incremental resize still under way, if any. """
+        if self.old_buckets is not None:
+            self._rehash_step(len(self.old_buckets))
+
     def load_factor(self):
         """ Returns load factor. (Ratio of number of entries to buckets.)\n
         BEST/WORST CASE = O(n) --> Iterates through entire length of Linked List. """
         return self.size / len(self.buckets)
 
     def keys(self):
-        """ Returns list of all keys in hash table.\n
-        BEST/WORST CASE = O(m * n) --> Iterate through all items in old and new tables. """
-        # Collect all keys in each of the buckets
-        all_keys = list()
-        for bucket in self.buckets:
-            for key, value in bucket.items():
-                all_keys.append(key)
-        return all_keys
+        """ Returns lazy view of all keys in hash table.\n
+        BEST/WORST CASE = O(1) --> Entries are only visited when view is iterated. """
+        return HashTableKeys(self)
 
     def values(self):
-        """ Returns list of all values in hash table.\n
-        BEST/WORST CASE = O(m * n) --> Iterate through all items in old and new tables. """
-        # Collect all values in each of the buckets
-        all_values = list()
-        for bucket in self.buckets:
-            for key, value in bucket.items():
-                all_values.append(value)
-        return all_values
+        """ Returns lazy view of all values in hash table.\n
+        BEST/WORST CASE = O(1) --> Entries are only visited when view is iterated. """
+        return HashTableValues(self)
 
     def items(self):
-        """ Returns list of all entries (key-value pairs) in hash table.\n
-        BEST/WORST CASE = O(m * n) --> Iterate through all items in old and new tables. """
-        # Collects all pairs of key-value entries in every bucket
-        all_items = list()
-        for bucket in self.buckets:
-            all_items.extend(bucket.items())
-        return all_items
+        """ Returns lazy view of all entries (key-value pairs) in hash table.\n
+        BEST/WORST CASE = O(1) --> Entries are only visited when view is iterated. """
+        return HashTableItems(self)
 
     def length(self):
-        """ Returns number of key-value entries by traversing buckets.\n
-        BEST/WORST CASE = O(n) --> Iterate through all items in table. """
-        return sum(bucket.length() for bucket in self.buckets)
-        # Counts number of key-value entries in every bucket
-        # item_count = 0
-        # for bucket in self.buckets:
-        #     item_count += bucket.length()
-        # return item_count
+        """ Returns number of key-value entries.\n
+        BEST/WORST CASE = O(1) --> Size is kept up to date by set and delete. """
+        return self.size
 
     def contains(self, key):
         """ Returns True if hash table contains given key, or False.\n
         BEST CASE = O(1) --> Target is first item in table.\n
         WORST CASE = O(n) --> Target is last item in table. (Full iteration.) """
         # Finds bucket in which given key belongs
-        index = self._bucket_index(key)
-        bucket = self.buckets[index]
-        # Checks if entry with given key exists in given bucket
-        entry = bucket.find(lambda key_value: key_value[0] == key)
+        hash_value = hash(key)
+        bucket = self._bucket(hash_value)
+        # Checks if entry with given key exists in given bucket (cheap hash check first)
+        entry = bucket.find(lambda entry: entry[0] == hash_value and entry[1] == key)
         return entry is not None
 
     def get(self, key):
@@ -83,15 +124,15 @@ class HashTable(object):
         BEST CASE = O(1) --> Target is first item in table.\n
         WORST CASE = O(n) --> Target is last item in table. (Full iteration.) """
         # Finds bucket in which given key belongs
-        index = self._bucket_index(key)
-        bucket = self.buckets[index]
+        hash_value = hash(key)
+        bucket = self._bucket(hash_value)
         # Finds entry with given key in given bucket, if one exists
-        entry = bucket.find(lambda key_value: key_value[0] == key)
+        entry = bucket.find(lambda entry: entry[0] == hash_value and entry[1] == key)
         if entry is not None:
             # Returns given key's associated value
             assert isinstance(entry, tuple)
-            assert len(entry) == 2
-            return entry[1]
+            assert len(entry) == 3
+            return entry[2]
         else:
             return None
 
@@ -100,18 +141,19 @@ class HashTable(object):
         BEST CASE = O(1) --> Target is first item in table.\n
         WORST CASE = O(n) --> Target is last item in table. (Full iteration.) """
         # Finds bucket in which given key belongs
-        index = self._bucket_index(key)
-        bucket = self.buckets[index]
+        hash_value = hash(key)
+        bucket = self._bucket(hash_value)
         # Finds the entry with the given key in that bucket, if one exists
         # Checks if an entry with the given key exists in that bucket
-        entry = bucket.find(lambda key_value: key_value[0] == key)
+        entry = bucket.find(lambda entry: entry[0] == hash_value and entry[1] == key)
         if entry is not None:  # Found
-            # Removes old key-value entry from bucket first
-            bucket.delete(entry)
-        else:
-            self.size += 1
-        # Inserts new key-value entry into bucket in either case
-        bucket.append((key, value))
+            # Replaces old entry in its node, so views iterating table are not disturbed
+            bucket.replace(entry, (hash_value, key, value))
+            return
+        # Inserts new entry (with key's hash cached) into bucket
+        bucket.append((hash_value, key, value))
+        self.size += 1
+        self.version += 1
         # Resizes hash table if naïve load factor is exceeded
         if self.load_factor() > 0.75:
             self._resize()
@@ -121,36 +163,202 @@ class HashTable(object):
         BEST CASE = O(1) --> Target is first item in table.\n
         WORST CASE = O(n) --> Target is last item in table. (Full iteration.) """
         # Finds bucket in which given key belongs
-        index = self._bucket_index(key)
-        bucket = self.buckets[index]
+        hash_value = hash(key)
+        bucket = self._bucket(hash_value)
         # Finds entry with given key in bucket, if one exists
-        entry = bucket.find(lambda key_value: key_value[0] == key)
+        entry = bucket.find(lambda entry: entry[0] == hash_value and entry[1] == key)
         if entry is not None:
             bucket.delete(entry)            # Removes key-value entry from bucket
             self.size -= 1                  # Decrements size
-            if self.load_factor < 0.25:
+            self.version += 1
+            if self.load_factor() < 0.25 and len(self.buckets) > 1:
                 self._resize(0)
         else:
             raise KeyError("\n\nKEY NOT FOUND: {}\n".format(key))
 
+    @classmethod
+    def from_items(cls, items, expected_size=None, incremental=False):
+        """ Returns new hash table holding given (key, value) pairs, later pairs overriding
+        earlier ones. Buckets are sized once for expected_size entries (default number of
+        pairs) and allocated on first use, so loading never resizes midway.\n
+        BEST/WORST CASE = O(n) --> One pass over n pairs. (Short chains.) """
+        if expected_size is None:
+            items = items if hasattr(items, "__len__") else list(items)
+            expected_size = len(items)
+        table = cls(0, incremental)
+        table.buckets = [None] * max(8, int(expected_size / 0.75) + 1)
+        table.set_many(items, expected_size)
+        return table
+
+    def set_many(self, items, expected_size=None):
+        """ Inserts or updates every given (key, value) pair, as repeated set calls would,
+        but resizes at most once, up front, for expected_size pairs (default number of
+        pairs, so only then are iterators read into list), and walks each bucket's nodes
+        directly instead of through find with new lambda per pair.\n
+        BEST/WORST CASE = O(n) --> One pass over n pairs. (Short chains.) """
+        if expected_size is None:
+            items = items if hasattr(items, "__len__") else list(items)
+            expected_size = len(items)
+        new_size = len(self.buckets)
+        while (self.size + expected_size) / new_size > 0.75:
+            new_size *= 2
+        if new_size != len(self.buckets):
+            self._resize(new_size)
+        bucket_for, added = self._bucket, 0
+        for key, value in items:
+            hash_value = hash(key)
+            bucket = bucket_for(hash_value)
+            node = bucket.head
+            while node is not None:
+                entry = node.data
+                if entry[0] == hash_value and entry[1] == key:
+                    node.data = (hash_value, key, value)  # Updates entry in place
+                    break
+                node = node.next
+            else:
+                bucket.append((hash_value, key, value))
+                added += 1
+        self.size += added
+        self.version += added
+
+    def get_many(self, keys):
+        """ Returns list of values associated with given keys, in same order, with None
+        for missing keys (as get returns), walking buckets directly.\n
+        BEST/WORST CASE = O(n) --> One lookup per key. (Short chains.) """
+        values, bucket_for = list(), self._bucket
+        for key in keys:
+            hash_value = hash(key)
+            node = bucket_for(hash_value).head
+            while node is not None:
+                entry = node.data
+                if entry[0] == hash_value and entry[1] == key:
+                    values.append(entry[2])
+                    break
+                node = node.next
+            else:
+                values.append(None)
+        return values
+
     def _resize(self, new_size=None):
         """ Resizes hash table's buckets and rehash all key-value entries.
         Should be called automatically when load factor exceeds threshold
-        such as 0.75 after insertion (when set is called with new key).\n
-        BEST/WORST CASE = O(m * n) --> Iterate through all items in old and new tables. """
+        such as 0.75 after insertion (when set is called with new key).
+        Entries keep their cached hashes, so no key is hashed again, and only
+        buckets that receive entries are allocated.
+        Incremental tables only swap in empty bucket array here; later operations move
+        entries.\n
+        BEST CASE = O(m) --> Incremental: allocates array of m empty slots. (Fast.)\n
+        WORST CASE = O(m * n) --> Iterate through all items in old and new tables. """
         # If unspecified, chooses new size dynamically based on current size (doubles size)
         if new_size is None:
             new_size = len(self.buckets) * 2
         # Option that reduces size if buckets are sparsely filled (low L.F., halves size)
-        elif new_size is 0:
-            new_size = len(self.buckets) / 2
-        # Temporarily holding array for current hash table items
-        old_table_data = self.items()
-        # Call initializer to reset Hash Table size as doubled size      
-        self.__init__(new_size)
-        # Places items back into buckets using hashing set method
-        for key, value in old_table_data:
-            self.set(key, value)
+        elif new_size == 0:
+            new_size = max(1, len(self.buckets) // 2)
+        self.version += 1
+        if self.incremental:
+            self._finish_rehash()  # Finishes resize still under way
+            self.old_buckets, self.rehash_index = self.buckets, 0
+            self.buckets = [None] * new_size
+            return
+        # Temporarily holding array for current hash table entries
+        old_entries = [entry for bucket in self._all_buckets() for entry in bucket.items()]
+        # Replaces buckets with array of new size, allocating only buckets that get entries
+        buckets = self.buckets = [None] * new_size
+        # Places entries back into buckets by their cached hashes (no hashing or new tuples)
+        for entry in old_entries:
+            index = entry[0] % new_size
+            if buckets[index] is None:
+                buckets[index] = LinkedList()
+            buckets[index].append(entry)
+
+
+class HashTableView(object):
+    """ Lazy view of hash table's entries, like dict views: iterates buckets on demand
+    instead of copying entries into list, always shows current contents, and raises
+    RuntimeError if table gains or loses entries while being iterated. Compares equal to
+    list (or view) holding same items in same order. Subclasses choose what each entry
+    yields. """
+
+    def __init__(self, table):
+        self.table = table
+
+    def __repr__(self):
+        """ Returns string representation of view. """
+        return "{}({!r})".format(type(self).__name__, list(self))
+
+    def __len__(self):
+        """ Returns number of entries in table.\n
+        BEST/WORST CASE = O(1) --> Reads table's size. """
+        return self.table.size
+
+    def __iter__(self):
+        """ Yields one item per table entry, bucket by bucket. Finishes any incremental
+        resize first, since moving entries mid-iteration could skip or repeat them.\n
+        BEST/WORST CASE = O(m + n) --> Visits every bucket and entry once. """
+        table, select = self.table, self._select
+        table._finish_rehash()
+        version = table.version
+        for bucket in table.buckets:
+            node = bucket.head if bucket is not None else None
+            while node is not None:
+                if table.version != version:
+                    raise RuntimeError("\n\nHASH TABLE CHANGED DURING ITERATION.\n")
+                yield select(node.data)
+                node = node.next
+        if table.version != version:
+            raise RuntimeError("\n\nHASH TABLE CHANGED DURING ITERATION.\n")
+
+    def __contains__(self, item):
+        """ Returns True if view yields given item, or False.\n
+        BEST CASE = O(1) --> Item comes first.\n
+        WORST CASE = O(m + n) --> Iterates whole view. """
+        return any(found == item for found in self)
+
+    def __eq__(self, other):
+        """ Returns True if other list, tuple or view holds same items in same order. """
+        if isinstance(other, (list, tuple, HashTableView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+
+class HashTableKeys(HashTableView):
+    """ Lazy view of hash table's keys. """
+
+    @staticmethod
+    def _select(entry):
+        return entry[1]
+
+    def __contains__(self, key):
+        """ Returns True if table contains given key, or False.\n
+        BEST/WORST CASE = O(1) --> Looks key up in its bucket. (Short chains.) """
+        return self.table.contains(key)
+
+
+class HashTableValues(HashTableView):
+    """ Lazy view of hash table's values. """
+
+    @staticmethod
+    def _select(entry):
+        return entry[2]
+
+
+class HashTableItems(HashTableView):
+    """ Lazy view of hash table's (key, value) pairs. """
+
+    @staticmethod
+    def _select(entry):
+        return (entry[1], entry[2])
+
+    def __contains__(self, item):
+        """ Returns True if table holds given (key, value) pair, or False.\n
+        BEST/WORST CASE = O(1) --> Looks key up in its bucket. (Short chains.) """
+        key, value = item
+        return self.table.contains(key) and self.table.get(key) == value
 
 
 def test_hash_table():
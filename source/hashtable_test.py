@@ -141,6 +141,147 @@ class HashTableTest(unittest.TestCase):
         with self.assertRaises(KeyError):
             ht.delete('A')  # Key does not exist
 
+    def test_delete_shrinks(self):
+        ht = HashTable(8)
+        ht.set('I', 1)
+        ht.set('V', 5)
+        ht.delete('I')  # Load factor 1/8 is under 0.25
+        assert len(ht.buckets) == 4
+        assert ht.get('V') == 5
+        ht.delete('V')
+        assert ht.size == 0
+        assert ht.length() == 0
+
+    def test_incremental_resize(self):
+        ht = HashTable(4, incremental=True)
+        for number in range(3):
+            ht.set(number, number * 10)
+        assert ht.old_buckets is None
+        ht.set(3, 30)  # Should start resize: new buckets swapped in, entries not moved yet
+        assert len(ht.buckets) == 8
+        assert ht.old_buckets is not None
+        assert ht.length() == 4
+        self.assertCountEqual(ht.keys(), [0, 1, 2, 3])
+        assert ht.get(2) == 20  # Moves remaining old buckets (REHASH_STEP per operation)
+        assert ht.old_buckets is None
+        assert sum(bucket.length() for bucket in ht.buckets if bucket is not None) == 4
+        for number in range(4):
+            assert ht.get(number) == number * 10
+
+    def test_incremental_resize_mixed_operations(self):
+        ht, expected = HashTable(incremental=True), dict()
+        for number in range(2000):
+            key = 'K{}'.format(number * 7 % 500)
+            if number % 3 == 2 and key in expected:
+                ht.delete(key)
+                del expected[key]
+            else:
+                ht.set(key, number)
+                expected[key] = number
+            assert ht.size == len(expected)
+        self.assertCountEqual(ht.items(), list(expected.items()))
+        for key, value in expected.items():
+            assert ht.get(key) == value
+            assert ht.contains(key) is True
+
+    def test_resize_reuses_cached_hashes(self):
+        class CountedKey(str):
+            hash_calls = 0
+
+            def __hash__(self):
+                CountedKey.hash_calls += 1
+                return str.__hash__(self)
+
+        for incremental in (False, True):
+            ht = HashTable(2, incremental=incremental)
+            CountedKey.hash_calls = 0
+            keys = [CountedKey('+1415{}'.format(number)) for number in range(100)]
+            for key in keys:
+                ht.set(key, 0.5)
+            assert CountedKey.hash_calls == 100  # One per set, none while resizing
+            assert all(len(item) == 2 for item in ht.items())  # Cached hashes stay internal
+            for key in keys:
+                assert ht.get(key) == 0.5
+
+    def test_from_items(self):
+        pairs = [('K{}'.format(number), number) for number in range(100)]
+        ht = HashTable.from_items(pairs + [('K5', 'new')])  # Later pair overrides
+        assert ht.size == 100
+        assert len(ht.buckets) == 135  # Sized once: 101 pairs under 0.75 load factor
+        assert ht.get('K5') == 'new'
+        assert ht.get('K99') == 99
+        ht = HashTable.from_items(iter(pairs), expected_size=1000)  # Iterator without length
+        assert len(ht.buckets) == 1334
+        self.assertCountEqual(ht.items(), pairs)
+        assert HashTable.from_items([]).size == 0
+
+    def test_set_many(self):
+        ht = HashTable(4)
+        ht.set('I', 1)
+        ht.set_many([('V', 5), ('X', 10), ('I', 2)])  # Updates I in place
+        assert ht.size == 3
+        assert ht.length() == 3
+        assert ht.get('I') == 2
+        ht.set_many(('K{}'.format(number), number) for number in range(20))
+        assert ht.size == 23
+        assert len(ht.buckets) == 32  # One resize up front for all pairs
+        assert ht.load_factor() <= 0.75
+        assert ht.get('K19') == 19
+
+    def test_set_many_streams_sized_iterators(self):
+        ht, inserted = HashTable(4), list()
+
+        def pairs():
+            for number in range(50):
+                # Earlier pairs are already in table, so iterator was not read into list first
+                inserted.append(number == 0 or ht.get('K{}'.format(number - 1)) == number - 1)
+                yield 'K{}'.format(number), number
+        ht.set_many(pairs(), expected_size=50)
+        assert all(inserted) and len(inserted) == 50
+        assert ht.size == 50 and len(ht.buckets) == 128  # Resized once up front for expected_size
+
+    def test_get_many(self):
+        ht = HashTable.from_items([('I', 1), ('V', 5), ('X', 10)])
+        assert ht.get_many(['X', 'A', 'I']) == [10, None, 1]
+        assert ht.get_many([]) == []
+
+    def test_views(self):
+        ht = HashTable()
+        keys, values, items = ht.keys(), ht.values(), ht.items()
+        assert len(keys) == 0
+        ht.set('I', 1)
+        ht.set('V', 5)
+        assert len(keys) == len(values) == len(items) == 2  # Views show current contents
+        self.assertCountEqual(keys, ['I', 'V'])
+        self.assertCountEqual(values, [1, 5])
+        self.assertCountEqual(items, [('I', 1), ('V', 5)])
+        assert 'I' in keys
+        assert 'A' not in keys
+        assert 5 in values
+        assert ('V', 5) in items
+        assert ('V', 4) not in items
+        assert list(keys) == [key for key, value in items]  # Same bucket order
+
+    def test_views_detect_modification(self):
+        ht = HashTable.from_items(('K{}'.format(number), number) for number in range(10))
+        for key in ht.keys():
+            ht.set(key, 'updated')  # Updating values in place is allowed
+        assert list(ht.values()) == ['updated'] * 10
+        with self.assertRaises(RuntimeError):
+            for key in ht.keys():
+                ht.delete(key)
+        with self.assertRaises(RuntimeError):
+            for key, value in ht.items():
+                ht.set(key + '!', value)
+
+    def test_views_during_incremental_resize(self):
+        ht = HashTable(4, incremental=True)
+        for number in range(4):
+            ht.set(number, number)
+        assert ht.old_buckets is not None  # Resize under way
+        assert sorted(ht.keys()) == [0, 1, 2, 3]  # Iterating finishes moving entries
+        assert ht.old_buckets is None
+
 
 if __name__ == '__main__':
     unittest.main()
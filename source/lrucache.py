@@ -0,0 +1,96 @@
+#!python
+
+from collections import OrderedDict
+
+
+class LRUCache(object):
+
+    def __init__(self, capacity=100000):
+        """ Initializes empty cache holding at most capacity entries, plus its counters. """
+        if capacity < 1:
+            raise ValueError("\n\nCACHE CAPACITY MUST BE POSITIVE: {}\n".format(capacity))
+        self.capacity = capacity
+        self.entries = OrderedDict()            # Least recently used entry first
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def __repr__(self):
+        """ Returns string representation of cache. """
+        return "LRUCache({}/{} ENTRIES)".format(len(self.entries), self.capacity)
+
+    def length(self):
+        """ Returns number of entries currently cached. """
+        return len(self.entries)
+
+    def contains(self, key):
+        """ Returns True if cache holds given key, without counting hit or miss or
+        refreshing its recency. """
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """ Returns value cached for given key and marks it most recently used,
+        or returns default if key is not cached.\n
+        BEST/WORST CASE = O(1) --> One hash lookup plus one move to end of order. """
+        entries = self.entries
+        try:
+            value = entries[key]
+            entries.move_to_end(key)
+        except KeyError:                        # Also covers entry cleared by another thread
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """ Caches given key with value as most recently used entry, evicting least
+        recently used entry if cache is over capacity.\n
+        BEST/WORST CASE = O(1) --> One insert plus at most one eviction. """
+        entries = self.entries
+        if key in entries:
+            try:
+                entries.move_to_end(key)
+            except KeyError:                    # Entry cleared by another thread meanwhile
+                pass
+        entries[key] = value                    # New keys are inserted last, as most recently used
+        if len(entries) > self.capacity:
+            try:
+                entries.popitem(last=False)     # Drops least recently used entry
+            except KeyError:                    # Cleared by another thread meanwhile
+                return
+            self.evictions += 1
+
+    def delete(self, key):
+        """ Removes given key from cache, or raises KeyError. """
+        if key not in self.entries:
+            raise KeyError("\n\nKEY NOT FOUND: {}\n".format(key))
+        del self.entries[key]
+
+    def clear(self):
+        """ Invalidates every cached entry. Counters are kept. """
+        self.entries.clear()
+
+    def stats(self):
+        """ Returns dictionary of cache size, capacity, hit/miss/eviction counts and hit rate. """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    print('LRUCache: ' + str(cache))
+    cache.set('A', 1)
+    cache.set('B', 2)
+    print('get(A): ' + str(cache.get('A')))
+    cache.set('C', 3)  # Should evict B
+    print('get(B): ' + str(cache.get('B')))
+    print('stats: ' + str(cache.stats()))
+
+
+if __name__ == '__main__':
+    test_lru_cache()
@@ -0,0 +1,91 @@
+#!python
+
+from collections import OrderedDict
+from lrucache import LRUCache
+import unittest
+
+
+class ClearedEntries(OrderedDict):
+    """ Entries that another thread clears just before each move_to_end, to hit race. """
+
+    def move_to_end(self, key, last=True):
+        self.clear()
+        super(ClearedEntries, self).move_to_end(key, last)
+
+
+class LRUCacheTest(unittest.TestCase):
+
+    def test_init(self):
+        cache = LRUCache(4)
+        assert cache.capacity == 4
+        assert cache.length() == 0
+        assert cache.hits == 0
+        assert cache.misses == 0
+        assert cache.evictions == 0
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+    def test_set_and_get(self):
+        cache = LRUCache(4)
+        cache.set('A', 1)
+        cache.set('B', None)  # None is a cacheable value
+        assert cache.get('A') == 1
+        assert cache.get('B', 'missing') is None
+        assert cache.get('C', 'missing') == 'missing'
+        assert cache.hits == 2
+        assert cache.misses == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.set('A', 1)
+        cache.set('B', 2)
+        cache.get('A')  # A is now most recently used
+        cache.set('C', 3)  # Should evict B
+        assert cache.contains('A') is True
+        assert cache.contains('B') is False
+        assert cache.contains('C') is True
+        assert cache.length() == 2
+        assert cache.evictions == 1
+
+    def test_set_twice_refreshes_entry(self):
+        cache = LRUCache(2)
+        cache.set('A', 1)
+        cache.set('B', 2)
+        cache.set('A', 10)  # Update value, A is now most recently used
+        cache.set('C', 3)  # Should evict B
+        assert cache.get('A') == 10
+        assert cache.contains('B') is False
+        assert cache.length() == 2
+
+    def test_delete_and_clear(self):
+        cache = LRUCache(4)
+        cache.set('A', 1)
+        cache.set('B', 2)
+        cache.delete('A')
+        assert cache.contains('A') is False
+        with self.assertRaises(KeyError):
+            cache.delete('A')  # Key no longer exists
+        cache.clear()
+        assert cache.length() == 0
+
+    def test_set_survives_concurrent_clear(self):
+        cache = LRUCache(1)
+        cache.set('A', 1)
+        cache.entries = ClearedEntries(cache.entries)
+        cache.set('A', 2)  # Cleared before move_to_end
+        assert list(cache.entries.items()) == [('A', 2)]
+        cache.set('B', 3)
+        assert list(cache.entries.items()) == [('B', 3)] and cache.evictions == 1
+
+    def test_stats(self):
+        cache = LRUCache(1)
+        cache.set('A', 1)
+        cache.get('A')
+        cache.get('B')
+        cache.set('B', 2)
+        assert cache.stats() == {'size': 1, 'capacity': 1, 'hits': 1, 'misses': 1,
+                                 'evictions': 1, 'hit_rate': 0.5}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+#!python
+
+from array import array
+
+EMPTY, DELETED = 0x80, 0xFE             # Control bytes of free slots (full slots hold 7-bit tag)
+TAG_SHIFT = 57                          # Tags are top 7 of 64 hash bits; low bits pick home slot
+MAX_LOAD = 0.75                         # Full plus deleted slots allowed before growing
+
+
+class OpenHashTable(object):
+    """ Open-addressing hash table with Swiss-table-style metadata: entries live in flat
+    parallel arrays (cached hashes, keys, values) with one control byte per slot in
+    bytearray, either EMPTY, DELETED or top 7 bits of entry's hash (its tag). Probes walk
+    slots linearly from key's home slot and only compare cached hash (and then key) where
+    tag matches, so about 1 in 128 occupied slots costs more than one byte read. Same
+    get/set/delete/contains/items API as HashTable, without node or tuple per entry. """
+
+    def __init__(self, init_size=8):
+        """ Initializes empty hash table with room for at least init_size entries. """
+        capacity = 8
+        while capacity * MAX_LOAD < init_size:
+            capacity *= 2
+        self.capacity = capacity
+        self.control = bytearray([EMPTY]) * capacity
+        self.hashes = array("q", bytes(8 * capacity))
+        self.slot_keys = [None] * capacity
+        self.slot_values = [None] * capacity
+        self.size = 0                           # Number of key-value entries
+        self.deleted = 0                        # Slots holding DELETED tombstones
+
+    def __str__(self):
+        """ Returns formatted string representation of hash table. """
+        items = ["{!r}: {!r}".format(key, value) for key, value in self.items()]
+        return "{" + ", ".join(items) + "}"
+
+    def __repr__(self):
+        """ Returns string representation of hash table. """
+        return "OpenHashTable({!r})".format(self.items())
+
+    def _full_slots(self):
+        """ Returns list of indices of slots holding entries. """
+        control = self.control
+        return [slot for slot in range(self.capacity) if control[slot] < EMPTY]
+
+    def load_factor(self):
+        """ Returns load factor. (Ratio of number of entries to slots.) """
+        return self.size / self.capacity
+
+    def keys(self):
+        """ Returns list of all keys in hash table.\n
+        BEST/WORST CASE = O(c) --> Scans every slot's control byte. """
+        keys = self.slot_keys
+        return [keys[slot] for slot in self._full_slots()]
+
+    def values(self):
+        """ Returns list of all values in hash table.\n
+        BEST/WORST CASE = O(c) --> Scans every slot's control byte. """
+        values = self.slot_values
+        return [values[slot] for slot in self._full_slots()]
+
+    def items(self):
+        """ Returns list of all entries (key-value pairs) in hash table.\n
+        BEST/WORST CASE = O(c) --> Scans every slot's control byte. """
+        keys, values = self.slot_keys, self.slot_values
+        return [(keys[slot], values[slot]) for slot in self._full_slots()]
+
+    def length(self):
+        """ Returns number of key-value entries.\n
+        BEST/WORST CASE = O(1) --> Size is kept up to date. """
+        return self.size
+
+    def _find(self, key, hash_value):
+        """ Returns slot holding given key, or -1.\n
+        BEST CASE = O(1) --> Key sits in its home slot.\n
+        WORST CASE = O(n) --> Probes whole cluster of full slots. (Kept short by MAX_LOAD.) """
+        tag, mask = (hash_value >> TAG_SHIFT) & 0x7F, self.capacity - 1
+        control, hashes, keys = self.control, self.hashes, self.slot_keys
+        slot = hash_value & mask
+        byte = control[slot]
+        while byte != EMPTY:
+            if byte == tag and hashes[slot] == hash_value:
+                found = keys[slot]
+                if found is key or found == key:
+                    return slot
+            slot = (slot + 1) & mask
+            byte = control[slot]
+        return -1
+
+    def _free_slot(self, hash_value):
+        """ Returns first EMPTY or DELETED slot probed from given hash's home slot. """
+        control, mask = self.control, self.capacity - 1
+        slot = hash_value & mask
+        while control[slot] < EMPTY:
+            slot = (slot + 1) & mask
+        return slot
+
+    def contains(self, key):
+        """ Returns True if hash table contains given key, or False.\n
+        BEST CASE = O(1) --> Key sits in its home slot.\n
+        WORST CASE = O(n) --> Probes whole cluster of full slots. """
+        return self._find(key, hash(key)) != -1
+
+    def get(self, key):
+        """ Returns value associated with given key, or None if key is missing (as HashTable.get).\n
+        BEST CASE = O(1) --> Key sits in its home slot.\n
+        WORST CASE = O(n) --> Probes whole cluster of full slots. """
+        slot = self._find(key, hash(key))
+        return self.slot_values[slot] if slot != -1 else None
+
+    def set(self, key, value):
+        """ Inserts or updates given key with associated value.\n
+        BEST CASE = O(1) --> Key (or free slot) sits in its home slot.\n
+        WORST CASE = O(n) --> Grows table, rehashing every entry. """
+        hash_value = hash(key)
+        slot = self._find(key, hash_value)
+        if slot != -1:
+            self.slot_values[slot] = value
+            return
+        if self.size + self.deleted + 1 > self.capacity * MAX_LOAD:
+            self._resize()
+        slot = self._free_slot(hash_value)
+        if self.control[slot] == DELETED:
+            self.deleted -= 1
+        self.control[slot] = (hash_value >> TAG_SHIFT) & 0x7F
+        self.hashes[slot], self.slot_keys[slot], self.slot_values[slot] = hash_value, key, value
+        self.size += 1
+
+    def delete(self, key):
+        """ Deletes given key and associated value, or raises KeyError.\n
+        BEST CASE = O(1) --> Key sits in its home slot.\n
+        WORST CASE = O(n) --> Probes whole cluster of full slots. """
+        slot = self._find(key, hash(key))
+        if slot == -1:
+            raise KeyError("\n\nKEY NOT FOUND: {}\n".format(key))
+        # No probe passes slot if next one is EMPTY, so slot can become EMPTY again;
+        # otherwise it must stay as DELETED tombstone to keep later probes going
+        if self.control[(slot + 1) & (self.capacity - 1)] == EMPTY:
+            self.control[slot] = EMPTY
+        else:
+            self.control[slot] = DELETED
+            self.deleted += 1
+        self.slot_keys[slot] = self.slot_values[slot] = None     # Releases references
+        self.size -= 1
+
+    def _resize(self, new_size=None):
+        """ Moves every entry into new slot arrays sized for twice as many entries (or given
+        size), dropping tombstones. Entries are placed by their cached hashes, so no key is
+        hashed or compared again.\n
+        BEST/WORST CASE = O(c) --> Visits every old slot once. """
+        if new_size is None:
+            new_size = max(2 * self.size, 1)
+        control, hashes, keys, values, size = self.control, self.hashes, self.slot_keys, self.slot_values, self.size
+        self.__init__(new_size)
+        new_control, new_hashes, new_keys, new_values = self.control, self.hashes, self.slot_keys, self.slot_values
+        free_slot = self._free_slot
+        for slot in range(len(control)):
+            if control[slot] < EMPTY:
+                hash_value = hashes[slot]
+                new_slot = free_slot(hash_value)
+                new_control[new_slot] = control[slot]
+                new_hashes[new_slot], new_keys[new_slot], new_values[new_slot] = hash_value, keys[slot], values[slot]
+        self.size = size
+
+
+def test_open_hash_table():
+    ht = OpenHashTable(4)
+    print('OpenHashTable: ' + str(ht))
+
+    print('Setting entries:')
+    ht.set('I', 1)
+    print('set(I, 1): ' + str(ht))
+    ht.set('V', 5)
+    print('set(V, 5): ' + str(ht))
+    ht.set('X', 10)
+    print('set(X, 10): ' + str(ht))
+    print('size: ' + str(ht.size))
+    print('capacity: ' + str(ht.capacity))
+    print('load_factor: ' + str(ht.load_factor()))
+
+    print('Getting entries:')
+    print('get(I): ' + str(ht.get('I')))
+    print('contains(X): ' + str(ht.contains('X')))
+    print('contains(Z): ' + str(ht.contains('Z')))
+
+    print('Deleting entries:')
+    ht.delete('I')
+    print('delete(I): ' + str(ht))
+    print('size: ' + str(ht.size))
+
+
+if __name__ == '__main__':
+    test_open_hash_table()
@@ -0,0 +1,122 @@
+#!python
+
+from hashtable import HashTable
+from openhashtable import OpenHashTable, DELETED, EMPTY
+import unittest
+
+
+class OpenHashTableTest(unittest.TestCase):
+
+    def test_init(self):
+        ht = OpenHashTable(4)
+        assert ht.capacity == 8
+        assert len(ht.control) == len(ht.hashes) == len(ht.slot_keys) == len(ht.slot_values) == 8
+        assert ht.length() == 0
+        assert ht.size == 0
+        assert OpenHashTable(100).capacity == 256  # Room for 100 entries under max load
+
+    def test_keys_values_items(self):
+        ht = OpenHashTable()
+        assert ht.keys() == []
+        ht.set('I', 1)
+        assert ht.keys() == ['I']
+        assert ht.values() == [1]
+        assert ht.items() == [('I', 1)]
+        ht.set('V', 5)
+        ht.set('X', 10)
+        self.assertCountEqual(ht.keys(), ['I', 'V', 'X'])  # Ignore item order
+        self.assertCountEqual(ht.values(), [1, 5, 10])
+        self.assertCountEqual(ht.items(), [('I', 1), ('V', 5), ('X', 10)])
+
+    def test_set_and_get(self):
+        ht = OpenHashTable()
+        ht.set('I', 1)
+        ht.set('V', 5)
+        ht.set('X', 10)
+        assert ht.get('I') == 1
+        assert ht.get('V') == 5
+        assert ht.get('X') == 10
+        assert ht.length() == 3
+        assert ht.get('A') is None  # Key does not exist, same as HashTable.get
+
+    def test_get_missing_matches_hash_table(self):
+        for ht in (HashTable(), OpenHashTable()):
+            ht.set('+1', 0.5)
+            # Pattern code written against HashTable relies on, such as unrouted numbers
+            assert [ht.get(key) for key in ('+1', '+2', None)] == [0.5, None, None]
+
+    def test_set_twice_and_get(self):
+        ht = OpenHashTable()
+        ht.set('V', 4)
+        ht.set('V', 5)  # Update value
+        assert ht.get('V') == 5
+        assert ht.size == 1  # Check size is not overcounting
+
+    def test_contains(self):
+        ht = OpenHashTable()
+        ht.set('I', 1)
+        assert ht.contains('I') is True
+        assert ht.contains('A') is False
+
+    def test_resize(self):
+        ht = OpenHashTable(2)
+        assert ht.capacity == 8
+        for number in range(6):
+            ht.set(number, number)
+        assert ht.capacity == 8
+        assert ht.load_factor() == 0.75
+        ht.set(6, 6)  # Should trigger resize
+        assert ht.capacity == 16
+        assert ht.size == 7
+        for number in range(7):
+            assert ht.get(number) == number
+
+    def test_delete(self):
+        ht = OpenHashTable()
+        ht.set('I', 1)
+        ht.set('V', 5)
+        ht.set('X', 10)
+        ht.delete('I')
+        ht.delete('X')
+        assert ht.length() == 1
+        assert ht.size == 1
+        assert ht.contains('I') is False
+        assert ht.get('V') == 5
+        with self.assertRaises(KeyError):
+            ht.delete('X')  # Key no longer exists
+        with self.assertRaises(KeyError):
+            ht.delete('A')  # Key does not exist
+
+    def test_delete_keeps_probe_chain(self):
+        ht = OpenHashTable(16)  # 32 slots; integer keys hash to themselves
+        ht.set(1, 'a')
+        ht.set(33, 'b')  # Same home slot as 1, probes to next slot
+        ht.set(65, 'c')  # And to one after that
+        ht.delete(33)
+        assert ht.control[2] == DELETED  # Tombstone keeps 65 reachable
+        assert ht.get(65) == 'c'
+        ht.delete(65)
+        assert ht.control[3] == EMPTY  # Nothing probes past it, so slot is freed
+        ht.set(97, 'd')  # Reuses tombstone
+        assert ht.control[2] != DELETED
+        assert ht.deleted == 0
+        assert ht.get(97) == 'd'
+
+    def test_many_operations_match_dict(self):
+        ht, expected = OpenHashTable(), dict()
+        for number in range(3000):
+            key = '+1415{}'.format(number * 7 % 1000)
+            if number % 3 == 2 and key in expected:
+                ht.delete(key)
+                del expected[key]
+            else:
+                ht.set(key, number)
+                expected[key] = number
+        assert dict(ht.items()) == expected
+        assert ht.size == len(expected)
+        for key, value in expected.items():
+            assert ht.get(key) == value
+
+
+if __name__ == '__main__':
+    unittest.main()
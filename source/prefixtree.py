@@ -0,0 +1,248 @@
+#!python
+
+
+class PrefixTreeNode(object):
+
+    __slots__ = ("children", "value", "is_terminal")
+
+    def __init__(self):
+        """ Initializes prefix tree node with no children and no stored value. """
+        self.children = dict()                  # Maps next character to child node
+        self.value, self.is_terminal = None, False
+
+    def __repr__(self):
+        """ Returns string representation of prefix tree node. """
+        return "PrefixTreeNode({!r})".format(self.value)
+
+
+class PrefixTree(object):
+
+    def __init__(self, items=None):
+        """ Initializes prefix tree (trie) and sets given key-value pairs, if any. """
+        self.root, self.size = PrefixTreeNode(), 0
+        if items is not None:
+            for prefix, value in items:
+                self.set(prefix, value)
+
+    def __repr__(self):
+        """ Returns string representation of prefix tree. """
+        return "PrefixTree({} PREFIXES)".format(self.size)
+
+    def length(self):
+        """ Returns number of prefixes stored in prefix tree.\n
+        BEST/WORST CASE = O(1) --> Size is tracked on every set and delete. """
+        return self.size
+
+    def _find_node(self, prefix):
+        """ Returns node at end of given prefix's path, or None if path does not exist.\n
+        BEST CASE = O(1) --> First character has no child node.\n
+        WORST CASE = O(k) --> Walks one node per character of prefix (length k). """
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def contains(self, prefix):
+        """ Returns True if prefix tree stores given prefix exactly, or False.\n
+        BEST/WORST CASE = O(k) --> Walks one node per character of prefix. """
+        node = self._find_node(prefix)
+        return node is not None and node.is_terminal
+
+    def get(self, prefix):
+        """ Returns value stored at given prefix exactly, or None.\n
+        BEST/WORST CASE = O(k) --> Walks one node per character of prefix. """
+        node = self._find_node(prefix)
+        if node is not None and node.is_terminal:
+            return node.value
+        return None
+
+    def set(self, prefix, value):
+        """ Inserts or updates given prefix with associated value.\n
+        BEST/WORST CASE = O(k) --> Walks (creating if needed) one node per character. """
+        node = self.root
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:                   # Creates missing node along path
+                child = PrefixTreeNode()
+                node.children[char] = child
+            node = child
+        if not node.is_terminal:
+            node.is_terminal = True
+            self.size += 1
+        node.value = value
+
+    def delete(self, prefix):
+        """ Deletes given prefix and its value, or raises KeyError.
+        Prunes nodes left without children or values along prefix's path.\n
+        BEST/WORST CASE = O(k) --> Walks one node per character of prefix. """
+        path, node = [(None, self.root)], self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                break
+            path.append((char, node))
+        if node is None or not node.is_terminal:
+            raise KeyError("\n\nPREFIX NOT FOUND: {}\n".format(prefix))
+        node.value, node.is_terminal = None, False
+        self.size -= 1
+        # Walks back up path, unlinking nodes that no longer lead anywhere
+        for index in range(len(path) - 1, 0, -1):
+            char, child = path[index]
+            if child.children or child.is_terminal:
+                break
+            del path[index - 1][1].children[char]
+
+    def updated(self, assignments=(), removals=()):
+        """ Returns new prefix tree with given (prefix, value) assignments and prefix
+        removals applied, leaving this tree untouched so readers holding it keep a
+        consistent snapshot. Only nodes along changed paths are copied; all other
+        nodes are shared between both trees (path copying). Raises KeyError if a
+        removed prefix is not stored.\n
+        BEST/WORST CASE = O(c * k) --> Copies at most k nodes per change (c changes). """
+        tree = PrefixTree()
+        tree.root, tree.size = _copy_node(self.root), self.size
+        copied = {id(tree.root)}                # Nodes owned by new tree, safe to mutate
+        for prefix, value in assignments:
+            node = tree.root
+            for char in prefix:
+                child = _writable_child(node, char, copied)
+                if child is None:               # Creates missing node along path
+                    child = PrefixTreeNode()
+                    node.children[char] = child
+                    copied.add(id(child))
+                node = child
+            if not node.is_terminal:
+                node.is_terminal = True
+                tree.size += 1
+            node.value = value
+        for prefix in removals:
+            path, node = [(None, tree.root)], tree.root
+            for char in prefix:
+                node = _writable_child(node, char, copied)
+                if node is None:
+                    raise KeyError("\n\nPREFIX NOT FOUND: {}\n".format(prefix))
+                path.append((char, node))
+            if not node.is_terminal:
+                raise KeyError("\n\nPREFIX NOT FOUND: {}\n".format(prefix))
+            node.value, node.is_terminal = None, False
+            tree.size -= 1
+            for index in range(len(path) - 1, 0, -1):
+                char, child = path[index]
+                if child.children or child.is_terminal:
+                    break
+                del path[index - 1][1].children[char]
+        return tree
+
+    def lookup(self, key):
+        """ Returns value of longest stored prefix of given key, or None if no
+        stored prefix matches. Running time is independent of number of prefixes.\n
+        BEST CASE = O(1) --> First character has no child node.\n
+        WORST CASE = O(k) --> Walks one node per character of key (length k). """
+        node, value = self.root, None
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.is_terminal:                # Remembers deepest match seen so far
+                value = node.value
+        return value
+
+    def lookup_probes(self, key):
+        """ Returns (value, probes) pair: same value as lookup, plus number of nodes
+        visited while finding it, for profiling lookup work.\n
+        BEST/WORST CASE = O(k) --> Same walk as lookup. """
+        node, value, probes = self.root, None, 0
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                break
+            probes += 1
+            if node.is_terminal:
+                value = node.value
+        return value, probes
+
+    def longest_prefix(self, key):
+        """ Returns longest stored prefix of given key, or None if no stored prefix matches.\n
+        BEST CASE = O(1) --> First character has no child node.\n
+        WORST CASE = O(k) --> Walks one node per character of key (length k). """
+        node, depth = self.root, -1
+        for index, char in enumerate(key):
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.is_terminal:
+                depth = index
+        return key[:depth + 1] if depth >= 0 else None
+
+    def redundant(self):
+        """ Returns list of stored prefixes whose value equals value of their longest shorter
+        stored prefix, so lookup answers stay same for every key if they are removed (for
+        example with updated(removals=...)).\n
+        BEST/WORST CASE = O(n * k) --> Visits every node in tree once. """
+        redundant, stack = list(), [("", self.root, False, None)]
+        while stack:
+            prefix, node, covered, value = stack.pop()
+            if node.is_terminal:
+                if covered and node.value == value:
+                    redundant.append(prefix)    # Covering prefix still answers for it
+                else:
+                    covered, value = True, node.value
+            for char, child in node.children.items():
+                stack.append((prefix + char, child, covered, value))
+        return redundant
+
+    def items(self, prefix=""):
+        """ Returns list of all (prefix, value) pairs in prefix tree, or only those starting
+        with given prefix, in depth-first order.\n
+        BEST/WORST CASE = O(n * k) --> Visits every node below prefix. """
+        node = self._find_node(prefix)
+        all_items, stack = list(), [(prefix, node)] if node is not None else []
+        while stack:
+            prefix, node = stack.pop()
+            if node.is_terminal:
+                all_items.append((prefix, node.value))
+            for char, child in node.children.items():
+                stack.append((prefix + char, child))
+        return all_items
+
+
+def _writable_child(node, char, copied):
+    """ Returns node's child for given character, copying it first unless it is already
+    owned by tree being built (its id is in copied), or None if there is no such child. """
+    child = node.children.get(char)
+    if child is not None and id(child) not in copied:
+        child = _copy_node(child)
+        node.children[char] = child
+        copied.add(id(child))
+    return child
+
+def _copy_node(node):
+    """ Returns shallow copy of given node (children mapping copied, child nodes shared). """
+    clone = PrefixTreeNode()
+    clone.children = dict(node.children)
+    clone.value, clone.is_terminal = node.value, node.is_terminal
+    return clone
+
+
+def test_prefix_tree():
+    tree = PrefixTree()
+    print('PrefixTree: ' + str(tree))
+
+    print('Setting routes:')
+    tree.set('+1', 0.9)
+    tree.set('+1415', 0.2)
+    tree.set('+141524', 0.1)
+    print('items: ' + str(tree.items()))
+    print('size: ' + str(tree.size))
+
+    print('Looking up numbers:')
+    print('lookup(+14152456789): ' + str(tree.lookup('+14152456789')))
+    print('lookup(+14159999999): ' + str(tree.lookup('+14159999999')))
+    print('lookup(+16501234567): ' + str(tree.lookup('+16501234567')))
+    print('lookup(+44201234567): ' + str(tree.lookup('+44201234567')))
+
+
+if __name__ == '__main__':
+    test_prefix_tree()
@@ -0,0 +1,145 @@
+#!python
+
+from prefixtree import PrefixTree, PrefixTreeNode
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+class PrefixTreeNodeTest(unittest.TestCase):
+
+    def test_init(self):
+        node = PrefixTreeNode()
+        assert node.children == {}
+        assert node.value is None
+        assert node.is_terminal is False
+
+
+class PrefixTreeTest(unittest.TestCase):
+
+    def test_init(self):
+        tree = PrefixTree()
+        assert tree.size == 0
+        assert tree.length() == 0
+        assert tree.items() == []
+
+    def test_init_with_items(self):
+        tree = PrefixTree([('+1', 0.9), ('+1415', 0.2)])
+        assert tree.size == 2
+        self.assertCountEqual(tree.items(), [('+1', 0.9), ('+1415', 0.2)])
+
+    def test_set_and_get(self):
+        tree = PrefixTree()
+        tree.set('+1415', 0.2)
+        tree.set('+1', 0.9)
+        assert tree.get('+1415') == 0.2
+        assert tree.get('+1') == 0.9
+        assert tree.get('+141') is None  # Path exists but is not stored
+        assert tree.get('+44') is None  # Path does not exist
+        assert tree.size == 2
+
+    def test_set_twice_and_get(self):
+        tree = PrefixTree()
+        tree.set('+1415', 0.2)
+        tree.set('+1415', 0.3)  # Update value
+        assert tree.get('+1415') == 0.3
+        assert tree.size == 1  # Check size is not overcounting
+
+    def test_contains(self):
+        tree = PrefixTree([('+1415', 0.2)])
+        assert tree.contains('+1415') is True
+        assert tree.contains('+141') is False
+        assert tree.contains('+14152') is False
+
+    def test_lookup_longest_prefix(self):
+        tree = PrefixTree([('+1', 0.9), ('+1415', 0.2), ('+141524', 0.1)])
+        assert tree.lookup('+14152456789') == 0.1
+        assert tree.lookup('+14159999999') == 0.2
+        assert tree.lookup('+16501234567') == 0.9
+        assert tree.lookup('+1415') == 0.2  # Key equal to stored prefix
+        assert tree.lookup('+44201234567') is None
+        assert tree.lookup('') is None
+
+    def test_lookup_probes(self):
+        tree = PrefixTree([('+1', 0.9), ('+1415', 0.2)])
+        assert tree.lookup_probes('+14152456789') == (0.2, 5)  # Path ends after '+1415'
+        assert tree.lookup_probes('+16501234567') == (0.9, 2)
+        assert tree.lookup_probes('+44201234567') == (None, 1)
+        assert tree.lookup_probes('') == (None, 0)
+
+    def test_longest_prefix(self):
+        tree = PrefixTree([('+1', 0.9), ('+1415', 0.2)])
+        assert tree.longest_prefix('+14152456789') == '+1415'
+        assert tree.longest_prefix('+16501234567') == '+1'
+        assert tree.longest_prefix('+44201234567') is None
+
+    def test_items_with_prefix(self):
+        tree = PrefixTree([('+1', 0.9), ('+1415', 0.2), ('+14152', 0.1), ('+44', 0.5)])
+        self.assertCountEqual(tree.items('+141'), [('+1415', 0.2), ('+14152', 0.1)])
+        self.assertCountEqual(tree.items('+1415'), [('+1415', 0.2), ('+14152', 0.1)])
+        assert tree.items('+33') == []
+        assert len(tree.items()) == 4
+
+    def test_redundant(self):
+        tree = PrefixTree([('+1', 0.9), ('+1415', 0.9), ('+14152', 0.2),
+                           ('+141524', 0.2), ('+1415246', 0.9), ('+44', 0.5)])
+        # '+1415' repeats '+1', '+141524' repeats '+14152'; '+1415246' differs from '+141524'
+        self.assertCountEqual(tree.redundant(), ['+1415', '+141524'])
+        compact_tree = tree.updated(removals=tree.redundant())
+        assert compact_tree.size == 4
+        for number in ['+14152467890', '+14152456789', '+14159999999', '+16501234567', '+4420']:
+            assert compact_tree.lookup(number) == tree.lookup(number)
+        assert compact_tree.redundant() == []
+
+    def test_delete(self):
+        tree = PrefixTree([('+1', 0.9), ('+1415', 0.2), ('+141524', 0.1)])
+        tree.delete('+141524')
+        assert tree.size == 2
+        assert tree.lookup('+14152456789') == 0.2
+        tree.delete('+1')
+        assert tree.lookup('+16501234567') is None
+        assert tree.lookup('+14152456789') == 0.2
+        with self.assertRaises(KeyError):
+            tree.delete('+1')  # Prefix no longer exists
+        with self.assertRaises(KeyError):
+            tree.delete('+141')  # Path exists but is not stored
+        with self.assertRaises(KeyError):
+            tree.delete('+44')  # Prefix does not exist
+
+    def test_updated_leaves_original_untouched(self):
+        tree = PrefixTree([('+1', 0.9), ('+1415', 0.2), ('+44', 0.5)])
+        new_tree = tree.updated([('+1415', 0.3), ('+14152', 0.1)], ['+1'])
+        # Original tree still answers with old routes
+        assert tree.size == 3
+        assert tree.lookup('+14152456789') == 0.2
+        assert tree.lookup('+16501234567') == 0.9
+        # New tree answers with updated routes
+        assert new_tree.size == 3
+        assert new_tree.lookup('+14152456789') == 0.1
+        assert new_tree.lookup('+14159999999') == 0.3
+        assert new_tree.lookup('+16501234567') is None
+        self.assertCountEqual(new_tree.items(), [('+1415', 0.3), ('+14152', 0.1), ('+44', 0.5)])
+
+    def test_updated_shares_unchanged_nodes(self):
+        tree = PrefixTree([('+1415', 0.2), ('+44', 0.5)])
+        new_tree = tree.updated([('+1415', 0.3)])
+        assert new_tree.root is not tree.root
+        assert new_tree.root.children['+'] is not tree.root.children['+']
+        assert new_tree.root.children['+'].children['4'] is tree.root.children['+'].children['4']
+
+    def test_updated_with_missing_removal(self):
+        tree = PrefixTree([('+1415', 0.2)])
+        with self.assertRaises(KeyError):
+            tree.updated(removals=['+141'])
+        assert tree.lookup('+14152456789') == 0.2
+
+    def test_delete_prunes_empty_nodes(self):
+        tree = PrefixTree([('+1415', 0.2)])
+        tree.delete('+1415')
+        assert tree.root.children == {}
+        assert tree.size == 0
+
+
+if __name__ == '__main__':
+    unittest.main()